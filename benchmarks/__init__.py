@@ -0,0 +1,18 @@
+'''Benchmarks of nextline.
+
+- `benchmarks.e2e`: the overhead of tracing representative workloads
+- `benchmarks.prompt`: the latencies of the prompts in interactive stepping
+- `benchmarks.pubsub`: the costs of publishing and subscribing
+- `benchmarks.registrars`: the plugins of the main process with synthetic
+  events, without a spawned process
+
+Run from the repository root, e.g.,
+
+    python -m benchmarks.e2e --save e2e.json
+
+and later, to compare with the saved results,
+
+    python -m benchmarks.e2e --compare e2e.json
+
+The benchmarks are not run with the tests.
+'''
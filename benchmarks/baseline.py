@@ -0,0 +1,148 @@
+'''Save benchmark results as a baseline and compare results with it.
+
+The results are nested dicts of benchmark names to metric names to values.
+They are saved in JSON with the environment in which they were measured.
+'''
+
+import argparse
+import json
+import os
+import platform
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import nextline
+
+Results = Mapping[str, Mapping[str, float]]
+
+# The default relative change of a metric to be reported as a regression
+THRESHOLD = 0.2
+
+
+def environment() -> dict[str, Any]:
+    return {
+        'nextline': nextline.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save(path: str | Path, results: Results) -> None:
+    data = {'environment': environment(), 'results': results}
+    Path(path).write_text(json.dumps(data, indent=2) + '\n')
+
+
+def load(path: str | Path) -> dict[str, dict[str, float]]:
+    return json.loads(Path(path).read_text())['results']
+
+
+def compare(
+    results: Results,
+    baseline: Results,
+    higher_is_better: Mapping[str, bool],
+    threshold: float = THRESHOLD,
+) -> list[str]:
+    '''The descriptions of the metrics that have regressed from the baseline.
+
+    Only the metrics in `higher_is_better` that are in both the results and
+    the baseline are compared. A metric has regressed if it has changed in
+    the worse direction by more than `threshold` relative to the baseline.
+
+    >>> compare(
+    ...     {'loop': {'time': 1.5, 'rate': 90.0}},
+    ...     {'loop': {'time': 1.0, 'rate': 100.0}},
+    ...     higher_is_better={'time': False, 'rate': True},
+    ... )
+    ['loop: time 1 -> 1.5 (+50%)']
+
+    '''
+    regressions = []
+    for name, metrics in results.items():
+        if (base := baseline.get(name)) is None:
+            continue
+        for metric, higher in higher_is_better.items():
+            new, old = metrics.get(metric), base.get(metric)
+            if new is None or not old:
+                continue
+            change = new / old - 1
+            worse = -change if higher else change
+            if worse > threshold:
+                regressions.append(
+                    f'{name}: {metric} {old:.4g} -> {new:.4g} ({change:+.0%})'
+                )
+    return regressions
+
+
+def format_table(results: Results, metrics: Mapping[str, str]) -> str:
+    '''The results in a text table with the metrics as columns.
+
+    `metrics` maps the metric names to the column headers.
+
+    >>> print(format_table({'loop': {'time': 1.23456}}, {'time': 'time (s)'}))
+    name  time (s)
+    loop     1.235
+
+    '''
+    header = ['name', *metrics.values()]
+    rows = [
+        [name] + [_format(values.get(m)) for m in metrics]
+        for name, values in results.items()
+    ]
+    widths = [max(len(r[i]) for r in [header, *rows]) for i in range(len(header))]
+    lines = [
+        '  '.join(
+            c.ljust(w) if i == 0 else c.rjust(w)
+            for i, (c, w) in enumerate(zip(row, widths))
+        )
+        for row in [header, *rows]
+    ]
+    return '\n'.join(lines)
+
+
+def _format(value: float | None) -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, int) or abs(value) >= 1e4:
+        return f'{value:.0f}'
+    return f'{value:.4g}'
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    '''Add the options to save and compare the results.'''
+    parser.add_argument('--save', metavar='FILE', help='save the results in JSON')
+    parser.add_argument(
+        '--compare', metavar='FILE', help='compare the results with a saved baseline'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=THRESHOLD,
+        help='the relative change reported as a regression (default: %(default)s)',
+    )
+
+
+def report(
+    args: argparse.Namespace,
+    results: Results,
+    metrics: Mapping[str, str],
+    higher_is_better: Mapping[str, bool],
+) -> int:
+    '''Print the results, save and compare them as the options, and return the exit status.
+
+    The exit status is 1 if any metric has regressed from the baseline.
+    '''
+    print(format_table(results, metrics))
+    if args.save:
+        save(args.save, results)
+    if not args.compare:
+        return 0
+    regressions = compare(
+        results, load(args.compare), higher_is_better, threshold=args.threshold
+    )
+    for regression in regressions:
+        print(f'Regression: {regression}', file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,222 @@
+'''End-to-end benchmarks of the tracing overhead.
+
+Each workload is run untraced in this process and then traced with
+`Nextline.run_continue_and_wait()`. The metrics are:
+
+- `untraced`: the time to execute the statement without tracing
+- `traced`: the time from the start of the first trace to the end of the last
+- `slowdown`: `traced` divided by `untraced`
+- `events_per_sec`: the trace events in the statement processed per second
+- `start_latency`: the time from the call of `run_continue_and_wait()` to the
+  start of the first trace
+- `teardown_latency`: the time from the end of the last trace to the return
+  of `run_continue_and_wait()`
+
+The times are in seconds and the minimums of the repeats. The trace events
+are counted with a trace function in the untraced execution.
+
+Usage:
+
+    python -m benchmarks.e2e [WORKLOAD ...] [--repeat N] [--save FILE] [--compare FILE]
+'''
+
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Optional
+
+from nextline import Nextline
+from nextline.types import TraceInfo
+
+from . import baseline
+
+# The file name with which nextline compiles a statement given as a str
+FILENAME = '<string>'
+
+WORKLOADS = {
+    'loop': '''
+x = 0
+for i in range(1000):
+    x += i
+''',
+    'recursion': '''
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+fib(12)
+''',
+    'threads': '''
+import threading
+
+
+def work():
+    x = 0
+    for i in range(100):
+        x += i
+
+
+threads = [threading.Thread(target=work) for _ in range(10)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+''',
+    'tasks': '''
+import asyncio
+
+
+async def work():
+    x = 0
+    for i in range(50):
+        x += i
+        await asyncio.sleep(0)
+
+
+async def main():
+    await asyncio.gather(*(work() for _ in range(10)))
+
+
+asyncio.run(main())
+''',
+    'print': '''
+for i in range(500):
+    print(i)
+''',
+}
+
+METRICS = {
+    'untraced': 'untraced (s)',
+    'traced': 'traced (s)',
+    'slowdown': 'slowdown',
+    'events_per_sec': 'events/s',
+    'start_latency': 'start (s)',
+    'teardown_latency': 'teardown (s)',
+}
+
+HIGHER_IS_BETTER = {
+    'slowdown': False,
+    'events_per_sec': True,
+    'start_latency': False,
+    'teardown_latency': False,
+}
+
+
+def run_untraced(statement: str) -> float:
+    '''Execute the statement and return the time in seconds.'''
+    code = compile(statement, FILENAME, 'exec')
+    start = time.perf_counter()
+    exec(code, {'__name__': '__main__'})
+    return time.perf_counter() - start
+
+
+def count_events(statement: str) -> int:
+    '''Execute the statement and return the number of the trace events in it.'''
+    code = compile(statement, FILENAME, 'exec')
+    count = 0
+    lock = threading.Lock()
+
+    def trace(frame: FrameType, event: str, arg: Any) -> Optional[Any]:
+        nonlocal count
+        if frame.f_code.co_filename != FILENAME:
+            return None
+        with lock:
+            count += 1
+        return trace
+
+    threading.settrace(trace)
+    sys.settrace(trace)
+    try:
+        exec(code, {'__name__': '__main__'})
+    finally:
+        sys.settrace(None)
+        threading.settrace(None)  # type: ignore
+    return count
+
+
+async def run_traced(statement: str) -> dict[str, float]:
+    '''Run the statement with nextline and return the times in seconds.'''
+    async with Nextline(statement, trace_threads=True) as nextline:
+        trace_infos = list[TraceInfo]()
+
+        async def subscribe() -> None:
+            async for trace_info in nextline.subscribe_trace_info():
+                trace_infos.append(trace_info)
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        called_at = datetime.datetime.utcnow()
+        await nextline.run_continue_and_wait()
+        returned_at = datetime.datetime.utcnow()
+    await task
+    started_at = min(i.started_at for i in trace_infos if i.started_at)
+    ended_at = max(i.ended_at for i in trace_infos if i.ended_at)
+    return {
+        'traced': (ended_at - started_at).total_seconds(),
+        'start_latency': (started_at - called_at).total_seconds(),
+        'teardown_latency': (returned_at - ended_at).total_seconds(),
+    }
+
+
+@contextmanager
+def quiet() -> Iterator[None]:
+    '''Discard the output to the file descriptor 1, also in child processes.'''
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+
+
+def benchmark(statement: str, repeat: int) -> dict[str, float]:
+    '''Run the statement untraced and traced `repeat` times and return the metrics.'''
+    # The untraced runs are outside of an event loop as the statement can
+    # call `asyncio.run()`.
+    with quiet():
+        events = count_events(statement)
+        untraced = min(run_untraced(statement) for _ in range(repeat))
+        traced = [asyncio.run(run_traced(statement)) for _ in range(repeat)]
+    ret = {key: min(t[key] for t in traced) for key in traced[0]}
+    ret['untraced'] = untraced
+    ret['slowdown'] = ret['traced'] / untraced
+    ret['events_per_sec'] = events / ret['traced']
+    return {key: ret[key] for key in METRICS}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.e2e')
+    parser.add_argument(
+        'workloads',
+        nargs='*',
+        metavar='WORKLOAD',
+        help=f'the workloads to run (default: all of {", ".join(WORKLOADS)})',
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='the number of runs (default: 3)'
+    )
+    baseline.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if unknown := set(args.workloads) - set(WORKLOADS):
+        parser.error(f'unknown workloads: {", ".join(sorted(unknown))}')
+
+    results = dict[str, dict[str, float]]()
+    for name in args.workloads or WORKLOADS:
+        results[name] = benchmark(WORKLOADS[name], repeat=args.repeat)
+    return baseline.report(args, results, METRICS, HIGHER_IS_BETTER)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
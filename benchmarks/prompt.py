@@ -0,0 +1,113 @@
+'''Benchmark of the latencies of the prompts in interactive stepping.
+
+A script is stepped with the Pdb command "next" by `send_pdb_command()` a
+given number of times and then continued. The latencies are from
+`Nextline.get_prompt_latency()`, in seconds, at the stages:
+
+- `prompt`: from the start of a prompt in the spawned process until the
+  main process receives it
+- `command`: from sending a command until the prompt ends in the spawned
+  process
+- `round_trip`: from sending a command until the main process receives the
+  next prompt
+
+The row `steps` has the number of the steps per second.
+
+Usage:
+
+    python -m benchmarks.prompt [--steps N] [--save FILE] [--compare FILE]
+'''
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Optional
+
+from nextline import Nextline
+from nextline.types import LatencyHistogram
+
+from . import baseline
+
+STEPS = 10_000
+
+STATEMENT = '''
+x = 0
+for i in range({n}):
+    x += i
+'''
+
+METRICS = {
+    'count': 'count',
+    'mean': 'mean (s)',
+    'p50': 'p50 (s)',
+    'p90': 'p90 (s)',
+    'p99': 'p99 (s)',
+    'max': 'max (s)',
+    'steps_per_sec': 'steps/s',
+}
+
+HIGHER_IS_BETTER = {
+    'mean': False,
+    'p50': False,
+    'p99': False,
+    'steps_per_sec': True,
+}
+
+
+async def step(steps: int) -> dict[str, dict[str, float]]:
+    '''Step the script `steps` times and return the metrics.'''
+    # Two prompts for each iteration, one at each line of the loop
+    statement = STATEMENT.format(n=steps // 2 + 1)
+    async with Nextline(statement) as nextline:
+        n = 0
+        async with nextline.run_session():
+            start = time.perf_counter()
+            async for prompt in nextline.prompts():
+                n += 1
+                command = 'next' if n <= steps else 'continue'
+                await nextline.send_pdb_command(
+                    command, prompt.prompt_no, prompt.trace_no
+                )
+                if n == steps:
+                    elapsed = time.perf_counter() - start
+        prompt_latency = nextline.get_prompt_latency()
+    assert prompt_latency
+    return {
+        'prompt': _metrics(prompt_latency.prompt),
+        'command': _metrics(prompt_latency.command),
+        'round_trip': _metrics(prompt_latency.round_trip),
+        'steps': {'steps_per_sec': steps / elapsed},
+    }
+
+
+def _metrics(histogram: LatencyHistogram) -> dict[str, float]:
+    return {
+        'count': histogram.count,
+        'mean': histogram.mean,
+        'p50': histogram.p50,
+        'p90': histogram.p90,
+        'p99': histogram.p99,
+        'max': histogram.max,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.prompt')
+    parser.add_argument(
+        '--steps',
+        type=int,
+        default=STEPS,
+        help='the number of the steps (default: %(default)s)',
+    )
+    baseline.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.steps < 1:
+        parser.error('--steps must be positive')
+
+    results = asyncio.run(step(args.steps))
+    return baseline.report(args, results, METRICS, HIGHER_IS_BETTER)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
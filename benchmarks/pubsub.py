@@ -0,0 +1,163 @@
+'''Microbenchmarks of `nextline.utils.pubsub`.
+
+The benchmarks:
+
+- `subscribers_N`, `subscribers_N_cache`: publish to N subscribers of a
+  `PubSubItem` without and with the cache
+- `encoded`: publish to 10 subscribers of the encoded values of a key of
+  `PubSub` with the JSON codec
+- `prefix`: publish to 10 tuple keys of `PubSub` with a prefix subscriber
+- `churn`: subscribe to a `PubSubItem`, receive the latest value, and
+  unsubscribe repeatedly
+
+The metrics are in microseconds per item or per subscription:
+
+- `publish`: the time in `publish()`
+- `deliver`: the time until all subscribers have received all items
+- `subscribe`: the time of a subscription in `churn`
+
+Usage:
+
+    python -m benchmarks.pubsub [--items N] [--save FILE] [--compare FILE]
+'''
+
+import argparse
+import asyncio
+import sys
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from typing import Any, Optional
+
+from nextline.utils import PubSub, PubSubItem
+from nextline.utils.pubsub import json_codec
+
+from . import baseline
+
+ITEMS = 10_000
+
+SUBSCRIBERS = (0, 1, 10, 100)
+
+METRICS = {
+    'publish': 'publish (us)',
+    'deliver': 'deliver (us)',
+    'subscribe': 'subscribe (us)',
+}
+
+HIGHER_IS_BETTER = {
+    'publish': False,
+    'deliver': False,
+    'subscribe': False,
+}
+
+Publish = Callable[[int], Awaitable[None]]
+
+
+async def fanout(
+    publish: Publish,
+    subscriptions: Sequence[AsyncIterator[Any]],
+    close: Callable[[], Awaitable[None]],
+    items: int,
+) -> dict[str, float]:
+    '''Publish `items` values and return the times in microseconds per item.'''
+    ready = asyncio.Event()
+    n_ready = 0
+
+    async def consume(subscription: AsyncIterator[Any]) -> None:
+        nonlocal n_ready
+        await subscription.__anext__()
+        n_ready += 1
+        if n_ready == len(subscriptions):
+            ready.set()
+        async for _ in subscription:
+            pass
+
+    # The subscriptions are registered when the tasks start. A value is
+    # published before the measurement to wait until all have received it.
+    tasks = [asyncio.create_task(consume(s)) for s in subscriptions]
+    await asyncio.sleep(0)
+    await publish(-1)
+    if subscriptions:
+        await ready.wait()
+
+    start = time.perf_counter()
+    for i in range(items):
+        await publish(i)
+    published = time.perf_counter()
+    await close()
+    await asyncio.gather(*tasks)
+    delivered = time.perf_counter()
+    return {
+        'publish': (published - start) / items * 1e6,
+        'deliver': (delivered - start) / items * 1e6,
+    }
+
+
+async def item_subscribers(n: int, items: int, cache: bool = False) -> dict[str, float]:
+    item = PubSubItem[int](cache=cache)
+    subscriptions = [item.subscribe(last=False) for _ in range(n)]
+    return await fanout(item.publish, subscriptions, item.aclose, items)
+
+
+async def encoded(items: int) -> dict[str, float]:
+    pubsub = PubSub[Any, Any](codec=json_codec)
+    subscriptions = [pubsub.subscribe_encoded('key', last=False) for _ in range(10)]
+
+    async def publish(i: int) -> None:
+        await pubsub.publish('key', {'i': i, 'text': 'x' * 80})
+
+    return await fanout(publish, subscriptions, pubsub.close, items)
+
+
+async def prefix(items: int) -> dict[str, float]:
+    pubsub = PubSub[Any, Any]()
+    subscriptions = [pubsub.subscribe_prefix(('prompt_info',), last=False)]
+
+    async def publish(i: int) -> None:
+        await pubsub.publish(('prompt_info', i % 10), i)
+
+    return await fanout(publish, subscriptions, pubsub.close, items)
+
+
+async def churn(items: int) -> dict[str, float]:
+    item = PubSubItem[int]()
+    await item.publish(0)
+    start = time.perf_counter()
+    for _ in range(items):
+        subscription = item.subscribe()
+        await subscription.__anext__()
+        await subscription.aclose()
+    elapsed = time.perf_counter() - start
+    await item.aclose()
+    return {'subscribe': elapsed / items * 1e6}
+
+
+async def run(items: int) -> dict[str, dict[str, float]]:
+    results = dict[str, dict[str, float]]()
+    for n in SUBSCRIBERS:
+        results[f'subscribers_{n}'] = await item_subscribers(n, items)
+        results[f'subscribers_{n}_cache'] = await item_subscribers(n, items, cache=True)
+    results['encoded'] = await encoded(items)
+    results['prefix'] = await prefix(items)
+    results['churn'] = await churn(items)
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.pubsub')
+    parser.add_argument(
+        '--items',
+        type=int,
+        default=ITEMS,
+        help='the number of the items in each benchmark (default: %(default)s)',
+    )
+    baseline.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.items < 1:
+        parser.error('--items must be positive')
+
+    results = asyncio.run(run(args.items))
+    return baseline.report(args, results, METRICS, HIGHER_IS_BETTER)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,257 @@
+'''Microbenchmarks of the chain of the plugins in the main process.
+
+Synthetic event streams are fed to the hook `on_event_in_process()` of the
+plugins of the main process, as the events from the spawned process would
+be. No process is spawned. The streams:
+
+- `trace_call`: `OnStartTraceCall` and `OnEndTraceCall`
+- `prompt`: a prompt in each trace call, from `OnStartTraceCall` to
+  `OnEndTraceCall`
+- `stdout`: `OnWriteStdout`
+
+The events are of `--traces` traces in turn. The metrics are the time in
+microseconds per event and the number of the events per second.
+
+Usage:
+
+    python -m benchmarks.registrars [--events N] [--save FILE] [--compare FILE]
+'''
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import sys
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, Optional
+
+from nextline import Nextline
+from nextline.events import (
+    Event,
+    OnEndCmdloop,
+    OnEndPrompt,
+    OnEndRun,
+    OnEndTrace,
+    OnEndTraceCall,
+    OnStartCmdloop,
+    OnStartPrompt,
+    OnStartRun,
+    OnStartTrace,
+    OnStartTraceCall,
+    OnWriteStdout,
+)
+from nextline.plugin import Context, build_hook
+from nextline.types import (
+    InitOptions,
+    PromptNo,
+    RunNo,
+    TaskNo,
+    ThreadNo,
+    TraceCallNo,
+    TraceNo,
+)
+from nextline.utils.pubsub import PubSub, json_codec
+
+from . import baseline
+
+EVENTS = 10_000
+
+TRACES = 4
+
+STATEMENT = 'pass'
+
+FILE_NAME = '<string>'
+
+METRICS = {
+    'per_event': 'per event (us)',
+    'events_per_sec': 'events/s',
+}
+
+HIGHER_IS_BETTER = {
+    'per_event': False,
+    'events_per_sec': True,
+}
+
+
+def trace_call_stream(run_no: RunNo, traces: int) -> Iterator[Event]:
+    now = datetime.datetime.utcnow
+    for i in itertools.count(1):
+        trace_no = TraceNo(i % traces + 1)
+        trace_call_no = TraceCallNo(i)
+        yield OnStartTraceCall(
+            started_at=now(),
+            run_no=run_no,
+            trace_no=trace_no,
+            trace_call_no=trace_call_no,
+            file_name=FILE_NAME,
+            line_no=1,
+            frame_object_id=trace_no,
+            event='line',
+        )
+        yield OnEndTraceCall(
+            ended_at=now(),
+            run_no=run_no,
+            trace_no=trace_no,
+            trace_call_no=trace_call_no,
+        )
+
+
+def prompt_stream(run_no: RunNo, traces: int) -> Iterator[Event]:
+    now = datetime.datetime.utcnow
+    for i in itertools.count(1):
+        trace_no = TraceNo(i % traces + 1)
+        trace_call_no = TraceCallNo(i)
+        prompt_no = PromptNo(i)
+        yield OnStartTraceCall(
+            started_at=now(),
+            run_no=run_no,
+            trace_no=trace_no,
+            trace_call_no=trace_call_no,
+            file_name=FILE_NAME,
+            line_no=1,
+            frame_object_id=trace_no,
+            event='line',
+        )
+        yield OnStartCmdloop(
+            started_at=now(),
+            run_no=run_no,
+            trace_no=trace_no,
+            trace_call_no=trace_call_no,
+        )
+        yield OnStartPrompt(
+            started_at=now(),
+            run_no=run_no,
+            trace_no=trace_no,
+            trace_call_no=trace_call_no,
+            prompt_no=prompt_no,
+            prompt_text='(Pdb) ',
+            file_name=FILE_NAME,
+            line_no=1,
+            frame_object_id=trace_no,
+            event='line',
+        )
+        yield OnEndPrompt(
+            ended_at=now(),
+            run_no=run_no,
+            trace_no=trace_no,
+            trace_call_no=trace_call_no,
+            prompt_no=prompt_no,
+            command='next',
+        )
+        yield OnEndCmdloop(
+            ended_at=now(),
+            run_no=run_no,
+            trace_no=trace_no,
+            trace_call_no=trace_call_no,
+        )
+        yield OnEndTraceCall(
+            ended_at=now(),
+            run_no=run_no,
+            trace_no=trace_no,
+            trace_call_no=trace_call_no,
+        )
+
+
+def stdout_stream(run_no: RunNo, traces: int) -> Iterator[Event]:
+    now = datetime.datetime.utcnow
+    for i in itertools.count(1):
+        yield OnWriteStdout(
+            written_at=now(),
+            run_no=run_no,
+            trace_no=TraceNo(i % traces + 1),
+            text=f'line {i}\n',
+        )
+
+
+STREAMS: dict[str, Callable[[RunNo, int], Iterator[Event]]] = {
+    'trace_call': trace_call_stream,
+    'prompt': prompt_stream,
+    'stdout': stdout_stream,
+}
+
+
+async def feed(
+    stream: Callable[[RunNo, int], Iterator[Event]], events: int, traces: int
+) -> dict[str, float]:
+    '''Feed `events` events of the stream in a run and return the metrics.'''
+    hook = build_hook()
+    pubsub = PubSub[Any, Any](codec=json_codec)
+    # Only for the context. It is not opened.
+    nextline = Nextline(STATEMENT)
+    context = Context(nextline=nextline, hook=hook, pubsub=pubsub)
+    hook.hook.init(context=context, init_options=InitOptions(statement=STATEMENT))
+    await hook.ahook.start(context=context)
+    context.run_arg = hook.hook.compose_run_arg(context=context)
+    await hook.ahook.on_initialize_run(context=context)
+    assert context.run_arg
+    run_no = context.run_arg.run_no
+
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    await hook.ahook.on_start_run(
+        context=context,
+        event=OnStartRun(started_at=started_at, run_no=run_no, statement=STATEMENT),
+    )
+    on_event = hook.ahook.on_event_in_process
+    for i in range(traces):
+        start_trace = OnStartTrace(
+            started_at=datetime.datetime.utcnow(),
+            run_no=run_no,
+            trace_no=TraceNo(i + 1),
+            thread_no=ThreadNo(1),
+            task_no=TaskNo(i + 1),
+        )
+        await on_event(context=context, event=start_trace)
+
+    start = time.perf_counter()
+    for event in itertools.islice(stream(run_no, traces), events):
+        await on_event(context=context, event=event)
+    elapsed = time.perf_counter() - start
+
+    for i in range(traces):
+        end_trace = OnEndTrace(
+            ended_at=datetime.datetime.utcnow(), run_no=run_no, trace_no=TraceNo(i + 1)
+        )
+        await on_event(context=context, event=end_trace)
+    ended_at = datetime.datetime.now(datetime.timezone.utc)
+    await hook.ahook.on_end_run(
+        context=context,
+        event=OnEndRun(ended_at=ended_at, run_no=run_no, returned='null', raised=''),
+    )
+    context.run_arg = None
+    await hook.ahook.close(context=context)
+    await pubsub.close()
+    return {'per_event': elapsed / events * 1e6, 'events_per_sec': events / elapsed}
+
+
+async def run(events: int, traces: int) -> dict[str, dict[str, float]]:
+    return {
+        name: await feed(stream, events, traces) for name, stream in STREAMS.items()
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.registrars')
+    parser.add_argument(
+        '--events',
+        type=int,
+        default=EVENTS,
+        help='the number of the events in each stream (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--traces',
+        type=int,
+        default=TRACES,
+        help='the number of the traces (default: %(default)s)',
+    )
+    baseline.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.events < 1 or args.traces < 1:
+        parser.error('--events and --traces must be positive')
+
+    results = asyncio.run(run(args.events, args.traces))
+    return baseline.report(args, results, METRICS, HIGHER_IS_BETTER)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
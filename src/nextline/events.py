@@ -3,6 +3,9 @@ from dataclasses import dataclass
 from typing import Optional
 
 from nextline.types import (
+    FunctionStats,
+    HookStat,
+    MemoryStat,
     PromptNo,
     RunNo,
     Statement,
@@ -47,6 +50,7 @@ class OnStartTrace(Event):
     trace_no: TraceNo
     thread_no: ThreadNo
     task_no: Optional[TaskNo]
+    monotonic_ns: Optional[int] = None  # time.monotonic_ns()
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.started_at)
@@ -57,6 +61,8 @@ class OnEndTrace(Event):
     ended_at: datetime.datetime
     run_no: RunNo
     trace_no: TraceNo
+    cpu_time: Optional[float] = None  # seconds
+    monotonic_ns: Optional[int] = None  # time.monotonic_ns()
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.ended_at)
@@ -72,6 +78,7 @@ class OnStartTraceCall(Event):
     line_no: int
     frame_object_id: int
     event: str
+    monotonic_ns: Optional[int] = None  # time.monotonic_ns()
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.started_at)
@@ -83,6 +90,7 @@ class OnEndTraceCall(Event):
     run_no: RunNo
     trace_no: TraceNo
     trace_call_no: TraceCallNo
+    monotonic_ns: Optional[int] = None  # time.monotonic_ns()
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.ended_at)
@@ -94,6 +102,7 @@ class OnStartCmdloop(Event):
     run_no: RunNo
     trace_no: TraceNo
     trace_call_no: TraceCallNo
+    monotonic_ns: Optional[int] = None  # time.monotonic_ns()
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.started_at)
@@ -105,6 +114,7 @@ class OnEndCmdloop(Event):
     run_no: RunNo
     trace_no: TraceNo
     trace_call_no: TraceCallNo
+    monotonic_ns: Optional[int] = None  # time.monotonic_ns()
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.ended_at)
@@ -122,6 +132,7 @@ class OnStartPrompt(Event):
     line_no: int
     frame_object_id: int
     event: str
+    monotonic_ns: Optional[int] = None  # time.monotonic_ns()
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.started_at)
@@ -135,6 +146,7 @@ class OnEndPrompt(Event):
     trace_call_no: TraceCallNo
     prompt_no: PromptNo
     command: str
+    monotonic_ns: Optional[int] = None  # time.monotonic_ns()
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.ended_at)
@@ -144,13 +156,69 @@ class OnEndPrompt(Event):
 class OnWriteStdout(Event):
     written_at: datetime.datetime
     run_no: RunNo
-    trace_no: TraceNo
+    trace_no: Optional[TraceNo]  # None if not attributed to any trace
     text: str
+    stream: str = 'stdout'  # 'stdout' or 'stderr'
 
     def __post_init__(self) -> None:
         _assert_naive_datetime(self.written_at)
 
 
+@dataclass
+class OnSampleResources(Event):
+    sampled_at: datetime.datetime
+    run_no: RunNo
+    user_time: float
+    system_time: float
+    max_rss: int
+    voluntary_context_switches: int
+    involuntary_context_switches: int
+    final: bool = False
+
+    def __post_init__(self) -> None:
+        _assert_naive_datetime(self.sampled_at)
+
+
+@dataclass
+class OnHookStats(Event):
+    run_no: RunNo
+    stats: tuple[HookStat, ...]
+
+
+@dataclass
+class OnMemorySnapshot(Event):
+    taken_at: datetime.datetime
+    run_no: RunNo
+    current: int
+    peak: int
+    top: tuple[MemoryStat, ...]
+    trace_no: Optional[TraceNo] = None
+    prompt_no: Optional[PromptNo] = None
+    final: bool = False
+
+    def __post_init__(self) -> None:
+        _assert_naive_datetime(self.taken_at)
+
+
+@dataclass
+class OnLineHits(Event):
+    run_no: RunNo
+    hits: dict[str, dict[int, int]]  # file name -> line number -> total count
+
+
+@dataclass
+class OnProfileSamples(Event):
+    run_no: RunNo
+    samples: dict[str, int]  # folded stack -> count since the previous event
+
+
+@dataclass
+class OnFunctionStats(Event):
+    run_no: RunNo
+    trace_no: TraceNo
+    stats: tuple[FunctionStats, ...]
+
+
 def _assert_naive_datetime(dt: datetime.datetime) -> None:
     if is_timezone_aware(dt):
         raise ValueError(f'Not a timezone-naive object: {dt!r}')
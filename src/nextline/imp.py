@@ -1,10 +1,19 @@
+import datetime
 from logging import getLogger
 from typing import TYPE_CHECKING, Any, Optional
 
 from nextline.plugin import Context, build_hook, log_loaded_plugins
 from nextline.spawned import Command
-from nextline.types import InitOptions, ResetOptions
-from nextline.utils.pubsub.broker import PubSub
+from nextline.types import (
+    FunctionStats,
+    InitOptions,
+    PromptLatency,
+    ResetOptions,
+    RunNo,
+    StdoutInfo,
+    TraceNo,
+)
+from nextline.utils.pubsub import PubSub, json_codec
 
 from .fsm import Callback, StateMachine
 
@@ -19,7 +28,7 @@ class Imp:
 
     def __init__(self, nextline: 'Nextline', init_options: InitOptions) -> None:
         self._hook = build_hook()
-        self.pubsub = PubSub[Any, Any]()
+        self.pubsub = PubSub[Any, Any](codec=json_codec)
         self._context = Context(nextline=nextline, hook=self._hook, pubsub=self.pubsub)
         self._init_options = init_options
         self._callback = Callback(context=self._context)
@@ -81,6 +90,39 @@ class Imp:
     def result(self) -> Any:
         return self._hook.hook.result(context=self._context)
 
+    def get_line_hits(self) -> dict[str, dict[int, int]]:
+        return self._hook.hook.get_line_hits(context=self._context) or {}
+
+    def get_profile_samples(self) -> dict[str, int]:
+        return self._hook.hook.get_profile_samples(context=self._context) or {}
+
+    def get_function_stats(self, trace_no: Optional[TraceNo]) -> list[FunctionStats]:
+        ret = self._hook.hook.get_function_stats(
+            context=self._context, trace_no=trace_no
+        )
+        return ret or []
+
+    def get_prompt_latency(self) -> Optional[PromptLatency]:
+        return self._hook.hook.get_prompt_latency(context=self._context)
+
+    def get_stdout(
+        self,
+        run_no: Optional[RunNo],
+        trace_no: Optional[TraceNo],
+        start: int,
+        limit: Optional[int],
+        since: Optional[datetime.datetime],
+    ) -> list[StdoutInfo]:
+        ret = self._hook.hook.get_stdout(
+            context=self._context,
+            run_no=run_no,
+            trace_no=trace_no,
+            start=start,
+            limit=limit,
+            since=since,
+        )
+        return ret or []
+
     async def aopen(self) -> None:
         self._logger.debug(f'self._init_options: {self._init_options}')
         log_loaded_plugins(hook=self._hook)
@@ -1,24 +1,45 @@
 import asyncio
+import datetime
 import linecache
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from contextlib import asynccontextmanager
 from logging import getLogger
 from typing import Any, Optional
 
 from .continuous import Continuous
 from .imp import Imp, Plugin
-from .spawned import PdbCommand
+from .spawned import PdbCommand, SendFunctionStats
 from .types import (
+    FunctionStats,
+    FunctionStatsTable,
     InitOptions,
+    LineHits,
+    MemorySnapshot,
+    Metrics,
+    ProfileSamples,
     PromptInfo,
+    PromptLatency,
     PromptNo,
     PromptNotice,
     ResetOptions,
     RunInfo,
+    RunNo,
+    RunResources,
     Statement,
     StdoutInfo,
     TraceInfo,
     TraceNo,
+    TraceNosDelta,
+)
+
+SNAPSHOT_KEYS = (
+    'state_name',
+    'run_no',
+    'trace_nos',
+    'run_info',
+    'run_resources',
+    'statement',
+    'script_file_name',
 )
 
 
@@ -43,6 +64,69 @@ class Nextline:
     trace_modules
         The default is False. If False, trace only the statement. If True,
         trace imported modules as well.
+    capture_fd
+        The default is False. If True, capture stdout and stderr at the file
+        descriptor level so that the output of C extensions and child processes
+        is included. Such output is not attributed to any trace.
+    line_hits
+        The default is False. If True, count the executions of the lines and
+        publish the counts with the key `line_hits` periodically.
+    function_stats
+        The default is False. If True, collect the calls to and the time spent
+        in each function by trace, published with the key `function_stats`.
+    cpu_time
+        The default is False. If True, measure the CPU time of each trace,
+        available as `cpu_time` of `TraceInfo`.
+    profile_interval
+        The interval in seconds at which the stacks of the traced threads are
+        sampled. The default is 0, i.e., not sampled. The numbers of the
+        samples are published with the key `profile_samples` periodically.
+    profile_only
+        The default is False. If True, run the statement without tracing and
+        only sample the stacks, at `profile_interval` or every 0.01 seconds if
+        it is 0. There are no traces or prompts. The options `line_hits`,
+        `function_stats`, and `cpu_time` have no effect. The output is not
+        attributed to any trace.
+    memory
+        The default is False. If True, trace the memory allocations with
+        `tracemalloc` and publish a summary with the key `memory` at each
+        prompt and at the end of the run.
+    hook_stats
+        The default is False. If True, count the calls to the hook
+        implementations of the plugins in the main and spawned processes and
+        measure their time. The stats are published with the key
+        `hook_stats` at the end of the run.
+    cpu_affinity
+        The CPUs on which the process that runs the statement is eligible to
+        run. The default is None, i.e., not set. An empty sequence in
+        `reset()` unsets it.
+    nice
+        The increment of the niceness of the process that runs the statement.
+        0 in `reset()` unsets it.
+    rlimit_as
+        The limit of the virtual memory size in bytes of the process that
+        runs the statement (RLIMIT_AS). 0 in `reset()` unsets it.
+    rlimit_cpu
+        The limit of the CPU time in seconds of the process that runs the
+        statement (RLIMIT_CPU). The process is killed when it is exceeded.
+        0 in `reset()` unsets it.
+
+        If `cpu_affinity`, `nice`, `rlimit_as`, or `rlimit_cpu` cannot be
+        set, e.g., for a CPU that doesn't exist, the run fails with the error
+        as its exception.
+    span_file
+        The path of a file to which the lifecycles of the run, the traces, the
+        trace calls, the command loops, and the prompts are written as nested
+        spans as they end in each run. The times are from a monotonic clock in
+        microseconds since the start of the run. The format is JSON lines if
+        the path ends with ".jsonl" and the Chrome trace event format
+        otherwise, which can be opened in trace viewers such as Perfetto.
+        "{run_no}" in the path is replaced with the run number. The default is
+        None, i.e., not written. An empty string in `reset()` disables it.
+    span_sample
+        Write every `span_sample`-th trace call of each trace. The trace calls
+        with command loops, and their prompts, are always written. The default
+        is 1, i.e., all.
     timeout_on_exit
         The timeout in seconds to wait for the nextline to exit from the "with"
         block. The default is 3.
@@ -55,6 +139,20 @@ class Nextline:
         run_no_start_from: int = 1,
         trace_threads: bool = False,
         trace_modules: bool = False,
+        capture_fd: bool = False,
+        line_hits: bool = False,
+        function_stats: bool = False,
+        cpu_time: bool = False,
+        profile_interval: float = 0,
+        profile_only: bool = False,
+        memory: bool = False,
+        hook_stats: bool = False,
+        cpu_affinity: Optional[Iterable[int]] = None,
+        nice: Optional[int] = None,
+        rlimit_as: Optional[int] = None,
+        rlimit_cpu: Optional[int] = None,
+        span_file: Optional[str] = None,
+        span_sample: int = 1,
         timeout_on_exit: float = 3,
     ):
         # TODO: _init_options is accessed by nextline-rdb
@@ -63,6 +161,20 @@ class Nextline:
             run_no_start_from=run_no_start_from,
             trace_threads=trace_threads,
             trace_modules=trace_modules,
+            capture_fd=capture_fd,
+            line_hits=line_hits,
+            function_stats=function_stats,
+            cpu_time=cpu_time,
+            profile_interval=profile_interval,
+            profile_only=profile_only,
+            memory=memory,
+            hook_stats=hook_stats,
+            cpu_affinity=None if cpu_affinity is None else tuple(cpu_affinity),
+            nice=nice,
+            rlimit_as=rlimit_as,
+            rlimit_cpu=rlimit_cpu,
+            span_file=span_file,
+            span_sample=span_sample,
         )
         self._continuous = Continuous(self)
         self._timeout_on_exit = timeout_on_exit
@@ -170,6 +282,20 @@ class Nextline:
         run_no_start_from: Optional[int] = None,
         trace_threads: Optional[bool] = None,
         trace_modules: Optional[bool] = None,
+        capture_fd: Optional[bool] = None,
+        line_hits: Optional[bool] = None,
+        function_stats: Optional[bool] = None,
+        cpu_time: Optional[bool] = None,
+        profile_interval: Optional[float] = None,
+        profile_only: Optional[bool] = None,
+        memory: Optional[bool] = None,
+        hook_stats: Optional[bool] = None,
+        cpu_affinity: Optional[Iterable[int]] = None,
+        nice: Optional[int] = None,
+        rlimit_as: Optional[int] = None,
+        rlimit_cpu: Optional[int] = None,
+        span_file: Optional[str] = None,
+        span_sample: Optional[int] = None,
     ) -> None:
         '''Prepare for the next run'''
         reset_options = ResetOptions(
@@ -177,6 +303,20 @@ class Nextline:
             run_no_start_from=run_no_start_from,
             trace_threads=trace_threads,
             trace_modules=trace_modules,
+            capture_fd=capture_fd,
+            line_hits=line_hits,
+            function_stats=function_stats,
+            cpu_time=cpu_time,
+            profile_interval=profile_interval,
+            profile_only=profile_only,
+            memory=memory,
+            hook_stats=hook_stats,
+            cpu_affinity=None if cpu_affinity is None else tuple(cpu_affinity),
+            nice=nice,
+            rlimit_as=rlimit_as,
+            rlimit_cpu=rlimit_cpu,
+            span_file=span_file,
+            span_sample=span_sample,
         )
         logger = getLogger(__name__)
         logger.debug(f'reset_options: {reset_options}')
@@ -218,8 +358,16 @@ class Nextline:
             return ()
 
     def subscribe_trace_ids(self) -> AsyncIterator[tuple[int, ...]]:
+        '''Yield the trace IDs at each change.
+
+        Use `subscribe_trace_ids_delta()` to receive only the changes.
+        '''
         return self.subscribe('trace_nos')
 
+    def subscribe_trace_ids_delta(self) -> AsyncIterator[TraceNosDelta]:
+        '''Yield the changes in the trace IDs instead of the full tuples.'''
+        return self.subscribe('trace_nos_delta', last=False)
+
     def get_source(self, file_name: Optional[str] = None) -> list[str]:
         if not file_name or file_name == self._imp.pubsub.latest('script_file_name'):
             return self.get('statement').split('\n')
@@ -238,6 +386,18 @@ class Nextline:
     def subscribe_run_info(self) -> AsyncIterator[RunInfo]:
         return self.subscribe('run_info')
 
+    def subscribe_run_resources(self) -> AsyncIterator[RunResources]:
+        '''Yield the resource usage of the run, sampled periodically.'''
+        return self.subscribe('run_resources')
+
+    def subscribe_memory(self) -> AsyncIterator[MemorySnapshot]:
+        '''Yield the memory allocated in the run at each prompt and at the end.'''
+        return self.subscribe('memory')
+
+    def subscribe_metrics(self) -> AsyncIterator[Metrics]:
+        '''Yield the health of the event pipeline, sampled periodically in a run.'''
+        return self.subscribe('metrics')
+
     def subscribe_trace_info(self) -> AsyncIterator[TraceInfo]:
         return self.subscribe('trace_info')
 
@@ -254,12 +414,158 @@ class Nextline:
     def get(self, key: Any) -> Any:
         return self._imp.pubsub.latest(key)
 
-    def subscribe(self, key: Any, last: bool = True) -> AsyncIterator[Any]:
-        return self._imp.pubsub.subscribe(key, last=last)
+    def get_encoded(self, key: Any) -> bytes:
+        '''The latest value for the key encoded in JSON.'''
+        return self._imp.pubsub.latest_encoded(key)
+
+    def snapshot(
+        self, keys: Optional[Iterable[Any]] = None
+    ) -> dict[Any, tuple[int, Any]]:
+        '''The latest values with their sequence numbers for the keys.
+
+        The values are consistent with each other; no event is processed while
+        they are collected. If `keys` is `None`, the keys for a client to start
+        with are used, including `('prompt_info', trace_no)` for all traces.
+
+        A sequence number can be given to `subscribe()` as `after` to continue
+        from the snapshot.
+        '''
+        if keys is None:
+            return self._imp.pubsub.snapshot(
+                keys=SNAPSHOT_KEYS, prefixes=[('prompt_info',)]
+            )
+        return self._imp.pubsub.snapshot(keys=keys)
+
+    def subscribe(
+        self, key: Any, last: bool = True, after: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        return self._imp.pubsub.subscribe(key, last=last, after=after)
+
+    def subscribe_encoded(
+        self, key: Any, last: bool = True, after: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        '''Same as `subscribe()` except that the values are encoded in JSON.
+
+        Each value is encoded only once for all subscribers.
+        '''
+        return self._imp.pubsub.subscribe_encoded(key, last=last, after=after)
+
+    def subscribe_many(
+        self, keys: Iterable[Any], last: bool = True
+    ) -> AsyncIterator[tuple[Any, Any]]:
+        '''Yield `(key, value)` for any of the keys until all keys end.'''
+        return self._imp.pubsub.subscribe_many(keys, last=last)
+
+    def subscribe_prefix(
+        self, prefix: tuple[Any, ...], last: bool = True, after: Optional[int] = None
+    ) -> AsyncIterator[tuple[Any, Any]]:
+        '''Yield `(key, value)` for all tuple keys that start with the prefix.
+
+        For example, the prefix `('prompt_info',)` follows the prompt info of
+        all traces, whose keys are `('prompt_info', trace_no)`.
+        '''
+        return self._imp.pubsub.subscribe_prefix(prefix, last=last, after=after)
 
     def subscribe_stdout(self) -> AsyncIterator[StdoutInfo]:
         return self.subscribe('stdout', last=False)
 
+    def get_line_hits(self) -> dict[str, dict[int, int]]:
+        '''The total numbers of executions by file name and line number.
+
+        Only with the option `line_hits`. The counts are of the current or
+        the last run and are updated periodically during the run.
+        '''
+        return self._imp.get_line_hits()
+
+    def subscribe_line_hits(self) -> AsyncIterator[LineHits]:
+        '''Yield the counts of the lines executed since the previous yield.'''
+        return self.subscribe('line_hits', last=False)
+
+    def get_profile_samples(self) -> dict[str, int]:
+        '''The total numbers of samples by folded stack.
+
+        Only with the option `profile_interval`. The numbers are of the
+        current or the last run and are updated periodically during the run.
+        '''
+        return self._imp.get_profile_samples()
+
+    def subscribe_profile_samples(self) -> AsyncIterator[ProfileSamples]:
+        '''Yield the numbers of the samples taken since the previous yield.'''
+        return self.subscribe('profile_samples', last=False)
+
+    def get_function_stats(self, trace_no: Optional[int] = None) -> list[FunctionStats]:
+        '''The calls to and the time spent in each function, by exclusive time.
+
+        Only with the option `function_stats`. The stats are of the current
+        or the last run. They are of the given trace, or summed over all
+        traces by default. The stats of a trace are updated when the trace
+        ends or by `request_function_stats()`.
+        '''
+        return self._imp.get_function_stats(
+            trace_no=None if trace_no is None else TraceNo(trace_no)
+        )
+
+    def subscribe_function_stats(self) -> AsyncIterator[FunctionStatsTable]:
+        '''Yield the function stats of a trace each time they are updated.'''
+        return self.subscribe('function_stats', last=False)
+
+    async def request_function_stats(self) -> None:
+        '''Have the running traces send their function stats so far.'''
+        if self.state != 'running':
+            return
+        await self._imp.send_command(SendFunctionStats())
+
+    def get_prompt_latency(self) -> Optional[PromptLatency]:
+        '''The latencies of the prompts in the current or the last run.
+
+        The latencies are also published with the key `prompt_latency`
+        periodically during each run and at the end.
+        '''
+        return self._imp.get_prompt_latency()
+
+    def subscribe_prompt_latency(self) -> AsyncIterator[PromptLatency]:
+        return self.subscribe('prompt_latency')
+
+    def get_stdout(
+        self,
+        run_no: Optional[int] = None,
+        trace_no: Optional[int] = None,
+        start: int = 0,
+        limit: Optional[int] = None,
+        since: Optional[datetime.datetime] = None,
+    ) -> list[StdoutInfo]:
+        '''The lines written to stdout and stderr, one `StdoutInfo` per line.
+
+        The lines are kept on disk for the latest runs so that they can be
+        paged through after they are published.
+
+        Parameters
+        ----------
+        run_no
+            The run. The default is the latest run that has written.
+        trace_no
+            The trace. The default is all traces, including the text not
+            attributed to any trace.
+        start
+            The index of the first line to return.
+        limit
+            The maximum number of lines to return. The default is no limit.
+        since
+            If given, a naive datetime in UTC. The lines are counted from the
+            first line written at or after it.
+        '''
+        return self._imp.get_stdout(
+            run_no=None if run_no is None else RunNo(run_no),
+            trace_no=None if trace_no is None else TraceNo(trace_no),
+            start=start,
+            limit=limit,
+            since=since,
+        )
+
+    def subscribe_stderr(self) -> AsyncIterator[StdoutInfo]:
+        '''Yield the text written to stderr. Only with `capture_fd`.'''
+        return self.subscribe('stderr', last=False)
+
     @property
     def continuous_enabled(self) -> bool:
         return self._continuous.enabled
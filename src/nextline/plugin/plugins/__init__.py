@@ -4,10 +4,18 @@ from apluggy import PluginManager
 
 from .argument import RunArgComposer
 from .registrars import (
+    FunctionStatsRegistrar,
+    HookStatsRegistrar,
+    LineHitsRegistrar,
+    MemoryRegistrar,
+    MetricsRegistrar,
+    ProfileSamplesRegistrar,
     PromptInfoRegistrar,
+    PromptLatencyRegistrar,
     PromptNoticeRegistrar,
     RunInfoRegistrar,
     RunNoRegistrar,
+    RunResourcesRegistrar,
     ScriptRegistrar,
     StateNameRegistrar,
     StdoutRegistrar,
@@ -15,16 +23,26 @@ from .registrars import (
     TraceNumbersRegistrar,
 )
 from .session import CommandSender, OnEvent, Result, RunSession, Signal
+from .spans import SpanWriter
 
 
 def register(hook: PluginManager) -> None:
     hook.register(StdoutRegistrar)
+    hook.register(LineHitsRegistrar)
+    hook.register(FunctionStatsRegistrar)
+    hook.register(ProfileSamplesRegistrar)
     hook.register(PromptNoticeRegistrar)
     hook.register(PromptInfoRegistrar)
+    hook.register(PromptLatencyRegistrar)
     hook.register(TraceInfoRegistrar)
     hook.register(TraceNumbersRegistrar)
     hook.register(RunInfoRegistrar)
     hook.register(RunNoRegistrar)
+    hook.register(RunResourcesRegistrar)
+    hook.register(MemoryRegistrar)
+    hook.register(MetricsRegistrar)
+    hook.register(HookStatsRegistrar)
+    hook.register(SpanWriter)
     hook.register(StateNameRegistrar)
     hook.register(ScriptRegistrar)
     hook.register(RunArgComposer)
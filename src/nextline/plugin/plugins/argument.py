@@ -14,6 +14,18 @@ class RunArgComposer:
         self._filename = SCRIPT_FILE_NAME
         self._trace_threads = init_options.trace_threads
         self._trace_modules = init_options.trace_modules
+        self._capture_fd = init_options.capture_fd
+        self._line_hits = init_options.line_hits
+        self._function_stats = init_options.function_stats
+        self._cpu_time = init_options.cpu_time
+        self._profile_interval = init_options.profile_interval
+        self._profile_only = init_options.profile_only
+        self._memory = init_options.memory
+        self._hook_stats = init_options.hook_stats
+        self._cpu_affinity = init_options.cpu_affinity
+        self._nice = init_options.nice
+        self._rlimit_as = init_options.rlimit_as
+        self._rlimit_cpu = init_options.rlimit_cpu
 
     @hookimpl
     async def start(self, context: Context) -> None:
@@ -34,6 +46,30 @@ class RunArgComposer:
             self._trace_threads = trace_threads
         if (trace_modules := reset_options.trace_modules) is not None:
             self._trace_modules = trace_modules
+        if (capture_fd := reset_options.capture_fd) is not None:
+            self._capture_fd = capture_fd
+        if (line_hits := reset_options.line_hits) is not None:
+            self._line_hits = line_hits
+        if (function_stats := reset_options.function_stats) is not None:
+            self._function_stats = function_stats
+        if (cpu_time := reset_options.cpu_time) is not None:
+            self._cpu_time = cpu_time
+        if (profile_interval := reset_options.profile_interval) is not None:
+            self._profile_interval = profile_interval
+        if (profile_only := reset_options.profile_only) is not None:
+            self._profile_only = profile_only
+        if (memory := reset_options.memory) is not None:
+            self._memory = memory
+        if (hook_stats := reset_options.hook_stats) is not None:
+            self._hook_stats = hook_stats
+        if (cpu_affinity := reset_options.cpu_affinity) is not None:
+            self._cpu_affinity = cpu_affinity or None
+        if (nice := reset_options.nice) is not None:
+            self._nice = nice or None
+        if (rlimit_as := reset_options.rlimit_as) is not None:
+            self._rlimit_as = rlimit_as or None
+        if (rlimit_cpu := reset_options.rlimit_cpu) is not None:
+            self._rlimit_cpu = rlimit_cpu or None
 
     @hookimpl
     def compose_run_arg(self) -> RunArg:
@@ -43,5 +79,17 @@ class RunArgComposer:
             filename=self._filename,
             trace_threads=self._trace_threads,
             trace_modules=self._trace_modules,
+            capture_fd=self._capture_fd,
+            line_hits=self._line_hits,
+            function_stats=self._function_stats,
+            cpu_time=self._cpu_time,
+            profile_interval=self._profile_interval,
+            profile_only=self._profile_only,
+            memory=self._memory,
+            hook_stats=self._hook_stats,
+            cpu_affinity=self._cpu_affinity,
+            nice=self._nice,
+            rlimit_as=self._rlimit_as,
+            rlimit_cpu=self._rlimit_cpu,
         )
         return run_arg
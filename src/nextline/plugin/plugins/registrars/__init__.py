@@ -1,8 +1,16 @@
 __all__ = [
+    'FunctionStatsRegistrar',
+    'HookStatsRegistrar',
+    'LineHitsRegistrar',
+    'MemoryRegistrar',
+    'MetricsRegistrar',
+    'ProfileSamplesRegistrar',
     'PromptInfoRegistrar',
+    'PromptLatencyRegistrar',
     'PromptNoticeRegistrar',
     'RunInfoRegistrar',
     'RunNoRegistrar',
+    'RunResourcesRegistrar',
     'ScriptRegistrar',
     'StateNameRegistrar',
     'StdoutRegistrar',
@@ -10,10 +18,18 @@ __all__ = [
     'TraceNumbersRegistrar',
 ]
 
+from .function_stats import FunctionStatsRegistrar
+from .hook_stats import HookStatsRegistrar
+from .line_hits import LineHitsRegistrar
+from .memory import MemoryRegistrar
+from .metrics import MetricsRegistrar
+from .profile_samples import ProfileSamplesRegistrar
 from .prompt_info import PromptInfoRegistrar
+from .prompt_latency import PromptLatencyRegistrar
 from .prompt_notice import PromptNoticeRegistrar
 from .run_info import RunInfoRegistrar
 from .run_no import RunNoRegistrar
+from .run_resources import RunResourcesRegistrar
 from .script import ScriptRegistrar
 from .state_name import StateNameRegistrar
 from .stdout import StdoutRegistrar
@@ -0,0 +1,52 @@
+from collections.abc import Iterable
+from typing import Optional
+
+from nextline.events import OnFunctionStats
+from nextline.plugin.spec import Context, hookimpl
+from nextline.types import FunctionStats, FunctionStatsTable, TraceNo
+
+
+class FunctionStatsRegistrar:
+    '''Publish the function stats of the traces and keep the latest of the run.'''
+
+    def __init__(self) -> None:
+        self._tables = dict[TraceNo, FunctionStatsTable]()
+
+    @hookimpl
+    async def on_initialize_run(self) -> None:
+        self._tables.clear()
+
+    @hookimpl
+    async def on_function_stats(self, context: Context, event: OnFunctionStats) -> None:
+        table = FunctionStatsTable(
+            run_no=event.run_no, trace_no=event.trace_no, stats=event.stats
+        )
+        self._tables[event.trace_no] = table
+        await context.pubsub.publish('function_stats', table)
+
+    @hookimpl
+    def get_function_stats(self, trace_no: Optional[TraceNo]) -> list[FunctionStats]:
+        if trace_no is not None:
+            table = self._tables.get(trace_no)
+            stats = list(table.stats) if table else []
+        else:
+            stats = _merge(s for t in self._tables.values() for s in t.stats)
+        return sorted(stats, key=lambda s: s.exclusive_time, reverse=True)
+
+
+def _merge(stats_: Iterable[FunctionStats]) -> list[FunctionStats]:
+    merged = dict[tuple[str, int, str], FunctionStats]()
+    for stats in stats_:
+        key = (stats.file_name, stats.line_no, stats.name)
+        if (m := merged.get(key)) is None:
+            merged[key] = stats
+            continue
+        merged[key] = FunctionStats(
+            file_name=stats.file_name,
+            line_no=stats.line_no,
+            name=stats.name,
+            calls=m.calls + stats.calls,
+            inclusive_time=m.inclusive_time + stats.inclusive_time,
+            exclusive_time=m.exclusive_time + stats.exclusive_time,
+        )
+    return list(merged.values())
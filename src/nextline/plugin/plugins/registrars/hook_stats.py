@@ -0,0 +1,45 @@
+from nextline.events import OnEndRun, OnHookStats
+from nextline.plugin.spec import Context, hookimpl
+from nextline.types import HookStat, HookStats
+from nextline.utils import HookTimer
+
+
+class HookStatsRegistrar:
+    '''Publish the hook stats of the main and spawned processes at the end of a run.
+
+    Only with the option `hook_stats`. The hooks in the main process are
+    measured from the initialization of the run.
+    '''
+
+    def __init__(self) -> None:
+        self._spawned: tuple[HookStat, ...] = ()
+
+    @hookimpl
+    def init(self, context: Context) -> None:
+        self._timer = HookTimer(context.hook)
+
+    @hookimpl
+    async def on_initialize_run(self, context: Context) -> None:
+        assert context.run_arg
+        self._spawned = ()
+        self._timer.clear()
+        if context.run_arg.hook_stats:
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    @hookimpl
+    async def on_hook_stats(self, event: OnHookStats) -> None:
+        self._spawned = event.stats
+
+    @hookimpl
+    async def on_end_run(self, context: Context, event: OnEndRun) -> None:
+        assert context.run_arg
+        if not context.run_arg.hook_stats:
+            return
+        main = tuple(
+            HookStat(hook_name=hook_name, plugin=plugin, calls=calls, time=time)
+            for (hook_name, plugin), (calls, time) in self._timer.stats().items()
+        )
+        hook_stats = HookStats(run_no=event.run_no, main=main, spawned=self._spawned)
+        await context.pubsub.publish('hook_stats', hook_stats)
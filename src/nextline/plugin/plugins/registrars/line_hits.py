@@ -0,0 +1,27 @@
+from collections import defaultdict
+
+from nextline.events import OnLineHits
+from nextline.plugin.spec import Context, hookimpl
+from nextline.types import LineHits
+
+
+class LineHitsRegistrar:
+    '''Publish the changed line counts and keep the totals of the run.'''
+
+    def __init__(self) -> None:
+        self._totals = defaultdict[str, dict[int, int]](dict)
+
+    @hookimpl
+    async def on_initialize_run(self) -> None:
+        self._totals.clear()
+
+    @hookimpl
+    async def on_line_hits(self, context: Context, event: OnLineHits) -> None:
+        for file_name, hits in event.hits.items():
+            self._totals[file_name].update(hits)
+        line_hits = LineHits(run_no=event.run_no, hits=event.hits)
+        await context.pubsub.publish('line_hits', line_hits)
+
+    @hookimpl
+    def get_line_hits(self) -> dict[str, dict[int, int]]:
+        return {file_name: dict(hits) for file_name, hits in self._totals.items()}
@@ -0,0 +1,21 @@
+from nextline.events import OnMemorySnapshot
+from nextline.plugin.spec import Context, hookimpl
+from nextline.types import MemorySnapshot
+
+
+class MemoryRegistrar:
+    @hookimpl
+    async def on_memory_snapshot(
+        self, context: Context, event: OnMemorySnapshot
+    ) -> None:
+        memory = MemorySnapshot(
+            run_no=event.run_no,
+            taken_at=event.taken_at,
+            current=event.current,
+            peak=event.peak,
+            top=event.top,
+            trace_no=event.trace_no,
+            prompt_no=event.prompt_no,
+            final=event.final,
+        )
+        await context.pubsub.publish('memory', memory)
@@ -0,0 +1,117 @@
+import asyncio
+import dataclasses
+import datetime
+import time
+from typing import Optional
+
+from nextline.events import Event, OnEndRun, OnWriteStdout
+from nextline.plugin.spec import Context, hookimpl
+from nextline.types import Metrics, RunNo
+
+# The interval in seconds at which the metrics are published during a run
+METRICS_INTERVAL = 1.0
+
+
+class MetricsRegistrar:
+    '''Publish the health of the event pipeline with the key `metrics`.
+
+    Only the events are counted as they are processed. The other metrics are
+    sampled every `METRICS_INTERVAL` seconds during a run and at the end.
+    '''
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._clear()
+
+    def _clear(self) -> None:
+        self._processed = 0
+        self._last_event: Optional[Event] = None
+        self._stdout_bytes = 0
+        self._sampled_stdout_bytes = 0
+        self._sampled_at = time.perf_counter()
+
+    @hookimpl
+    async def on_initialize_run(self) -> None:
+        self._clear()
+
+    @hookimpl
+    async def on_start_run(self, context: Context) -> None:
+        self._sampled_at = time.perf_counter()
+        self._task = asyncio.create_task(self._publish_periodically(context))
+
+    @hookimpl
+    async def on_event_in_process(self, event: Event) -> None:
+        self._processed += 1
+        self._last_event = event
+        if isinstance(event, OnWriteStdout):
+            self._stdout_bytes += len(event.text.encode())
+
+    @hookimpl
+    async def on_end_run(self, context: Context, event: OnEndRun) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._publish(context, event.run_no, final=True)
+
+    @hookimpl
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _publish_periodically(self, context: Context) -> None:
+        assert context.run_arg
+        run_no = context.run_arg.run_no
+        while True:
+            await asyncio.sleep(METRICS_INTERVAL)
+            await self._publish(context, run_no)
+
+    async def _publish(
+        self, context: Context, run_no: RunNo, final: bool = False
+    ) -> None:
+        now = time.perf_counter()
+        sampled_at = datetime.datetime.utcnow()
+        depth = None
+        if context.count_queued_events is not None:
+            depth = context.count_queued_events()
+        lag = 0.0
+        if (depth is None or depth > 0) and self._last_event is not None:
+            if (timestamp := _timestamp(self._last_event)) is not None:
+                lag = max((sampled_at - timestamp).total_seconds(), 0.0)
+        elapsed = now - self._sampled_at
+        stdout_bytes = self._stdout_bytes - self._sampled_stdout_bytes
+        self._sampled_at = now
+        self._sampled_stdout_bytes = self._stdout_bytes
+        backlogs = context.pubsub.backlogs()
+        metrics = Metrics(
+            run_no=run_no,
+            sampled_at=sampled_at,
+            events_emitted=None if depth is None else self._processed + depth,
+            events_processed=self._processed,
+            queue_depth=depth,
+            oldest_event_lag=lag,
+            stdout_bytes_per_sec=stdout_bytes / elapsed if elapsed > 0 else 0.0,
+            subscriber_backlog={_to_str(k): n for k, n in backlogs.items()},
+            final=final,
+        )
+        await context.pubsub.publish('metrics', metrics)
+
+
+def _timestamp(event: Event) -> Optional[datetime.datetime]:
+    '''The first naive datetime field of the event, the time it was emitted.'''
+    for field in dataclasses.fields(event):
+        value = getattr(event, field.name)
+        if isinstance(value, datetime.datetime) and value.tzinfo is None:
+            return value
+    return None
+
+
+def _to_str(key: object) -> str:
+    if isinstance(key, str):
+        return key
+    if isinstance(key, tuple):
+        return '.'.join(str(k) for k in key)
+    return repr(key)
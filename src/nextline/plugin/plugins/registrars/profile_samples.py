@@ -0,0 +1,28 @@
+from collections import Counter
+
+from nextline.events import OnProfileSamples
+from nextline.plugin.spec import Context, hookimpl
+from nextline.types import ProfileSamples
+
+
+class ProfileSamplesRegistrar:
+    '''Publish the numbers of new samples of stacks and keep the totals of the run.'''
+
+    def __init__(self) -> None:
+        self._totals = Counter[str]()
+
+    @hookimpl
+    async def on_initialize_run(self) -> None:
+        self._totals.clear()
+
+    @hookimpl
+    async def on_profile_samples(
+        self, context: Context, event: OnProfileSamples
+    ) -> None:
+        self._totals.update(event.samples)
+        profile_samples = ProfileSamples(run_no=event.run_no, samples=event.samples)
+        await context.pubsub.publish('profile_samples', profile_samples)
+
+    @hookimpl
+    def get_profile_samples(self) -> dict[str, int]:
+        return dict(self._totals)
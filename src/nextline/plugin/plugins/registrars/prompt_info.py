@@ -19,7 +19,7 @@ class PromptInfoRegistrar:
         self._last_prompt_frame_map = dict[TraceNo, int]()
         self._trace_call_map = dict[TraceNo, OnStartTraceCall]()
         self._prompt_info_map = dict[PromptNo, PromptInfo]()
-        self._keys = set[str]()
+        self._trace_nos = set[TraceNo]()
         self._logger = getLogger(__name__)
 
     @hookimpl
@@ -32,15 +32,15 @@ class PromptInfoRegistrar:
         self._last_prompt_frame_map.clear()
         self._trace_call_map.clear()
         self._prompt_info_map.clear()
-        self._keys.clear()
+        self._trace_nos.clear()
 
     @hookimpl
     async def on_end_run(self, context: Context) -> None:
         async with self._lock:
-            while self._keys:
+            while self._trace_nos:
                 # the process might have been killed.
-                key = self._keys.pop()
-                await context.pubsub.end(key)
+                trace_no = self._trace_nos.pop()
+                await self._end(context, trace_no)
 
     @hookimpl
     async def on_start_trace(self, context: Context, event: OnStartTrace) -> None:
@@ -55,19 +55,15 @@ class PromptInfoRegistrar:
             prompt_no=PromptNo(-1),
             open=False,
         )
-        key = f"prompt_info_{trace_no}"
-        async with self._lock:
-            self._keys.add(key)
-            await context.pubsub.publish(key, prompt_info)
+        await self._publish(context, trace_no, prompt_info)
 
     @hookimpl
     async def on_end_trace(self, context: Context, event: OnEndTrace) -> None:
         trace_no = event.trace_no
-        key = f"prompt_info_{trace_no}"
         async with self._lock:
-            if key in self._keys:
-                self._keys.remove(key)
-                await context.pubsub.end(key)
+            if trace_no in self._trace_nos:
+                self._trace_nos.remove(trace_no)
+                await self._end(context, trace_no)
 
     @hookimpl
     async def on_start_trace_call(self, event: OnStartTraceCall) -> None:
@@ -102,10 +98,7 @@ class PromptInfoRegistrar:
         )
         await context.pubsub.publish('prompt_info', prompt_info)
 
-        key = f"prompt_info_{trace_no}"
-        async with self._lock:
-            self._keys.add(key)
-            await context.pubsub.publish(key, prompt_info)
+        await self._publish(context, trace_no, prompt_info)
 
     @hookimpl
     async def on_start_prompt(self, context: Context, event: OnStartPrompt) -> None:
@@ -129,10 +122,7 @@ class PromptInfoRegistrar:
 
         await context.pubsub.publish('prompt_info', prompt_info)
 
-        key = f"prompt_info_{trace_no}"
-        async with self._lock:
-            self._keys.add(key)
-            await context.pubsub.publish(key, prompt_info)
+        await self._publish(context, trace_no, prompt_info)
 
     @hookimpl
     async def on_end_prompt(self, context: Context, event: OnEndPrompt) -> None:
@@ -148,7 +138,18 @@ class PromptInfoRegistrar:
 
         await context.pubsub.publish('prompt_info', prompt_info_end)
 
-        key = f"prompt_info_{trace_no}"
+        await self._publish(context, trace_no, prompt_info_end)
+
+    async def _publish(
+        self, context: Context, trace_no: TraceNo, prompt_info: PromptInfo
+    ) -> None:
+        # NOTE: The str key is kept for backward compatibility. The tuple key
+        # can be subscribed to for all traces with the prefix `('prompt_info',)`.
         async with self._lock:
-            self._keys.add(key)
-            await context.pubsub.publish(key, prompt_info_end)
+            self._trace_nos.add(trace_no)
+            await context.pubsub.publish(f'prompt_info_{trace_no}', prompt_info)
+            await context.pubsub.publish(('prompt_info', trace_no), prompt_info)
+
+    async def _end(self, context: Context, trace_no: TraceNo) -> None:
+        await context.pubsub.end(f'prompt_info_{trace_no}')
+        await context.pubsub.end(('prompt_info', trace_no))
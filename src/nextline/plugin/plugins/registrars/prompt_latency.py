@@ -0,0 +1,150 @@
+import asyncio
+import time
+from typing import Optional
+
+from nextline.events import OnEndPrompt, OnEndRun, OnEndTrace, OnStartPrompt
+from nextline.plugin.spec import Context, hookimpl
+from nextline.spawned import Command, PdbCommand
+from nextline.types import (
+    LatencyHistogram,
+    PromptLatency,
+    PromptNo,
+    RunNo,
+    TraceNo,
+)
+from nextline.utils import Histogram
+
+# The interval in seconds at which the latencies are published during a run
+PROMPT_LATENCY_INTERVAL = 1.0
+
+
+class PromptLatencyRegistrar:
+    '''Measure the latencies of the prompts in histograms.
+
+    The times in the spawned process are the `monotonic_ns` of the events
+    `OnStartPrompt` and `OnEndPrompt`. The times in the main process are
+    taken with `time.monotonic_ns()` when the events are received and before
+    the Pdb commands are sent. The monotonic clock is not adjusted with the
+    wall clock.
+
+    The latencies are published with the key `prompt_latency` every
+    `PROMPT_LATENCY_INTERVAL` seconds during a run and at the end.
+    '''
+
+    def __init__(self) -> None:
+        self._prompt = Histogram()
+        self._command = Histogram()
+        self._round_trip = Histogram()
+        self._run_no: Optional[RunNo] = None
+        self._sent = dict[tuple[TraceNo, PromptNo], int]()
+        self._last_sent = dict[TraceNo, int]()
+        self._task: Optional[asyncio.Task] = None
+
+    @hookimpl
+    async def on_initialize_run(self, context: Context) -> None:
+        assert context.run_arg
+        self._run_no = context.run_arg.run_no
+        self._prompt.clear()
+        self._command.clear()
+        self._round_trip.clear()
+        self._sent.clear()
+        self._last_sent.clear()
+
+    @hookimpl
+    async def on_start_run(self, context: Context) -> None:
+        self._task = asyncio.create_task(self._publish_periodically(context))
+
+    @hookimpl(tryfirst=True)
+    async def send_command(self, command: Command) -> None:
+        if not isinstance(command, PdbCommand):
+            return
+        now = time.monotonic_ns()
+        self._sent[(command.trace_no, command.prompt_no)] = now
+        self._last_sent[command.trace_no] = now
+
+    @hookimpl
+    async def on_start_prompt(self, event: OnStartPrompt) -> None:
+        now = time.monotonic_ns()
+        if event.monotonic_ns is not None:
+            self._prompt.add(_seconds(now - event.monotonic_ns))
+        if (sent := self._last_sent.pop(event.trace_no, None)) is not None:
+            self._round_trip.add(_seconds(now - sent))
+
+    @hookimpl
+    async def on_end_prompt(self, event: OnEndPrompt) -> None:
+        key = (event.trace_no, event.prompt_no)
+        sent = self._sent.pop(key, None)
+        if sent is not None and event.monotonic_ns is not None:
+            self._command.add(_seconds(event.monotonic_ns - sent))
+
+    @hookimpl
+    async def on_end_trace(self, event: OnEndTrace) -> None:
+        self._last_sent.pop(event.trace_no, None)
+
+    @hookimpl
+    async def on_end_run(self, context: Context, event: OnEndRun) -> None:
+        del event
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._publish(context)
+
+    @hookimpl
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    @hookimpl
+    def get_prompt_latency(self) -> Optional[PromptLatency]:
+        if self._run_no is None:
+            return None
+        return PromptLatency(
+            run_no=self._run_no,
+            prompt=_to_latency_histogram(self._prompt),
+            command=_to_latency_histogram(self._command),
+            round_trip=_to_latency_histogram(self._round_trip),
+        )
+
+    async def _publish_periodically(self, context: Context) -> None:
+        while True:
+            await asyncio.sleep(PROMPT_LATENCY_INTERVAL)
+            await self._publish(context)
+
+    async def _publish(self, context: Context) -> None:
+        if (prompt_latency := self.get_prompt_latency()) is not None:
+            await context.pubsub.publish('prompt_latency', prompt_latency)
+
+
+def _seconds(delta_ns: int) -> float:
+    # The monotonic clock is shared by the processes on the same machine.
+    return max(delta_ns / 1e9, 0.0)
+
+
+def _to_latency_histogram(histogram: Histogram) -> LatencyHistogram:
+    if not histogram.count:
+        return LatencyHistogram(
+            count=0,
+            mean=0.0,
+            min=0.0,
+            max=0.0,
+            p50=0.0,
+            p90=0.0,
+            p99=0.0,
+            bounds=histogram.bounds,
+            buckets=histogram.buckets,
+        )
+    return LatencyHistogram(
+        count=histogram.count,
+        mean=histogram.mean(),
+        min=histogram.min,
+        max=histogram.max,
+        p50=histogram.quantile(0.5),
+        p90=histogram.quantile(0.9),
+        p99=histogram.quantile(0.99),
+        bounds=histogram.bounds,
+        buckets=histogram.buckets,
+    )
@@ -0,0 +1,21 @@
+from nextline.events import OnSampleResources
+from nextline.plugin.spec import Context, hookimpl
+from nextline.types import RunResources
+
+
+class RunResourcesRegistrar:
+    @hookimpl
+    async def on_sample_resources(
+        self, context: Context, event: OnSampleResources
+    ) -> None:
+        run_resources = RunResources(
+            run_no=event.run_no,
+            sampled_at=event.sampled_at,
+            user_time=event.user_time,
+            system_time=event.system_time,
+            max_rss=event.max_rss,
+            voluntary_context_switches=event.voluntary_context_switches,
+            involuntary_context_switches=event.involuntary_context_switches,
+            final=event.final,
+        )
+        await context.pubsub.publish('run_resources', run_resources)
@@ -1,13 +1,32 @@
+import datetime
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
 from typing import Optional
 
 from nextline.events import OnWriteStdout
 from nextline.plugin.spec import Context, hookimpl
-from nextline.types import RunNo, StdoutInfo
+from nextline.types import RunNo, StdoutInfo, TraceNo
+from nextline.utils import TextLog
+
+# The number of the latest runs whose stdout is kept
+MAX_RUNS = 16
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_STREAMS = ('stdout', 'stderr')
 
 
 class StdoutRegistrar:
+    '''Publish the text written to stdout and stderr and keep it in logs.
+
+    The text is published with the keys `stdout` and `stderr`. It is also
+    appended line by line to a `StdoutLog` for each run, which can be read
+    with `get_stdout()`.
+    '''
+
     def __init__(self) -> None:
         self._run_no: Optional[RunNo] = None
+        self._logs = dict[RunNo, StdoutLog]()
 
     @hookimpl
     async def on_write_stdout(self, context: Context, event: OnWriteStdout) -> None:
@@ -17,5 +36,116 @@ class StdoutRegistrar:
             trace_no=event.trace_no,
             text=event.text,
             written_at=event.written_at,
+            stream=event.stream,
+        )
+        self._log(stdout_info.run_no).append(stdout_info)
+        key = 'stderr' if event.stream == 'stderr' else 'stdout'
+        await context.pubsub.publish(key, stdout_info)
+
+    @hookimpl
+    def get_stdout(
+        self,
+        run_no: Optional[RunNo],
+        trace_no: Optional[TraceNo],
+        start: int,
+        limit: Optional[int],
+        since: Optional[datetime.datetime],
+    ) -> list[StdoutInfo]:
+        if run_no is None:
+            run_no = self._run_no
+        if run_no is None or (log := self._logs.get(run_no)) is None:
+            return []
+        return log.get(trace_no=trace_no, start=start, limit=limit, since=since)
+
+    @hookimpl
+    async def close(self) -> None:
+        while self._logs:
+            _, log = self._logs.popitem()
+            log.close()
+
+    def _log(self, run_no: RunNo) -> 'StdoutLog':
+        if (log := self._logs.get(run_no)) is None:
+            log = self._logs[run_no] = StdoutLog(run_no)
+            self._run_no = run_no
+            while len(self._logs) > MAX_RUNS:
+                self._logs.pop(next(iter(self._logs))).close()
+        return log
+
+
+class StdoutLog:
+    '''An append-only log of the lines written to stdout and stderr in a run.
+
+    The lines are stored in a `TextLog`, i.e., on disk, with the trace number,
+    the time, and the stream. The line numbers of each trace are indexed in
+    memory.
+
+    The lines can arrive slightly out of the order of their times, e.g., of
+    stdout and stderr with `capture_fd`, which are stamped in separate
+    threads. The running maximum of the times is also stored so that `since`
+    can be found by bisection.
+    '''
+
+    def __init__(self, run_no: RunNo) -> None:
+        self._run_no = run_no
+        # The metadata: trace_no (-1 for None), microseconds since the epoch,
+        # their running maximum, and the index in _STREAMS
+        self._log = TextLog(meta_format='qqqB')
+        self._max_us = 0
+        self._by_trace: defaultdict[Optional[TraceNo], 'array[int]']
+        self._by_trace = defaultdict(lambda: array('q'))
+
+    def __len__(self) -> int:
+        return len(self._log)
+
+    def append(self, stdout_info: StdoutInfo) -> None:
+        if not stdout_info.text:
+            return
+        trace_no = stdout_info.trace_no
+        written_at = stdout_info.written_at or datetime.datetime.utcnow()
+        us = (written_at - _EPOCH) // datetime.timedelta(microseconds=1)
+        self._max_us = max_us = max(self._max_us, us)
+        stream = _STREAMS.index(stdout_info.stream)
+        trace = -1 if trace_no is None else trace_no
+        index = self._by_trace[trace_no]
+        for line in stdout_info.text.splitlines(keepends=True):
+            index.append(self._log.append(line, trace, us, max_us, stream))
+
+    def get(
+        self,
+        trace_no: Optional[TraceNo] = None,
+        start: int = 0,
+        limit: Optional[int] = None,
+        since: Optional[datetime.datetime] = None,
+    ) -> list[StdoutInfo]:
+        '''The lines from the `start`-th line, up to `limit` lines.
+
+        The lines of all traces are included if `trace_no` is `None`. If
+        `since` is given, the lines are counted from the first line written
+        at or after it. The lines written at or after `since` are included
+        even if they arrived after lines written later.
+        '''
+        lines: 'range | array[int]'
+        if trace_no is None:
+            lines = range(len(self._log))
+        elif (lines_ := self._by_trace.get(trace_no)) is None:
+            return []
+        else:
+            lines = lines_
+        if since is not None:
+            us = (since - _EPOCH) // datetime.timedelta(microseconds=1)
+            start += bisect_left(lines, us, key=lambda i: self._log.meta(i)[2])
+        stop = len(lines) if limit is None else min(len(lines), start + limit)
+        return [self._info(lines[i]) for i in range(start, stop)]
+
+    def close(self) -> None:
+        self._log.close()
+
+    def _info(self, i: int) -> StdoutInfo:
+        trace_no, us, _, stream = self._log.meta(i)
+        return StdoutInfo(
+            run_no=self._run_no,
+            trace_no=None if trace_no < 0 else TraceNo(trace_no),
+            text=self._log.text(i),
+            written_at=_EPOCH + datetime.timedelta(microseconds=us),
+            stream=_STREAMS[stream],
         )
-        await context.pubsub.publish('stdout', stdout_info)
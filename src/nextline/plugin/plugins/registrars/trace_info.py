@@ -46,9 +46,14 @@ class TraceInfoRegistrar:
         if trace_info is None:
             # on_end_run() might have already been called
             return
+        wall_time = None
+        if trace_info.started_at is not None:
+            wall_time = (event.ended_at - trace_info.started_at).total_seconds()
         trace_info_end = dataclasses.replace(
             trace_info,
             state='finished',
             ended_at=event.ended_at,
+            cpu_time=event.cpu_time,
+            wall_time=wall_time,
         )
         await context.pubsub.publish('trace_info', trace_info_end)
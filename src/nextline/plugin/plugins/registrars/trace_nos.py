@@ -1,34 +1,47 @@
-from nextline.events import OnEndTrace, OnStartTrace
+from nextline.events import OnEndRun, OnEndTrace, OnStartTrace
 from nextline.plugin.spec import Context, hookimpl
-from nextline.types import TraceNo
+from nextline.types import TraceNo, TraceNosDelta
 
 
 class TraceNumbersRegistrar:
+    '''Publish the trace numbers of the running traces.
+
+    The full tuple is published with the key `trace_nos`. The changes are
+    published with the key `trace_nos_delta` so that clients don't need to
+    receive the full tuple at each change.
+    '''
+
     def __init__(self) -> None:
-        self._trace_nos: tuple[TraceNo, ...] = ()
+        # A dict as an ordered set
+        self._trace_nos = dict[TraceNo, None]()
 
     @hookimpl
     async def on_initialize_run(self) -> None:
-        self._trace_nos = ()
+        self._trace_nos.clear()
 
     @hookimpl
-    async def on_end_run(self, context: Context) -> None:
-        self._trace_nos = ()
-        await context.pubsub.publish('trace_nos', self._trace_nos)
+    async def on_end_run(self, context: Context, event: OnEndRun) -> None:
+        removed = tuple(self._trace_nos)
+        self._trace_nos.clear()
+        if removed:
+            delta = TraceNosDelta(run_no=event.run_no, removed=removed)
+            await context.pubsub.publish('trace_nos_delta', delta)
+        await context.pubsub.publish('trace_nos', ())
 
     @hookimpl
     async def on_start_trace(self, context: Context, event: OnStartTrace) -> None:
         trace_no = event.trace_no
-        self._trace_nos = self._trace_nos + (trace_no,)
-        await context.pubsub.publish('trace_nos', self._trace_nos)
+        self._trace_nos[trace_no] = None
+        delta = TraceNosDelta(run_no=event.run_no, added=(trace_no,))
+        await context.pubsub.publish('trace_nos_delta', delta)
+        await context.pubsub.publish('trace_nos', tuple(self._trace_nos))
 
     @hookimpl
     async def on_end_trace(self, context: Context, event: OnEndTrace) -> None:
         trace_no = event.trace_no
-        nosl = list(self._trace_nos)
-        try:
-            nosl.remove(trace_no)
-        except ValueError:
+        if trace_no not in self._trace_nos:
             return
-        self._trace_nos = tuple(nosl)
-        await context.pubsub.publish('trace_nos', self._trace_nos)
+        del self._trace_nos[trace_no]
+        delta = TraceNosDelta(run_no=event.run_no, removed=(trace_no,))
+        await context.pubsub.publish('trace_nos_delta', delta)
+        await context.pubsub.publish('trace_nos', tuple(self._trace_nos))
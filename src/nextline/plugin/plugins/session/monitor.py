@@ -27,6 +27,18 @@ class OnEvent:
                 await ahook.on_end_prompt(context=context, event=event)
             case events.OnWriteStdout():
                 await ahook.on_write_stdout(context=context, event=event)
+            case events.OnHookStats():
+                await ahook.on_hook_stats(context=context, event=event)
+            case events.OnMemorySnapshot():
+                await ahook.on_memory_snapshot(context=context, event=event)
+            case events.OnProfileSamples():
+                await ahook.on_profile_samples(context=context, event=event)
+            case events.OnFunctionStats():
+                await ahook.on_function_stats(context=context, event=event)
+            case events.OnLineHits():
+                await ahook.on_line_hits(context=context, event=event)
+            case events.OnSampleResources():
+                await ahook.on_sample_resources(context=context, event=event)
             case _:
                 logger = getLogger(__name__)
                 logger.warning(f'Unknown event: {event!r}')
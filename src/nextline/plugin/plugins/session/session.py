@@ -9,8 +9,8 @@ from typing import Any, Optional, cast
 
 from nextline import events, spawned
 from nextline.plugin.spec import Context, hookimpl
-from nextline.spawned import Command, QueueIn, QueueOut, RunResult
-from nextline.utils import ExitedProcess, RunningProcess, Timer, run_in_process
+from nextline.spawned import Command, EndOfEvents, QueueIn, QueueOut, RunResult
+from nextline.utils import ExitedProcess, RunningProcess, run_in_process
 
 
 class RunSession:
@@ -23,7 +23,8 @@ class RunSession:
         queue_in = cast(QueueIn, mp_context.Queue())
         queue_out = cast(QueueOut, mp_context.Queue())
         context.send_command = SendCommand(queue_in)
-        async with relay_events(context, queue_out):
+        context.count_queued_events = CountQueuedEvents(queue_out)
+        async with relay_events(context, queue_out) as abandon:
             context.running_process = await run_in_process(
                 func=partial(spawned.main, context.run_arg),
                 mp_context=mp_context,
@@ -36,6 +37,8 @@ class RunSession:
             finally:
                 context.exited_process = await context.running_process
                 if context.exited_process.returned is None:
+                    # The process might have died before sending EndOfEvents.
+                    abandon()
                     context.exited_process.returned = RunResult()
                 context.running_process = None
                 if context.exited_process.raised:
@@ -75,33 +78,53 @@ def SendCommand(queue_in: QueueIn) -> Callable[[Command], None]:
     return _send_command
 
 
+def CountQueuedEvents(queue_out: QueueOut) -> Callable[[], Optional[int]]:
+    def _count_queued_events() -> Optional[int]:
+        try:
+            return queue_out.qsize()
+        except NotImplementedError:  # pragma: no cover
+            # e.g., on macOS
+            return None
+
+    return _count_queued_events
+
+
 @contextlib.asynccontextmanager
-async def relay_events(context: Context, queue: QueueOut) -> AsyncIterator[None]:
-    '''Call the hook `on_event_in_process()` on events emitted in the spawned process.'''
+async def relay_events(
+    context: Context, queue: QueueOut
+) -> AsyncIterator[Callable[[], None]]:
+    '''Call the hook `on_event_in_process()` on events emitted in the spawned process.
+
+    At the exit, waits until the marker `EndOfEvents` is received, which the
+    spawned process puts after the last event. If the yielded function is
+    called, e.g., because the process has died, or if an exception is raised,
+    relays only the events already sent instead.
+    '''
     logger = getLogger(__name__)
 
-    in_finally = False
-    timer = Timer(timeout=1)  # seconds
+    abandoned = False
+
+    def abandon() -> None:
+        nonlocal abandoned
+        abandoned = True
 
     async def _monitor() -> None:
         while (event := await asyncio.to_thread(queue.get)) is not None:
+            if isinstance(event, EndOfEvents):
+                return
             logger.debug(f'event: {event!r}')
             await context.hook.ahook.on_event_in_process(context=context, event=event)
-            if in_finally:
-                timer.restart()
 
     task = asyncio.create_task(_monitor())
     try:
-        yield
+        yield abandon
+    except BaseException:
+        abandoned = True
+        raise
     finally:
-        in_finally = True
-        timer.restart()
-        while not queue.empty():
-            await asyncio.sleep(0)  # let _monitor() run
-            if timer.is_timeout():
-                logger.warning(f'Timeout. the queue is not empty: {queue!r}')
-                break
-        await asyncio.to_thread(queue.put, None)  # type: ignore
+        if abandoned:
+            # Put after the events already sent by the spawned process
+            await asyncio.to_thread(queue.put, None)  # type: ignore
         await task
 
 
@@ -0,0 +1,333 @@
+import dataclasses
+import datetime
+import itertools
+import json
+import time
+from logging import getLogger
+from typing import Any, Optional, TextIO
+
+from nextline.events import (
+    OnEndCmdloop,
+    OnEndPrompt,
+    OnEndRun,
+    OnEndTrace,
+    OnEndTraceCall,
+    OnStartCmdloop,
+    OnStartPrompt,
+    OnStartRun,
+    OnStartTrace,
+    OnStartTraceCall,
+)
+from nextline.plugin.spec import hookimpl
+from nextline.types import InitOptions, ResetOptions, RunNo, TraceNo
+
+
+@dataclasses.dataclass
+class _Span:
+    span_id: int
+    parent_id: Optional[int]
+    kind: str  # 'run', 'trace', 'trace_call', 'cmdloop', or 'prompt'
+    name: str
+    trace_no: int  # 0 for the run
+    start: int  # microseconds since the start of the run
+    attributes: dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+class SpanWriter:
+    '''Write the lifecycles in a run as nested spans to a file.
+
+    Only with the option `span_file`. The spans are derived from the start
+    and end events. Their times are in microseconds since the start of the
+    run, from the readings of `time.monotonic_ns()` in the events. A span is
+    written when it ends; the spans that haven't ended are ended at the end
+    of the run.
+
+    With the option `span_sample`, only every `span_sample`-th trace call of
+    each trace is written unless it has a command loop, so that no prompts
+    are dropped.
+    '''
+
+    def __init__(self) -> None:
+        self._span_file: Optional[str] = None
+        self._span_sample = 1
+        self._writer: Optional[_JsonLinesWriter | _ChromeTraceWriter] = None
+        self._traces = dict[TraceNo, _Span]()
+        self._trace_calls = dict[TraceNo, _Span]()
+        self._cmdloops = dict[TraceNo, _Span]()
+        self._prompts = dict[TraceNo, _Span]()
+        self._n_trace_calls = dict[TraceNo, int]()
+        # The last trace calls not sampled, opened if they get command loops
+        self._unsampled = dict[TraceNo, OnStartTraceCall]()
+        self._logger = getLogger(__name__)
+
+    @hookimpl
+    def init(self, init_options: InitOptions) -> None:
+        self._span_file = init_options.span_file
+        self._span_sample = init_options.span_sample
+
+    @hookimpl
+    async def reset(self, reset_options: ResetOptions) -> None:
+        if (span_file := reset_options.span_file) is not None:
+            self._span_file = span_file or None
+        if (span_sample := reset_options.span_sample) is not None:
+            self._span_sample = span_sample
+
+    @hookimpl
+    async def on_start_run(self, event: OnStartRun) -> None:
+        if not (span_file := self._span_file):
+            return
+        path = span_file.replace('{run_no}', str(event.run_no))
+        try:
+            file = open(path, 'w')
+        except OSError:
+            self._logger.exception(f'Failed to open {path!r}')
+            return
+        if path.endswith('.jsonl'):
+            self._writer = _JsonLinesWriter(file, event.run_no)
+        else:
+            self._writer = _ChromeTraceWriter(file, event.run_no)
+        self._sample = max(self._span_sample, 1)
+        self._ids = itertools.count(1)
+        self._run_started_at = _to_naive_utc(event.started_at)
+        self._run_started_ns = time.monotonic_ns()
+        self._run = self._open(None, 'run', f'run {event.run_no}', 0, 0)
+        self._n_trace_calls.clear()
+        self._unsampled.clear()
+
+    @hookimpl
+    async def on_end_run(self, event: OnEndRun) -> None:
+        if self._writer is None:
+            return
+        end = self._time(event.ended_at, time.monotonic_ns())
+        for spans in (self._prompts, self._cmdloops, self._trace_calls, self._traces):
+            while spans:
+                _, span = spans.popitem()
+                self._writer.write(span, end)
+        self._writer.write(self._run, end)
+        self._writer.close()
+        self._writer = None
+        self._n_trace_calls.clear()
+        self._unsampled.clear()
+
+    @hookimpl
+    async def on_start_trace(self, event: OnStartTrace) -> None:
+        if self._writer is None:
+            return
+        span = self._open(
+            self._run.span_id,
+            'trace',
+            f'trace {event.trace_no}',
+            event.trace_no,
+            self._time(event.started_at, event.monotonic_ns),
+        )
+        span.attributes.update(thread_no=event.thread_no, task_no=event.task_no)
+        self._traces[event.trace_no] = span
+        self._writer.name_trace(span)
+
+    @hookimpl
+    async def on_end_trace(self, event: OnEndTrace) -> None:
+        if self._writer is None:
+            return
+        trace_no = event.trace_no
+        at, monotonic_ns = event.ended_at, event.monotonic_ns
+        for spans in (self._prompts, self._cmdloops, self._trace_calls):
+            self._close(spans, trace_no, at, monotonic_ns)
+        self._close(self._traces, trace_no, at, monotonic_ns)
+        self._n_trace_calls.pop(trace_no, None)
+        self._unsampled.pop(trace_no, None)
+
+    @hookimpl
+    async def on_start_trace_call(self, event: OnStartTraceCall) -> None:
+        if self._writer is None or event.trace_no not in self._traces:
+            return
+        n = self._n_trace_calls.get(event.trace_no, 0)
+        self._n_trace_calls[event.trace_no] = n + 1
+        if n % self._sample:
+            self._unsampled[event.trace_no] = event
+            return
+        self._open_trace_call(event)
+
+    @hookimpl
+    async def on_end_trace_call(self, event: OnEndTraceCall) -> None:
+        self._unsampled.pop(event.trace_no, None)
+        self._close(
+            self._trace_calls, event.trace_no, event.ended_at, event.monotonic_ns
+        )
+
+    @hookimpl
+    async def on_start_cmdloop(self, event: OnStartCmdloop) -> None:
+        if (parent := self._trace_calls.get(event.trace_no)) is None:
+            if (unsampled := self._unsampled.pop(event.trace_no, None)) is None:
+                return
+            parent = self._open_trace_call(unsampled)
+        span = self._open(
+            parent.span_id,
+            'cmdloop',
+            'cmdloop',
+            event.trace_no,
+            self._time(event.started_at, event.monotonic_ns),
+        )
+        self._cmdloops[event.trace_no] = span
+
+    @hookimpl
+    async def on_end_cmdloop(self, event: OnEndCmdloop) -> None:
+        self._close(self._cmdloops, event.trace_no, event.ended_at, event.monotonic_ns)
+
+    @hookimpl
+    async def on_start_prompt(self, event: OnStartPrompt) -> None:
+        if (parent := self._cmdloops.get(event.trace_no)) is None:
+            return
+        span = self._open(
+            parent.span_id,
+            'prompt',
+            f'prompt {event.prompt_no}',
+            event.trace_no,
+            self._time(event.started_at, event.monotonic_ns),
+        )
+        span.attributes.update(prompt_no=event.prompt_no)
+        self._prompts[event.trace_no] = span
+
+    @hookimpl
+    async def on_end_prompt(self, event: OnEndPrompt) -> None:
+        if (span := self._prompts.get(event.trace_no)) is not None:
+            span.attributes.update(command=event.command)
+        self._close(self._prompts, event.trace_no, event.ended_at, event.monotonic_ns)
+
+    def _open_trace_call(self, event: OnStartTraceCall) -> _Span:
+        span = self._open(
+            self._traces[event.trace_no].span_id,
+            'trace_call',
+            f'{event.event} {event.file_name}:{event.line_no}',
+            event.trace_no,
+            self._time(event.started_at, event.monotonic_ns),
+        )
+        span.attributes.update(trace_call_no=event.trace_call_no)
+        self._trace_calls[event.trace_no] = span
+        return span
+
+    def _open(
+        self,
+        parent_id: Optional[int],
+        kind: str,
+        name: str,
+        trace_no: int,
+        start: int,
+    ) -> _Span:
+        return _Span(
+            span_id=next(self._ids),
+            parent_id=parent_id,
+            kind=kind,
+            name=name,
+            trace_no=trace_no,
+            start=start,
+        )
+
+    def _close(
+        self,
+        spans: dict[TraceNo, _Span],
+        trace_no: TraceNo,
+        ended_at: datetime.datetime,
+        monotonic_ns: Optional[int],
+    ) -> None:
+        if self._writer is None or (span := spans.pop(trace_no, None)) is None:
+            return
+        self._writer.write(span, self._time(ended_at, monotonic_ns))
+
+    def _time(self, at: datetime.datetime, monotonic_ns: Optional[int]) -> int:
+        '''Microseconds since the start of the run.
+
+        From the monotonic clock if the reading is given. Otherwise, from the
+        wall clock, which can jump, e.g., when the system clock is adjusted.
+        '''
+        if monotonic_ns is not None:
+            return (monotonic_ns - self._run_started_ns) // 1000
+        elapsed = _to_naive_utc(at) - self._run_started_at
+        return elapsed // datetime.timedelta(microseconds=1)
+
+
+def _to_naive_utc(at: datetime.datetime) -> datetime.datetime:
+    # The times of the events in the spawned process are naive in UTC. Those
+    # of the run are aware.
+    if at.tzinfo is None:
+        return at
+    return at.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class _JsonLinesWriter:
+    '''Write a span per line as a JSON object.'''
+
+    def __init__(self, file: TextIO, run_no: RunNo) -> None:
+        self._file = file
+        self._run_no = run_no
+
+    def name_trace(self, span: _Span) -> None:
+        pass
+
+    def write(self, span: _Span, end: int) -> None:
+        record = {
+            'run_no': self._run_no,
+            'span_id': span.span_id,
+            'parent_id': span.parent_id,
+            'kind': span.kind,
+            'name': span.name,
+            'trace_no': span.trace_no,
+            'start': span.start,
+            'end': end,
+            'attributes': span.attributes,
+        }
+        self._file.write(json.dumps(record) + '\n')
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ChromeTraceWriter:
+    '''Write the spans in the JSON array format of the Chrome trace events.
+
+    The traces are shown as threads of a process, which is the run.
+    '''
+
+    def __init__(self, file: TextIO, run_no: RunNo) -> None:
+        self._file = file
+        self._run_no = run_no
+        self._file.write('[\n')
+        self._first = True
+        self._metadata('process_name', 0, f'run {run_no}')
+        self._metadata('thread_name', 0, 'run')
+
+    def name_trace(self, span: _Span) -> None:
+        thread_no = span.attributes.get('thread_no')
+        task_no = span.attributes.get('task_no')
+        name = f'{span.name} (thread {thread_no}'
+        name += f', task {task_no})' if task_no is not None else ')'
+        self._metadata('thread_name', span.trace_no, name)
+
+    def write(self, span: _Span, end: int) -> None:
+        args = {'span_id': span.span_id, 'parent_id': span.parent_id}
+        args.update(span.attributes)
+        self._event(
+            {
+                'name': span.name,
+                'cat': span.kind,
+                'ph': 'X',
+                'ts': span.start,
+                'dur': max(end - span.start, 0),
+                'pid': self._run_no,
+                'tid': span.trace_no,
+                'args': args,
+            }
+        )
+
+    def close(self) -> None:
+        self._file.write('\n]\n')
+        self._file.close()
+
+    def _metadata(self, name: str, tid: int, value: str) -> None:
+        event = {'name': name, 'ph': 'M', 'pid': self._run_no, 'tid': tid}
+        self._event(event | {'args': {'name': value}})
+
+    def _event(self, event: dict[str, Any]) -> None:
+        if not self._first:
+            self._file.write(',\n')
+        self._first = False
+        self._file.write(json.dumps(event))
@@ -1,4 +1,5 @@
 import dataclasses
+import datetime
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Any, Callable, Optional
@@ -6,7 +7,15 @@ from typing import TYPE_CHECKING, Any, Callable, Optional
 import apluggy
 
 from nextline import events, spawned
-from nextline.types import InitOptions, ResetOptions
+from nextline.types import (
+    FunctionStats,
+    InitOptions,
+    PromptLatency,
+    ResetOptions,
+    RunNo,
+    StdoutInfo,
+    TraceNo,
+)
 from nextline.utils import ExitedProcess, RunningProcess
 from nextline.utils.pubsub.broker import PubSub
 
@@ -27,6 +36,7 @@ class Context:
     pubsub: PubSub
     run_arg: spawned.RunArg | None = None
     send_command: Callable[[spawned.Command], None] | None = None
+    count_queued_events: Callable[[], Optional[int]] | None = None
     running_process: RunningProcess[spawned.RunResult] | None = None
     exited_process: ExitedProcess[spawned.RunResult] | None = None
 
@@ -127,6 +137,40 @@ def result(context: Context) -> Any:
     ''''''
 
 
+@hookspec(firstresult=True)
+def get_line_hits(context: Context) -> Optional[dict[str, dict[int, int]]]:
+    '''The total numbers of executions of lines in the current run.'''
+
+
+@hookspec(firstresult=True)
+def get_profile_samples(context: Context) -> Optional[dict[str, int]]:
+    '''The total numbers of samples by folded stack in the current run.'''
+
+
+@hookspec(firstresult=True)
+def get_function_stats(
+    context: Context, trace_no: Optional[TraceNo]
+) -> Optional[list[FunctionStats]]:
+    '''The function stats of the trace, or of all traces if `trace_no` is None.'''
+
+
+@hookspec(firstresult=True)
+def get_prompt_latency(context: Context) -> Optional[PromptLatency]:
+    '''The latencies of the prompts in the current or last run.'''
+
+
+@hookspec(firstresult=True)
+def get_stdout(
+    context: Context,
+    run_no: Optional[RunNo],
+    trace_no: Optional[TraceNo],
+    start: int,
+    limit: Optional[int],
+    since: Optional[datetime.datetime],
+) -> Optional[list[StdoutInfo]]:
+    '''The lines written to stdout and stderr in the run.'''
+
+
 @hookspec
 async def on_start_trace(context: Context, event: events.OnStartTrace) -> None:
     ''''''
@@ -170,3 +214,35 @@ async def on_end_prompt(context: Context, event: events.OnEndPrompt) -> None:
 @hookspec
 async def on_write_stdout(context: Context, event: events.OnWriteStdout) -> None:
     ''''''
+
+
+@hookspec
+async def on_sample_resources(
+    context: Context, event: events.OnSampleResources
+) -> None:
+    ''''''
+
+
+@hookspec
+async def on_line_hits(context: Context, event: events.OnLineHits) -> None:
+    ''''''
+
+
+@hookspec
+async def on_function_stats(context: Context, event: events.OnFunctionStats) -> None:
+    ''''''
+
+
+@hookspec
+async def on_profile_samples(context: Context, event: events.OnProfileSamples) -> None:
+    ''''''
+
+
+@hookspec
+async def on_memory_snapshot(context: Context, event: events.OnMemorySnapshot) -> None:
+    ''''''
+
+
+@hookspec
+async def on_hook_stats(context: Context, event: events.OnHookStats) -> None:
+    ''''''
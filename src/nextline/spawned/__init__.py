@@ -1,9 +1,10 @@
-'''Code used in the sub-processes in which the Nextline user code is run.
-'''
+'''Code used in the sub-processes in which the Nextline user code is run.'''
 
 __all__ = [
     'Command',
     'PdbCommand',
+    'SendFunctionStats',
+    'EndOfEvents',
     'Event',
     'OnEndCmdloop',
     'OnEndPrompt',
@@ -25,11 +26,11 @@ __all__ = [
 
 import traceback
 
-from nextline.utils import wait_until_queue_empty
+from nextline.utils import set_resources
 
-from .commands import Command, PdbCommand
+from .commands import Command, PdbCommand, SendFunctionStats
 from .runner import run
-from .types import QueueIn, QueueOut, RunArg, RunResult, Statement
+from .types import EndOfEvents, QueueIn, QueueOut, RunArg, RunResult, Statement
 
 _queue_in: 'QueueIn | None' = None
 _queue_out: 'QueueOut | None' = None
@@ -47,9 +48,21 @@ def main(run_arg: RunArg) -> RunResult:
     assert _queue_in
     assert _queue_out
     try:
-        ret = run(run_arg, _queue_in, _queue_out)
-        wait_until_queue_empty(queue=_queue_out)
-        return ret
+        try:
+            # In the process that runs the statement, not in the initializer,
+            # so that the errors, e.g., of invalid values, are of the run.
+            set_resources(
+                cpu_affinity=run_arg.cpu_affinity,
+                nice=run_arg.nice,
+                rlimit_as=run_arg.rlimit_as,
+                rlimit_cpu=run_arg.rlimit_cpu,
+            )
+        except Exception as exc:
+            return RunResult(exc=exc)
+        return run(run_arg, _queue_in, _queue_out)
     except BaseException:
         traceback.print_exc()
         raise
+    finally:
+        # The parent process relays events until this marker.
+        _queue_out.put(EndOfEvents())
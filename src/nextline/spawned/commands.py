@@ -13,3 +13,8 @@ class PdbCommand(Command):
     trace_no: TraceNo
     prompt_no: PromptNo
     command: str
+
+
+@dataclass
+class SendFunctionStats(Command):
+    '''Request the function stats of the running traces.'''
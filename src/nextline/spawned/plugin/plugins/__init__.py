@@ -6,19 +6,43 @@ from nextline.spawned.types import RunArg
 
 from .compose import CallableComposer
 from .concurrency import TaskAndThreadKeeper, TaskOrThreadToTraceMapper
+from .cpu_time import TraceCpuTimer
 from .filter import FilerByModule, FilterByModuleName, FilterLambda, FilterMainScript
+from .function_stats import FunctionTimer
 from .global_ import GlobalTraceFunc, TraceFuncCreator
+from .hook_stats import HookStatsSender
+from .line_hits import LineHitCounter
 from .local_ import LocalTraceFunc, TraceCallHandler
+from .memory import MemoryTracer
 from .pdb_ import PdbInstanceFactory, Prompt
 from .peek import PeekStdout
+from .profile import StackSampler
 from .repeat import Repeater
+from .resources import ResourceSampler
 
 
 def register(hook: PluginManager, run_arg: RunArg) -> None:
     hook.register(Repeater)
+    hook.register(ResourceSampler)
+    if run_arg.profile_interval > 0 or run_arg.profile_only:
+        hook.register(StackSampler)
+    if run_arg.memory:
+        hook.register(MemoryTracer)
     hook.register(PeekStdout)
     hook.register(Prompt)
+    if not run_arg.profile_only:
+        _register_tracing(hook, run_arg)
+    hook.register(CallableComposer)
+    if run_arg.hook_stats:
+        # Registered last so that its `context()` is entered first and exited
+        # last, after the hooks called at the exits of the other contexts.
+        hook.register(HookStatsSender)
+
+
+def _register_tracing(hook: PluginManager, run_arg: RunArg) -> None:
     hook.register(PdbInstanceFactory)
+    if run_arg.cpu_time:
+        hook.register(TraceCpuTimer)
     hook.register(TraceCallHandler)
     hook.register(LocalTraceFunc)
     hook.register(TaskOrThreadToTraceMapper)
@@ -30,6 +54,9 @@ def register(hook: PluginManager, run_arg: RunArg) -> None:
     else:
         hook.register(FilterLambda)
         hook.register(FilterMainScript)
+    if run_arg.line_hits:
+        hook.register(LineHitCounter)
+    if run_arg.function_stats:
+        hook.register(FunctionTimer)
     hook.register(GlobalTraceFunc)
     hook.register(TraceFuncCreator)
-    hook.register(CallableComposer)
@@ -0,0 +1,50 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+from apluggy import PluginManager
+
+from nextline.spawned.plugin.spec import hookimpl
+from nextline.spawned.types import TraceCallInfo
+from nextline.types import TraceNo
+
+
+class TraceCpuTimer:
+    '''Measure the CPU time of each trace.
+
+    Only with the option `cpu_time` as it adds to the cost of each trace call.
+    The CPU time of the thread, `time.thread_time()`, between two consecutive
+    trace calls of the same trace in the thread is added to the trace. The
+    time after a "return" event is not counted until the next trace call so
+    that the time in which an asyncio task is suspended, i.e., in which other
+    tasks run, is not added. The time in the trace calls, e.g., at prompts,
+    is not added either.
+    '''
+
+    @hookimpl
+    def init(self, hook: PluginManager) -> None:
+        self._hook = hook
+        self._local = threading.local()
+        self._cpu_times = dict[TraceNo, float]()
+
+    @hookimpl
+    @contextmanager
+    def on_trace_call(self, trace_call_info: TraceCallInfo) -> Iterator[None]:
+        now = time.thread_time()
+        trace_no = self._hook.hook.current_trace_no()
+        local = self._local
+        cpu_time = self._cpu_times.get(trace_no, 0.0)
+        if getattr(local, 'trace_no', None) == trace_no:
+            cpu_time += now - local.mark
+        self._cpu_times[trace_no] = cpu_time
+        try:
+            yield
+        finally:
+            local.trace_no = None if trace_call_info.event == 'return' else trace_no
+            local.mark = time.thread_time()
+
+    @hookimpl
+    def trace_cpu_time(self, trace_no: TraceNo) -> Optional[float]:
+        return self._cpu_times.get(trace_no)
@@ -0,0 +1,156 @@
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import CodeType
+
+from apluggy import PluginManager
+
+from nextline.events import OnFunctionStats
+from nextline.spawned.commands import Command, SendFunctionStats
+from nextline.spawned.path import to_canonic_path
+from nextline.spawned.plugin.spec import hookimpl
+from nextline.spawned.types import QueueOut, RunArg, TraceCallInfo
+from nextline.types import FunctionStats, TraceNo
+
+
+@dataclass
+class _Frame:
+    frame_object_id: int
+    code: CodeType
+    start: float
+    overhead: float  # The overhead of the trace at the start
+    child: float = 0.0  # The inclusive time of the callees
+
+
+@dataclass
+class _Trace:
+    stack: list[_Frame] = field(default_factory=list)
+    overhead: float = 0.0  # The total time in the trace calls
+    table: dict[CodeType, list] = field(default_factory=dict)
+
+
+class FunctionTimer:
+    '''Collect the calls to and the time spent in each function by trace.
+
+    The time is measured with `time.perf_counter()` between the "call" and
+    "return" events of each frame, as in the deterministic profiler cProfile,
+    with the time in the trace calls, e.g., at prompts, subtracted. The time
+    of a recursive call is included in the inclusive time only at the
+    outermost call.
+
+    The stats of a trace are sent when the trace ends, and those of all
+    traces when the command `SendFunctionStats` is received and at the end.
+
+    Frames whose "return" events are not traced, e.g., because the Pdb
+    doesn't trace them while continuing, are ended at the "return" event of
+    the nearest traced caller.
+    '''
+
+    @hookimpl
+    def init(self, hook: PluginManager, run_arg: RunArg, queue_out: QueueOut) -> None:
+        self._hook = hook
+        self._run_no = run_arg.run_no
+        self._queue_out = queue_out
+        self._traces = dict[TraceNo, _Trace]()
+        self._lock = threading.Lock()
+
+    @hookimpl
+    @contextmanager
+    def context(self) -> Iterator[None]:
+        try:
+            yield
+        finally:
+            with self._lock:
+                trace_nos = list(self._traces)
+            for trace_no in trace_nos:
+                self._send(trace_no, pop=True)
+
+    @hookimpl
+    def on_end_trace(self, trace_no: TraceNo) -> None:
+        self._send(trace_no, pop=True)
+
+    @hookimpl
+    def on_command(self, command: Command) -> None:
+        if not isinstance(command, SendFunctionStats):
+            return
+        with self._lock:
+            trace_nos = list(self._traces)
+        for trace_no in trace_nos:
+            self._send(trace_no)
+
+    @hookimpl
+    @contextmanager
+    def on_trace_call(self, trace_call_info: TraceCallInfo) -> Iterator[None]:
+        now = time.perf_counter()
+        trace_no = self._hook.hook.current_trace_no()
+        if (trace := self._traces.get(trace_no)) is None:
+            trace = self._traces[trace_no] = _Trace()
+        event = trace_call_info.event
+        if event == 'return':
+            self._return(trace, trace_call_info.frame_object_id, now)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            trace.overhead += end - now
+            if event == 'call':
+                frame, _, _ = trace_call_info.args
+                trace.stack.append(
+                    _Frame(
+                        frame_object_id=trace_call_info.frame_object_id,
+                        code=frame.f_code,
+                        start=end,
+                        overhead=trace.overhead,
+                    )
+                )
+
+    def _return(self, trace: _Trace, frame_object_id: int, now: float) -> None:
+        stack = trace.stack
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i].frame_object_id == frame_object_id:
+                break
+        else:
+            return
+        with self._lock:
+            while len(stack) > i:
+                frame = stack.pop()
+                elapsed = now - frame.start - (trace.overhead - frame.overhead)
+                if (entry := trace.table.get(frame.code)) is None:
+                    entry = trace.table[frame.code] = [0, 0.0, 0.0]
+                entry[0] += 1
+                if not any(f.code is frame.code for f in stack):
+                    entry[1] += elapsed
+                entry[2] += elapsed - frame.child
+                if stack:
+                    stack[-1].child += elapsed
+
+    def _send(self, trace_no: TraceNo, pop: bool = False) -> None:
+        with self._lock:
+            if pop:
+                trace = self._traces.pop(trace_no, None)
+            else:
+                trace = self._traces.get(trace_no)
+            if trace is None or not trace.table:
+                return
+            stats = tuple(
+                FunctionStats(
+                    file_name=to_canonic_path(code.co_filename),
+                    line_no=code.co_firstlineno,
+                    name=_name(code),
+                    calls=calls,
+                    inclusive_time=inclusive_time,
+                    exclusive_time=exclusive_time,
+                )
+                for code, (calls, inclusive_time, exclusive_time) in trace.table.items()
+            )
+        event = OnFunctionStats(run_no=self._run_no, trace_no=trace_no, stats=stats)
+        self._queue_out.put(event)
+
+
+def _name(code: CodeType) -> str:
+    if sys.version_info >= (3, 11):
+        return code.co_qualname
+    return code.co_name  # pragma: no cover
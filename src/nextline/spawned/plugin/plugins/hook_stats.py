@@ -0,0 +1,38 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from apluggy import PluginManager
+
+from nextline.events import OnHookStats
+from nextline.spawned.plugin.spec import hookimpl
+from nextline.spawned.types import QueueOut, RunArg
+from nextline.types import HookStat
+from nextline.utils import HookTimer
+
+
+class HookStatsSender:
+    '''Measure the hooks of the plugins in this process and send the stats at the end.
+
+    To be registered last so that its `context()` wraps those of the other
+    plugins.
+    '''
+
+    @hookimpl
+    def init(self, hook: PluginManager, run_arg: RunArg, queue_out: QueueOut) -> None:
+        self._run_no = run_arg.run_no
+        self._queue_out = queue_out
+        self._timer = HookTimer(hook)
+        self._timer.start()
+
+    @hookimpl
+    @contextmanager
+    def context(self) -> Iterator[None]:
+        try:
+            yield
+        finally:
+            self._timer.stop()
+            stats = tuple(
+                HookStat(hook_name=hook_name, plugin=plugin, calls=calls, time=time)
+                for (hook_name, plugin), (calls, time) in self._timer.stats().items()
+            )
+            self._queue_out.put(OnHookStats(run_no=self._run_no, stats=stats))
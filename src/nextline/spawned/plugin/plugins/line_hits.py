@@ -0,0 +1,68 @@
+import threading
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from nextline.events import OnLineHits
+from nextline.spawned.plugin.spec import hookimpl
+from nextline.spawned.types import QueueOut, RunArg, TraceCallInfo
+from nextline.utils import run_periodically
+
+# The interval in seconds at which the changed counts are sent
+LINE_HITS_INTERVAL = 0.1
+
+
+class LineHitCounter:
+    '''Count the "line" events by file and line number.
+
+    The counts are kept in an array for each file. The counts that have
+    changed are sent every `LINE_HITS_INTERVAL` seconds and at the end.
+    '''
+
+    @hookimpl
+    def init(self, run_arg: RunArg, queue_out: QueueOut) -> None:
+        self._run_no = run_arg.run_no
+        self._queue_out = queue_out
+        self._counts = dict[str, 'array[int]']()
+        self._changed = dict[str, set[int]]()
+        self._lock = threading.Lock()
+
+    @hookimpl
+    @contextmanager
+    def context(self) -> Iterator[None]:
+        try:
+            with run_periodically(self._send, LINE_HITS_INTERVAL):
+                yield
+        finally:
+            self._send()
+
+    @hookimpl
+    @contextmanager
+    def on_trace_call(self, trace_call_info: TraceCallInfo) -> Iterator[None]:
+        if trace_call_info.event == 'line':
+            self._count(trace_call_info.file_name, trace_call_info.line_no)
+        yield
+
+    def _count(self, file_name: str, line_no: int) -> None:
+        with self._lock:
+            if (counts := self._counts.get(file_name)) is None:
+                counts = self._counts[file_name] = array('Q')
+            if len(counts) <= line_no:
+                counts.extend([0] * (line_no + 1 - len(counts)))
+            counts[line_no] += 1
+            if (changed := self._changed.get(file_name)) is None:
+                changed = self._changed[file_name] = set()
+            changed.add(line_no)
+
+    def _send(self) -> None:
+        with self._lock:
+            if not self._changed:
+                return
+            hits = {
+                file_name: {
+                    line_no: self._counts[file_name][line_no] for line_no in lines
+                }
+                for file_name, lines in self._changed.items()
+            }
+            self._changed.clear()
+        self._queue_out.put(OnLineHits(run_no=self._run_no, hits=hits))
@@ -0,0 +1,102 @@
+import datetime
+import os
+import threading
+import tracemalloc
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+from apluggy import PluginManager
+
+import nextline
+from nextline.events import OnMemorySnapshot
+from nextline.spawned.path import to_canonic_path
+from nextline.spawned.plugin.spec import hookimpl
+from nextline.spawned.types import QueueOut, RunArg
+from nextline.types import MemoryStat, PromptNo, TraceNo
+
+# The number of the lines in the summary of a snapshot
+MEMORY_TOP_N = 10
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, os.path.join(os.path.dirname(nextline.__file__), '*')),
+)
+
+
+class MemoryTracer:
+    '''Trace the memory allocations and send a summary at each prompt and the end.
+
+    `tracemalloc` is started at the beginning of the run. A snapshot is taken
+    at each prompt and at the end. The `MEMORY_TOP_N` lines whose allocations
+    have grown the most since the previous snapshot are sent with the total
+    current and peak sizes. The allocations in nextline are excluded.
+    '''
+
+    @hookimpl
+    def init(self, hook: PluginManager, run_arg: RunArg, queue_out: QueueOut) -> None:
+        self._hook = hook
+        self._run_no = run_arg.run_no
+        self._queue_out = queue_out
+        self._lock = threading.Lock()
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+
+    @hookimpl
+    @contextmanager
+    def context(self) -> Iterator[None]:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            self._send(final=True)
+            if started:
+                tracemalloc.stop()
+            self._snapshot = None
+
+    @hookimpl
+    @contextmanager
+    def on_prompt(self, prompt_no: PromptNo) -> Generator[None, str, None]:
+        trace_no: TraceNo = self._hook.hook.current_trace_no()
+        self._send(trace_no=trace_no, prompt_no=prompt_no)
+        yield
+        yield
+
+    def _send(
+        self,
+        trace_no: Optional[TraceNo] = None,
+        prompt_no: Optional[PromptNo] = None,
+        final: bool = False,
+    ) -> None:
+        with self._lock:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            current, peak = tracemalloc.get_traced_memory()
+            previous = self._snapshot or tracemalloc.Snapshot((), 1)
+            self._snapshot = snapshot
+        diffs = snapshot.compare_to(previous, 'lineno')[:MEMORY_TOP_N]
+        top = tuple(
+            MemoryStat(
+                file_name=to_canonic_path(frame.filename),
+                line_no=frame.lineno,
+                size=diff.size,
+                size_diff=diff.size_diff,
+                count=diff.count,
+                count_diff=diff.count_diff,
+            )
+            for diff in diffs
+            for frame in diff.traceback[:1]
+        )
+        event = OnMemorySnapshot(
+            taken_at=datetime.datetime.utcnow(),
+            run_no=self._run_no,
+            current=current,
+            peak=peak,
+            top=top,
+            trace_no=trace_no,
+            prompt_no=prompt_no,
+            final=final,
+        )
+        self._queue_out.put(event)
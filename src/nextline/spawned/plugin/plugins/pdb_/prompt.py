@@ -3,7 +3,7 @@ from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from logging import getLogger
 from queue import Queue
-from typing import TypeVar
+from typing import Any, Optional, TypeVar
 
 from apluggy import PluginManager
 
@@ -30,7 +30,8 @@ class Prompt:
     @hookimpl
     @contextmanager
     def context(self) -> Iterator[None]:
-        with relay_commands(self._queue_in, self._queue_map):
+        on_command = self._hook.hook.on_command
+        with relay_commands(self._queue_in, self._queue_map, on_command):
             yield
 
     @hookimpl
@@ -62,8 +63,15 @@ class Prompt:
 
 
 @contextmanager
-def relay_commands(queue_in: QueueIn, queue_map: QueueMap) -> Iterator[None]:
-    '''Pass the Pdb commands from the main process to the Pdb instances.'''
+def relay_commands(
+    queue_in: QueueIn,
+    queue_map: QueueMap,
+    on_command: Optional[Callable[..., Any]] = None,
+) -> Iterator[None]:
+    '''Pass the Pdb commands from the main process to the Pdb instances.
+
+    The other commands are passed to `on_command` as the keyword arg `command`.
+    '''
     logger = getLogger(__name__)
 
     def fn() -> None:
@@ -72,6 +80,8 @@ def relay_commands(queue_in: QueueIn, queue_map: QueueMap) -> Iterator[None]:
             logger.debug(f'queue_in.get() -> {msg!r}')
             if isinstance(msg, PdbCommand):
                 queue_map[msg.trace_no].put(msg)
+            elif on_command is not None:
+                on_command(command=msg)
 
     with ThreadPoolExecutor(max_workers=1) as executor:
         future = executor.submit(try_again_on_error, fn)  # type: ignore
@@ -1,59 +1,309 @@
-from collections import defaultdict
-from collections.abc import Callable, Iterator
-from contextlib import contextmanager
-from typing import Any, ContextManager, TypeVar
+import io
+import sys
+import threading
+import time
+from collections.abc import Callable, Generator, Iterator
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from typing import Any, Generic, Optional, TextIO, TypeVar
 
 from apluggy import PluginManager
 
 from nextline.spawned.plugin.spec import hookimpl
+from nextline.spawned.types import RunArg
 from nextline.types import TraceNo
-from nextline.utils import peek_stdout
+from nextline.utils import CoalescingFlusher, peek_fd, peek_textio
 
 
 class PeekStdout:
+    '''Send the text written to stdout, and to stderr if `capture_fd`, by trace.
+
+    If `run_arg.capture_fd` is true, the file descriptors 1 and 2 are captured
+    with `peek_fd()` so that the text written by C extensions, `os.write()`,
+    and child processes is also sent. Such text is not attributed to any trace.
+    `sys.stdout` and `sys.stderr` are replaced with streams that write to the
+    original file descriptors so that the text written in Python is sent once
+    with the trace in which it was written.
+
+    The text of a trace is sent before the prompts of the trace and before
+    the end of the trace.
+
+    With `run_arg.profile_only`, nothing is traced. The text is then sent
+    without being attributed to any trace.
+    '''
+
     @hookimpl
-    def init(self, hook: PluginManager) -> None:
+    def init(self, hook: PluginManager, run_arg: RunArg) -> None:
         self._hook = hook
+        self._capture_fd = run_arg.capture_fd
+        self._profile_only = run_arg.profile_only
 
     @hookimpl
     def on_start_trace(self, trace_no: TraceNo) -> None:
         assert trace_no == self._key_factory()
 
+    @hookimpl(tryfirst=True)
+    def on_end_trace(self, trace_no: TraceNo) -> None:
+        # Before `OnEndTrace` is sent
+        self._flush(trace_no)
+
+    @hookimpl(tryfirst=True)
+    @contextmanager
+    def on_prompt(self) -> Generator[None, str, None]:
+        # Before `OnStartPrompt` is sent
+        if trace_no := self._key_factory():
+            self._flush(trace_no)
+        yield
+        yield
+
     @hookimpl
     @contextmanager
     def context(self) -> Iterator[None]:
-        with peek_stdout_by_key(key_factory=self._key_factory, callback=self._callback):
+        self._readers = list[ReadLinesByKey[TraceNo]]()
+        if self._profile_only:
+            with self._peek_untraced():
+                yield
+            return
+        with ExitStack() as stack:
+            if self._capture_fd:
+                stack.enter_context(self._capture_fds())
+            streams = ('stdout', 'stderr') if self._capture_fd else ('stdout',)
+            for stream in streams:
+                read_lines_by_key = stack.enter_context(
+                    ReadLinesByKey(partial(self._callback, stream), interval=0.02)
+                )
+                assign_key = AssignKey(
+                    key_factory=self._key_factory, callback=read_lines_by_key
+                )
+                stack.enter_context(peek_textio(getattr(sys, stream), assign_key))
+                self._readers.append(read_lines_by_key)
+            yield
+
+    def _flush(self, trace_no: TraceNo) -> None:
+        for read_lines_by_key in self._readers:
+            read_lines_by_key.flush(key=trace_no, partial=True)
+
+    @contextmanager
+    def _peek_untraced(self) -> Iterator[None]:
+        if self._capture_fd:
+            with self._capture_fds(redirect=False):
+                try:
+                    yield
+                finally:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+            return
+        with ReadLinesByKey(self._callback_untraced, interval=0.02) as read_lines:
+            with peek_textio(sys.stdout, partial(read_lines, 'stdout')):
+                yield
+
+    @contextmanager
+    def _capture_fds(self, redirect: bool = True) -> Iterator[None]:
+        with ExitStack() as stack:
+            read_lines_by_stream = stack.enter_context(
+                ReadLinesByKey(self._callback_untraced, interval=0.02)
+            )
+            stdout_fd = stack.enter_context(
+                peek_fd(1, partial(read_lines_by_stream, 'stdout'))
+            )
+            stderr_fd = stack.enter_context(
+                peek_fd(2, partial(read_lines_by_stream, 'stderr'))
+            )
+            if redirect:
+                # The text written in Python is peeked by trace instead.
+                stack.enter_context(_redirect_textio('stdout', stdout_fd))
+                stack.enter_context(_redirect_textio('stderr', stderr_fd))
             yield
 
     def _key_factory(self) -> TraceNo | None:
         return self._hook.hook.current_trace_no()
 
-    def _callback(self, trace_no: TraceNo, line: str) -> None:
-        self._hook.hook.on_write_stdout(trace_no=trace_no, line=line)
+    def _callback_untraced(self, stream: str, line: str) -> None:
+        self._callback(stream, None, line)
+
+    def _callback(self, stream: str, trace_no: TraceNo | None, line: str) -> None:
+        if stream == 'stdout' and trace_no is not None:
+            self._hook.hook.on_write_stdout(trace_no=trace_no, line=line)
+        else:
+            self._hook.hook.on_write_captured(
+                stream=stream, trace_no=trace_no, line=line
+            )
+
+
+@contextmanager
+def _redirect_textio(name: str, fd: int) -> Iterator[None]:
+    '''Replace `sys.stdout` or `sys.stderr` with a stream that writes to the fd.'''
+    org: TextIO = getattr(sys, name)
+    org.flush()
+    textio = io.TextIOWrapper(
+        io.FileIO(fd, 'w', closefd=False),
+        encoding=org.encoding,
+        errors=org.errors,
+        line_buffering=True,
+    )
+    setattr(sys, name, textio)
+    try:
+        yield
+    finally:
+        textio.flush()
+        setattr(sys, name, org)
 
 
 _T = TypeVar('_T')
 
 
+@contextmanager
 def peek_stdout_by_key(
     key_factory: Callable[[], _T | None],
     callback: Callable[[_T, str], Any],
-) -> ContextManager[Callable[[str], int]]:
-    callback_ = ReadLinesByKey(callback)
-    assign_key = AssignKey(key_factory=key_factory, callback=callback_)
-    return peek_stdout(assign_key)
+    interval: float = 0.02,
+) -> Iterator[Callable[[str], int]]:
+    '''Call the callback with the key and lines written to stdout.
+
+    The callback is called in a separate thread with each line and its key.
+    See `ReadLinesByKey` for the `interval`.
+    '''
+    with peek_textio_by_key(
+        sys.stdout, key_factory=key_factory, callback=callback, interval=interval
+    ) as write:
+        yield write
+
+
+@contextmanager
+def peek_textio_by_key(
+    textio: TextIO,
+    key_factory: Callable[[], _T | None],
+    callback: Callable[[_T, str], Any],
+    interval: float = 0.02,
+) -> Iterator[Callable[[str], int]]:
+    '''Call the callback with the key and lines written to the textio.
+
+    Same as `peek_stdout_by_key()` for any text stream.
+    '''
+    with ReadLinesByKey(callback, interval=interval) as read_lines_by_key:
+        assign_key = AssignKey(key_factory=key_factory, callback=read_lines_by_key)
+        with peek_textio(textio, assign_key) as write:
+            yield write
+
+
+class ReadLinesByKey(Generic[_T]):
+    '''Assemble text into lines by key and call the callback with each line.
+
+    The text is kept in lists of chunks until it is passed to the callback so
+    that the cost is linear in the length of the text.
+
+    A thread calls the callback with the complete lines, at most once every
+    `interval` seconds; bursts of writes are coalesced. The incomplete line
+    at the end is kept until its line break is written, until no text has
+    been written for the key for `interval` seconds, e.g., for a progress
+    bar, or until it is flushed with `flush()` with `partial=True`, which is
+    done at `close()`.
+    '''
+
+    def __init__(self, callback: Callable[[_T, str], Any], interval: float) -> None:
+        self._callback = callback
+        self._interval = interval
+        self._lines = dict[_T, list[str]]()
+        self._partial = dict[_T, list[str]]()
+        # The times of the last writes of the keys with incomplete lines
+        self._written_at = dict[_T, float]()
+        self._lock = threading.Lock()
+        # Held while the lines are passed to the callback so that the lines
+        # taken in a flush are passed before those in the next flush.
+        self._flush_lock = threading.Lock()
+        self._flusher = CoalescingFlusher(self._flush_idle, interval=interval)
+
+    def __call__(self, key: _T, s: str) -> None:
+        with self._lock:
+            if (i := s.rfind('\n')) < 0:
+                if (partial := self._partial.get(key)) is None:
+                    self._partial[key] = [s]
+                else:
+                    partial.append(s)
+            else:
+                if (lines := self._lines.get(key)) is None:
+                    lines = self._lines[key] = []
+                if (partial := self._partial.pop(key, None)) is not None:
+                    lines.extend(partial)
+                lines.append(s[: i + 1])
+                if rest := s[i + 1 :]:
+                    self._partial[key] = [rest]
+            if key in self._partial:
+                self._written_at[key] = time.monotonic()
+            else:
+                self._written_at.pop(key, None)
+        self._flusher.notify()
+
+    def start(self) -> None:
+        self._flusher.start()
+
+    def close(self) -> None:
+        self._flusher.close()
+        self.flush(partial=True)
+
+    def flush(self, key: Optional[_T] = None, partial: bool = False) -> None:
+        '''Call the callback with each complete line.
+
+        Only the lines of the `key` if given. If `partial` is true, the
+        incomplete lines are also passed.
+        '''
+        with self._flush_lock:
+            with self._lock:
+                batches = self._take(key, partial)
+            self._emit(batches)
+
+    def _flush_idle(self) -> None:
+        '''Flush the complete lines and the incomplete lines idle for `interval`.
+
+        Called by the flusher, which is notified again while incomplete lines
+        remain so that they are flushed once they are idle.
+        '''
+        idle_since = time.monotonic() - self._interval
+        with self._flush_lock:
+            with self._lock:
+                batches = self._take(None, partial=False)
+                idle = [k for k, t in self._written_at.items() if t <= idle_since]
+                for k in idle:
+                    batches.setdefault(k, []).extend(self._partial.pop(k))
+                    del self._written_at[k]
+                pending = bool(self._partial)
+            self._emit(batches)
+        if pending:
+            self._flusher.notify()
 
+    def _emit(self, batches: dict[_T, list[str]]) -> None:
+        for k, chunks in batches.items():
+            text = ''.join(chunks)
+            start = 0
+            while (i := text.find('\n', start) + 1) > 0:
+                self._callback(k, text[start:i])
+                start = i
+            if start < len(text):
+                self._callback(k, text[start:])
 
-def ReadLinesByKey(callback: Callable[[_T, str], Any]) -> Callable[[_T, str], Any]:
-    buffer = defaultdict[_T, str](str)
+    def _take(self, key: Optional[_T], partial: bool) -> dict[_T, list[str]]:
+        if key is None:
+            batches, self._lines = self._lines, {}
+            if partial:
+                for k, chunks in self._partial.items():
+                    batches.setdefault(k, []).extend(chunks)
+                self._partial.clear()
+                self._written_at.clear()
+            return batches
+        batches = {}
+        if (lines := self._lines.pop(key, None)) is not None:
+            batches[key] = lines
+        if partial and (rest := self._partial.pop(key, None)) is not None:
+            batches.setdefault(key, []).extend(rest)
+            self._written_at.pop(key, None)
+        return batches
 
-    def read_lines_by_key(key: _T, s: str) -> None:
-        buffer[key] += s
-        if s.endswith('\n'):
-            line = buffer.pop(key)
-            callback(key, line)
+    def __enter__(self) -> 'ReadLinesByKey[_T]':
+        self.start()
+        return self
 
-    return read_lines_by_key
+    def __exit__(self, *_: Any, **__: Any) -> None:
+        self.close()
 
 
 def AssignKey(
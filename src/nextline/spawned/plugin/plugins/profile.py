@@ -0,0 +1,139 @@
+import itertools
+import os
+import sys
+import threading
+from collections import Counter
+from collections.abc import Collection, Iterator
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from types import CodeType, FrameType
+from typing import Optional
+
+import nextline
+from nextline.events import OnProfileSamples
+from nextline.spawned.path import to_canonic_path
+from nextline.spawned.plugin.spec import hookimpl
+from nextline.spawned.types import QueueOut, RunArg
+from nextline.types import TraceNo
+from nextline.utils import match_any, run_periodically
+
+# The interval in seconds at which the new samples are sent
+PROFILE_SEND_INTERVAL = 1.0
+
+# The sampling interval in seconds with `profile_only` if `profile_interval` is not set
+PROFILE_INTERVAL = 0.01
+
+
+class StackSampler:
+    '''Sample the stacks of the traced threads at `run_arg.profile_interval`.
+
+    A thread takes the stacks of all threads with `sys._current_frames()` and
+    counts them as folded stacks. Only the threads in which traces have
+    started are sampled. With `run_arg.profile_only`, nothing is traced; all
+    threads are then sampled if `run_arg.trace_threads`, otherwise only the
+    main thread. The frames of the modules to skip, e.g., `threading`
+    and `asyncio`, of Pdb, and of nextline, including those that run the
+    statement, are omitted. Unlike the tracing, the
+    overhead does not depend on how much Python code the run executes.
+
+    The numbers of the new samples are sent every `PROFILE_SEND_INTERVAL`
+    seconds and at the end.
+    '''
+
+    @hookimpl
+    def init(
+        self, run_arg: RunArg, queue_out: QueueOut, modules_to_skip: Collection[str]
+    ) -> None:
+        self._run_no = run_arg.run_no
+        self._interval = run_arg.profile_interval
+        if self._interval <= 0:
+            self._interval = PROFILE_INTERVAL
+        self._profile_only = run_arg.profile_only
+        self._trace_threads = run_arg.trace_threads
+        self._queue_out = queue_out
+        # Pdb is in the stacks while the trace functions are called.
+        patterns = frozenset(modules_to_skip) | _PDB_MODULES
+        self._match_any = lru_cache(partial(match_any, patterns=patterns))
+        self._thread_ids = dict[TraceNo, int]()
+        self._samples = Counter[str]()
+        self._lock = threading.Lock()
+
+    @hookimpl
+    def on_start_trace(self, trace_no: TraceNo) -> None:
+        self._thread_ids[trace_no] = threading.get_ident()
+
+    @hookimpl
+    def on_end_trace(self, trace_no: TraceNo) -> None:
+        self._thread_ids.pop(trace_no, None)
+
+    @hookimpl
+    @contextmanager
+    def context(self) -> Iterator[None]:
+        n = max(1, round(PROFILE_SEND_INTERVAL / self._interval))
+        count = itertools.count(1)
+
+        def _sample() -> None:
+            self._sample()
+            if next(count) % n == 0:
+                self._send()
+
+        try:
+            with run_periodically(_sample, self._interval):
+                yield
+        finally:
+            self._send()
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        thread_ids: Collection[Optional[int]]
+        if not self._profile_only:
+            thread_ids = set(self._thread_ids.values())
+        elif self._trace_threads:
+            thread_ids = set(frames) - {threading.get_ident()}
+        else:
+            thread_ids = {threading.main_thread().ident}
+        stacks = [self._fold(f) for i, f in frames.items() if i in thread_ids]
+        del frames
+        with self._lock:
+            self._samples.update(s for s in stacks if s)
+
+    def _fold(self, frame: Optional[FrameType]) -> str:
+        # From the innermost frame. The frames of nextline before the frames
+        # of the user code are of the trace functions, and those after are
+        # of the runner, below which the frames are not of the run.
+        names = list[str]()
+        while frame is not None:
+            code = frame.f_code
+            if _is_nextline(code):
+                if names:
+                    break
+            elif not self._match_any(frame.f_globals.get('__name__')):
+                names.append(_frame_name(code))
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _send(self) -> None:
+        with self._lock:
+            if not self._samples:
+                return
+            samples = dict(self._samples)
+            self._samples.clear()
+        self._queue_out.put(OnProfileSamples(run_no=self._run_no, samples=samples))
+
+
+_PDB_MODULES = frozenset({'bdb', 'pdb', 'cmd'})
+
+_NEXTLINE_DIR = os.path.dirname(nextline.__file__) + os.sep
+
+
+@lru_cache(maxsize=4096)
+def _is_nextline(code: CodeType) -> bool:
+    # NOTE: The user code is run in the globals of a nextline module. It is
+    # told apart by the file name.
+    return code.co_filename.startswith(_NEXTLINE_DIR)
+
+
+@lru_cache(maxsize=4096)
+def _frame_name(code: CodeType) -> str:
+    name = code.co_qualname if sys.version_info >= (3, 11) else code.co_name
+    return f'{name} ({to_canonic_path(code.co_filename)}:{code.co_firstlineno})'
@@ -1,6 +1,8 @@
 import datetime
+import time
 from collections.abc import Generator, Iterator
 from contextlib import contextmanager
+from typing import Optional
 
 from apluggy import PluginManager
 
@@ -36,6 +38,7 @@ class Repeater:
         event = OnStartTrace(
             run_no=self._run_no,
             started_at=started_at,
+            monotonic_ns=time.monotonic_ns(),
             trace_no=trace_no,
             thread_no=thread_no,
             task_no=task_no,
@@ -45,7 +48,14 @@ class Repeater:
     @hookimpl
     def on_end_trace(self, trace_no: TraceNo) -> None:
         ended_at = datetime.datetime.utcnow()
-        event = OnEndTrace(ended_at=ended_at, run_no=self._run_no, trace_no=trace_no)
+        cpu_time = self._hook.hook.trace_cpu_time(trace_no=trace_no)
+        event = OnEndTrace(
+            ended_at=ended_at,
+            monotonic_ns=time.monotonic_ns(),
+            run_no=self._run_no,
+            trace_no=trace_no,
+            cpu_time=cpu_time,
+        )
         self._queue_out.put(event)
 
     @hookimpl
@@ -56,6 +66,7 @@ class Repeater:
         trace_call_no = trace_call_info.trace_call_no
         event_start = OnStartTraceCall(
             started_at=started_at,
+            monotonic_ns=time.monotonic_ns(),
             run_no=self._run_no,
             trace_no=trace_no,
             trace_call_no=trace_call_no,
@@ -72,6 +83,7 @@ class Repeater:
             ended_at = datetime.datetime.utcnow()
             event_end = OnEndTraceCall(
                 ended_at=ended_at,
+                monotonic_ns=time.monotonic_ns(),
                 run_no=self._run_no,
                 trace_no=trace_no,
                 trace_call_no=trace_call_no,
@@ -86,6 +98,7 @@ class Repeater:
         trace_call_no = self._hook.hook.current_trace_call_no()
         event_start = OnStartCmdloop(
             started_at=started_at,
+            monotonic_ns=time.monotonic_ns(),
             run_no=self._run_no,
             trace_no=trace_no,
             trace_call_no=trace_call_no,
@@ -98,6 +111,7 @@ class Repeater:
             ended_at = datetime.datetime.utcnow()
             event_end = OnEndCmdloop(
                 ended_at=ended_at,
+                monotonic_ns=time.monotonic_ns(),
                 run_no=self._run_no,
                 trace_no=trace_no,
                 trace_call_no=trace_call_no,
@@ -113,6 +127,7 @@ class Repeater:
         trace_call_no = trace_call_info.trace_call_no
         event_start = OnStartPrompt(
             started_at=started_at,
+            monotonic_ns=time.monotonic_ns(),
             run_no=self._run_no,
             trace_no=trace_no,
             trace_call_no=trace_call_no,
@@ -134,6 +149,7 @@ class Repeater:
             ended_at = datetime.datetime.utcnow()
             event_end = OnEndPrompt(
                 ended_at=ended_at,
+                monotonic_ns=time.monotonic_ns(),
                 run_no=self._run_no,
                 trace_no=trace_no,
                 trace_call_no=trace_call_no,
@@ -144,12 +160,24 @@ class Repeater:
 
     @hookimpl
     def on_write_stdout(self, trace_no: TraceNo, line: str) -> None:
+        self._write(trace_no=trace_no, line=line)
+
+    @hookimpl
+    def on_write_captured(
+        self, stream: str, trace_no: Optional[TraceNo], line: str
+    ) -> None:
+        self._write(trace_no=trace_no, line=line, stream=stream)
+
+    def _write(
+        self, trace_no: Optional[TraceNo], line: str, stream: str = 'stdout'
+    ) -> None:
+        # NOTE: Called in a separate thread.
         written_at = datetime.datetime.utcnow()
-        trace_no = self._hook.hook.current_trace_no()
         event = OnWriteStdout(
             written_at=written_at,
             run_no=self._run_no,
             trace_no=trace_no,
             text=line,
+            stream=stream,
         )
         self._queue_out.put(event)
@@ -0,0 +1,63 @@
+import datetime
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from nextline.events import OnSampleResources
+from nextline.spawned.plugin.spec import hookimpl
+from nextline.spawned.types import QueueOut, RunArg
+from nextline.types import RunNo
+from nextline.utils import run_periodically
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+# The interval in seconds of the samples while the run is active
+SAMPLE_INTERVAL = 1.0
+
+
+class ResourceSampler:
+    '''Send the resource usage of this process periodically and at the end.
+
+    The usage is from `resource.getrusage()`. Nothing is sent on platforms
+    without the `resource` module.
+    '''
+
+    @hookimpl
+    def init(self, run_arg: RunArg, queue_out: QueueOut) -> None:
+        self._run_no = run_arg.run_no
+        self._queue_out = queue_out
+
+    @hookimpl
+    @contextmanager
+    def context(self) -> Iterator[None]:
+        if resource is None:  # pragma: no cover
+            yield
+            return
+        try:
+            with run_periodically(self._sample, SAMPLE_INTERVAL):
+                yield
+        finally:
+            self._sample(final=True)
+
+    def _sample(self, final: bool = False) -> None:
+        event = sample_resources(run_no=self._run_no, final=final)
+        self._queue_out.put(event)
+
+
+def sample_resources(run_no: RunNo, final: bool = False) -> OnSampleResources:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    max_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    return OnSampleResources(
+        sampled_at=datetime.datetime.utcnow(),
+        run_no=run_no,
+        user_time=usage.ru_utime,
+        system_time=usage.ru_stime,
+        max_rss=max_rss,
+        voluntary_context_switches=usage.ru_nvcsw,
+        involuntary_context_switches=usage.ru_nivcsw,
+        final=final,
+    )
@@ -7,6 +7,7 @@ from typing import Any, Optional
 
 import apluggy
 
+from nextline.spawned.commands import Command
 from nextline.spawned.types import (
     QueueIn,
     QueueOut,
@@ -122,6 +123,12 @@ def on_end_trace(trace_no: TraceNo) -> None:
     pass
 
 
+@hookspec(firstresult=True)
+def trace_cpu_time(trace_no: TraceNo) -> Optional[float]:
+    '''The CPU time in seconds used by the trace.'''
+    pass
+
+
 @hookspec
 @contextmanager
 def on_trace_call(trace_call_info: TraceCallInfo) -> Iterator[None]:
@@ -170,3 +177,20 @@ def prompt(prompt_no: PromptNo, text: str) -> Optional[str]:
 @hookspec
 def on_write_stdout(trace_no: TraceNo, line: str) -> None:
     pass
+
+
+@hookspec
+def on_write_captured(stream: str, trace_no: Optional[TraceNo], line: str) -> None:
+    '''Called with a line of the other text captured with `capture_fd`.
+
+    The `stream` is 'stdout' or 'stderr'. The `trace_no` is None if the line is
+    not attributed to any trace. The lines written to `sys.stdout` in traces
+    are passed to `on_write_stdout()`.
+    '''
+    pass
+
+
+@hookspec
+def on_command(command: Command) -> None:
+    '''Called in a separate thread with a command other than `PdbCommand`.'''
+    pass
@@ -25,8 +25,11 @@ def _compile_and_run(hook: PluginManager, run_arg: RunArg) -> RunResult:
         return RunResult(exc=exc)
     trace_func = hook.hook.create_trace_func()
     try:
-        with sys_trace(trace_func=trace_func, thread=run_arg.trace_threads):
+        if trace_func is None:  # Not traced, e.g., with `run_arg.profile_only`
             ret = func()
+        else:
+            with sys_trace(trace_func=trace_func, thread=run_arg.trace_threads):
+                ret = func()
         return RunResult(ret=ret)
     except BaseException as exc:
         _remove_frame(exc=exc, frame=inspect.currentframe())
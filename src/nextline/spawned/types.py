@@ -23,6 +23,11 @@ QueueIn = Queue[Command]
 QueueOut = Queue[Event]
 
 
+@dataclass
+class EndOfEvents(Event):
+    '''Put in the queue by the spawned process after the last event of the run.'''
+
+
 @dataclass
 class RunArg:
     run_no: RunNo
@@ -30,6 +35,18 @@ class RunArg:
     filename: Optional[str] = None
     trace_threads: bool = True
     trace_modules: bool = True
+    capture_fd: bool = False
+    line_hits: bool = False
+    function_stats: bool = False
+    cpu_time: bool = False
+    profile_interval: float = 0
+    profile_only: bool = False
+    memory: bool = False
+    hook_stats: bool = False
+    cpu_affinity: Optional[tuple[int, ...]] = None
+    nice: Optional[int] = None
+    rlimit_as: Optional[int] = None
+    rlimit_cpu: Optional[int] = None
 
 
 @dataclass
@@ -29,6 +29,20 @@ class InitOptions:
     run_no_start_from: int = 1
     trace_threads: bool = False
     trace_modules: bool = False
+    capture_fd: bool = False
+    line_hits: bool = False
+    function_stats: bool = False
+    cpu_time: bool = False
+    profile_interval: float = 0
+    profile_only: bool = False
+    memory: bool = False
+    hook_stats: bool = False
+    cpu_affinity: Optional[tuple[int, ...]] = None
+    nice: Optional[int] = None
+    rlimit_as: Optional[int] = None
+    rlimit_cpu: Optional[int] = None
+    span_file: Optional[str] = None
+    span_sample: int = 1
 
 
 @dataclasses.dataclass
@@ -37,6 +51,20 @@ class ResetOptions:
     run_no_start_from: Optional[int] = None
     trace_threads: Optional[bool] = None
     trace_modules: Optional[bool] = None
+    capture_fd: Optional[bool] = None
+    line_hits: Optional[bool] = None
+    function_stats: Optional[bool] = None
+    cpu_time: Optional[bool] = None
+    profile_interval: Optional[float] = None
+    profile_only: Optional[bool] = None
+    memory: Optional[bool] = None
+    hook_stats: Optional[bool] = None
+    cpu_affinity: Optional[tuple[int, ...]] = None
+    nice: Optional[int] = None
+    rlimit_as: Optional[int] = None
+    rlimit_cpu: Optional[int] = None
+    span_file: Optional[str] = None
+    span_sample: Optional[int] = None
 
 
 @dataclasses.dataclass(frozen=True)
@@ -56,6 +84,197 @@ class RunInfo:
     ended_at: Optional[datetime.datetime] = None
 
 
+@dataclasses.dataclass(frozen=True)
+class RunResources:
+    '''Resource usage of the process that runs the statement.
+
+    Published with the key `run_resources` periodically while the run is
+    active and at the end of the run with `final` true.
+    '''
+
+    run_no: RunNo
+    sampled_at: datetime.datetime
+    user_time: float  # seconds
+    system_time: float  # seconds
+    max_rss: int  # bytes
+    voluntary_context_switches: int
+    involuntary_context_switches: int
+    final: bool = False
+
+
+@dataclasses.dataclass(frozen=True)
+class Metrics:
+    '''The health of the event pipeline of a run, published with the key `metrics`.
+
+    Sampled periodically during the run and at the end with `final` true.
+    The events are those from the spawned process to the main process.
+    `events_emitted` and `queue_depth` are None where the size of the queue
+    is unavailable, e.g., on macOS. `oldest_event_lag` is the age of the
+    event last taken from the queue while events are waiting, zero
+    otherwise. `subscriber_backlog` maps the pubsub keys, as strings, e.g.,
+    "prompt_info.1" for `('prompt_info', 1)`, to the largest numbers of the
+    values waiting for a subscriber, only those with waiting values.
+    '''
+
+    run_no: RunNo
+    sampled_at: datetime.datetime
+    events_emitted: Optional[int]
+    events_processed: int
+    queue_depth: Optional[int]
+    oldest_event_lag: float  # seconds
+    stdout_bytes_per_sec: float  # since the previous sample
+    subscriber_backlog: dict[str, int]
+    final: bool = False
+
+
+@dataclasses.dataclass(frozen=True)
+class HookStat:
+    '''The calls to the implementations of a hook in a plugin.'''
+
+    hook_name: str
+    plugin: str
+    calls: int
+    time: float  # seconds
+
+
+@dataclasses.dataclass(frozen=True)
+class HookStats:
+    '''The hook stats of a run, published with the key `hook_stats` at the end.
+
+    The stats of the plugins in the main process are of the hooks called
+    during the run. Those of the spawned process are of the whole process.
+    '''
+
+    run_no: RunNo
+    main: tuple[HookStat, ...]
+    spawned: tuple[HookStat, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class LatencyHistogram:
+    '''The distribution of latencies in seconds, all zero if `count` is zero.
+
+    `buckets[i]` is the number of the latencies greater than `bounds[i - 1]`
+    and up to `bounds[i]`. The last bucket is of those greater than the last
+    bound. The quantiles are interpolated in the buckets.
+    '''
+
+    count: int
+    mean: float
+    min: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+    bounds: tuple[float, ...]
+    buckets: tuple[int, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class PromptLatency:
+    '''The latencies of the prompts in a run, published with the key `prompt_latency`.
+
+    Published periodically during the run and at the end. Each is measured
+    at the following stages:
+
+    - `prompt`: from the start of a prompt in the spawned process until the
+      main process receives it
+    - `command`: from sending a Pdb command until the prompt ends in the
+      spawned process
+    - `round_trip`: from sending a Pdb command until the main process
+      receives the next prompt of the trace
+    '''
+
+    run_no: RunNo
+    prompt: LatencyHistogram
+    command: LatencyHistogram
+    round_trip: LatencyHistogram
+
+
+@dataclasses.dataclass(frozen=True)
+class MemoryStat:
+    '''The memory allocated at a line, from `tracemalloc`.'''
+
+    file_name: str
+    line_no: int
+    size: int  # bytes
+    size_diff: int  # bytes since the previous snapshot
+    count: int  # the number of memory blocks
+    count_diff: int
+
+
+@dataclasses.dataclass(frozen=True)
+class MemorySnapshot:
+    '''The memory allocated in the run, published with the key `memory`.
+
+    Taken at each prompt and at the end of the run with `final` true. The
+    `top` are the lines whose allocations have grown the most since the
+    previous snapshot. `trace_no` and `prompt_no` are of the prompt.
+    '''
+
+    run_no: RunNo
+    taken_at: datetime.datetime
+    current: int  # bytes traced by tracemalloc
+    peak: int  # bytes
+    top: tuple[MemoryStat, ...]
+    trace_no: Optional[TraceNo] = None
+    prompt_no: Optional[PromptNo] = None
+    final: bool = False
+
+
+@dataclasses.dataclass(frozen=True)
+class LineHits:
+    '''The numbers of executions of lines, published with the key `line_hits`.
+
+    The `hits` maps file names to line numbers to the total numbers of the
+    executions in the run. Only the lines executed since the previous
+    publication are included.
+    '''
+
+    run_no: RunNo
+    hits: dict[str, dict[int, int]]
+
+
+@dataclasses.dataclass(frozen=True)
+class ProfileSamples:
+    '''The numbers of samples of stacks, published with the key `profile_samples`.
+
+    The `samples` maps folded stacks to the numbers of the samples taken
+    since the previous publication. A folded stack is the frames from the
+    outermost separated by ";", each as "name (file:line)", the format of
+    the input to flame graph tools.
+    '''
+
+    run_no: RunNo
+    samples: dict[str, int]
+
+
+@dataclasses.dataclass(frozen=True)
+class FunctionStats:
+    '''The calls to a function and the time spent in it, as in cProfile.
+
+    The time excludes the time in the trace calls, e.g., at prompts. The
+    inclusive time includes the time in the functions called from it; the
+    exclusive time doesn't.
+    '''
+
+    file_name: str
+    line_no: int  # The first line of the function
+    name: str
+    calls: int
+    inclusive_time: float  # seconds
+    exclusive_time: float  # seconds
+
+
+@dataclasses.dataclass(frozen=True)
+class FunctionStatsTable:
+    '''The function stats of a trace, published with the key `function_stats`.'''
+
+    run_no: RunNo
+    trace_no: TraceNo
+    stats: tuple[FunctionStats, ...]
+
+
 @dataclasses.dataclass(frozen=True)
 class TraceInfo:
     run_no: RunNo
@@ -65,6 +284,17 @@ class TraceInfo:
     task_no: Optional[TaskNo] = None
     started_at: Optional[datetime.datetime] = None
     ended_at: Optional[datetime.datetime] = None
+    cpu_time: Optional[float] = None  # seconds, only with the option `cpu_time`
+    wall_time: Optional[float] = None  # seconds
+
+
+@dataclasses.dataclass(frozen=True)
+class TraceNosDelta:
+    '''Changes in the trace numbers, published with the key `trace_nos_delta`.'''
+
+    run_no: RunNo
+    added: tuple[TraceNo, ...] = ()
+    removed: tuple[TraceNo, ...] = ()
 
 
 @dataclasses.dataclass(frozen=True)
@@ -98,6 +328,7 @@ class PromptNotice:
 @dataclasses.dataclass(frozen=True)
 class StdoutInfo:
     run_no: RunNo
-    trace_no: TraceNo
+    trace_no: Optional[TraceNo]  # None if not attributed to any trace
     text: Optional[str] = None
     written_at: Optional[datetime.datetime] = None
+    stream: str = 'stdout'  # 'stdout' or 'stderr'
@@ -7,20 +7,27 @@ __all__ = [
     'ThreadDoneCallback',
     'TaskDoneCallback',
     'ThreadTaskDoneCallback',
+    'Histogram',
+    'HookTimer',
     'MultiprocessingLogging',
     'match_any',
+    'peek_fd',
     'peek_stderr',
     'peek_stdout',
     'peek_textio',
+    'CoalescingFlusher',
+    'run_periodically',
     'profile_func',
     'PubSub',
     'PubSubItem',
     'WaitUntilQueueEmptyTimeout',
     'wait_until_queue_empty',
+    'set_resources',
     'ExitedProcess',
     'RunningProcess',
     'run_in_process',
     'ExcThread',
+    'TextLog',
     'ThreadTaskIdComposer',
     'Timer',
     'UntilNotNoneTimeout',
@@ -37,13 +44,18 @@ from .aio import (
     to_aiter,
 )
 from .done_callback import TaskDoneCallback, ThreadDoneCallback, ThreadTaskDoneCallback
+from .histogram import Histogram
+from .hook_timer import HookTimer
 from .multiprocessing_logging import MultiprocessingLogging
 from .path import match_any
-from .peek import peek_stderr, peek_stdout, peek_textio
+from .peek import peek_fd, peek_stderr, peek_stdout, peek_textio
+from .periodic import CoalescingFlusher, run_periodically
 from .profile import profile_func
 from .pubsub import PubSub, PubSubItem
 from .queue import WaitUntilQueueEmptyTimeout, wait_until_queue_empty
+from .resources import set_resources
 from .run import ExitedProcess, RunningProcess, run_in_process
+from .text_log import TextLog
 from .thread_exception import ExcThread
 from .thread_task_id import ThreadTaskIdComposer
 from .timer import Timer
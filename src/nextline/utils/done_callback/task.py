@@ -1,5 +1,6 @@
-import time
-from asyncio import Task, current_task, to_thread
+import asyncio
+import threading
+from asyncio import AbstractEventLoop, Future, Task, current_task
 from typing import Any, Callable, Optional
 
 
@@ -15,12 +16,23 @@ class TaskDoneCallback:
 
         The `done` is optional. This class can be still useful to wait for all
         registered tasks to end.
+
+    The methods `close()` and `aclose()` wait without polling until the last
+    registered task ends. The tasks can be in different event loops.
     """
 
     def __init__(self, done: Optional[Callable[[Task], Any]] = None):
         self._done = done
         self._active = set[Task]()
         self._exceptions = list[BaseException]()
+        self._lock = threading.Lock()
+
+        # Set while no registered task is active
+        self._idle = threading.Event()
+        self._idle.set()
+
+        # Futures awaited in aclose()
+        self._waiters = list[tuple[AbstractEventLoop, Future[None]]]()
 
     def register(self, task: Optional[Task] = None) -> Task:
         """Add the current task by default, or the given task
@@ -32,15 +44,19 @@ class TaskDoneCallback:
             task = current_task()
             if task is None:
                 raise RuntimeError("The current task not found")
-        if task not in self._active:
-            task.add_done_callback(self._callback)
+        with self._lock:
+            if task in self._active:
+                return task
             self._active.add(task)
+            self._idle.clear()
+        task.add_done_callback(self._callback)
         return task
 
     def close(self, interval: float = 0.001) -> None:
         """To be optionally called after all tasks are registered
 
-        This method returns after all registered tasks end.
+        This method returns after all registered tasks end. The `interval` is
+        not used; it is kept for backward compatibility.
 
         The method cannot be called from a registered task.
 
@@ -57,18 +73,27 @@ class TaskDoneCallback:
                 raise RuntimeError(
                     "The close() cannot be called from a registered task"
                 )
-        self._close(interval)
+        del interval
+        self._idle.wait()
         self.reraise()
 
     async def aclose(self, interval: float = 0.001) -> None:
         """Awaitable version of close()"""
+        del interval
         task = current_task()
         if task is not None:
             if task in self._active:
                 raise RuntimeError(
                     "The aclose() cannot be called from a registered task"
                 )
-        await to_thread(self._close, interval)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self._active:
+                self._waiters.append((loop, future))
+            else:
+                future.set_result(None)
+        await future
         self.reraise()
 
     def reraise(self) -> None:
@@ -76,10 +101,6 @@ class TaskDoneCallback:
         if self._exceptions:
             raise self._exceptions[0]
 
-    def _close(self, interval: float) -> None:
-        while self._active:
-            time.sleep(interval)
-
     def _callback(self, task: Task, *_: Any, **__: Any) -> None:
         """This method is given to asyncio.Task.add_done_callback()
 
@@ -95,11 +116,18 @@ class TaskDoneCallback:
         """
 
         try:
-            self._active.remove(task)
             if self._done:
                 self._done(task)
         except BaseException as e:
             self._exceptions.append(e)
+        with self._lock:
+            self._active.discard(task)
+            if self._active:
+                return
+            waiters, self._waiters = self._waiters, []
+            self._idle.set()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_set_result, future)
 
     def __enter__(self) -> "TaskDoneCallback":
         return self
@@ -114,3 +142,8 @@ class TaskDoneCallback:
     async def __aexit__(self, exc_type, exc_value, traceback):  # type: ignore
         del exc_type, exc_value, traceback
         await self.aclose()
+
+
+def _set_result(future: Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -1,13 +1,29 @@
-import time
+import threading
+import weakref
+from functools import partial
+from queue import SimpleQueue
 from threading import Thread, current_thread
 from typing import Any, Callable, Optional, Set
 
 from nextline.utils.thread_exception import ExcThread
 
 
+class _Sentinel:
+    '''Stored in the thread-local storage of a registered thread.
+
+    The thread-local storage is cleared when the thread ends.
+    '''
+
+
 class ThreadDoneCallback:
     """Call a function when each registered thread ends
 
+    The end of a thread is detected without polling. When the current thread
+    is registered, an object is stored in its thread-local storage, which is
+    cleared when the thread ends. A weak reference to the object then puts
+    the thread in a queue, from which a monitor thread calls `done`. A thread
+    registered by another thread is waited for by a thread that joins it.
+
     Parameters
     ----------
     done : callable, optional
@@ -18,8 +34,8 @@ class ThreadDoneCallback:
         The `done` is optional. This class can be still useful to wait for all
         registered tasks to end.
 
-    interval : float, default 0.001 [sec]
-        The period of determining if any registered thread ends.
+    interval : float, optional
+        Not used. Kept for backward compatibility.
     """
 
     def __init__(
@@ -27,11 +43,18 @@ class ThreadDoneCallback:
         done: Optional[Callable[[Thread], Any]] = None,
         interval: float = 0.001,
     ):
+        del interval
         self._done = done
-        self._interval = interval
 
         self._active: Set[Thread] = set()
         self._closed = False
+        self._lock = threading.Lock()
+
+        # Ended threads, or None to stop the monitor
+        self._queue = SimpleQueue[Optional[Thread]]()
+
+        self._local = threading.local()
+        self._refs = dict[Thread, weakref.ref]()
 
         self._t = ExcThread(target=self._monitor, daemon=True)
         self._t.start()
@@ -44,7 +67,22 @@ class ThreadDoneCallback:
         """
         if thread is None:
             thread = current_thread()
-        self._active.add(thread)
+        with self._lock:
+            if thread in self._active:
+                return thread
+            self._active.add(thread)
+        if thread is current_thread():
+            self._watch_current()
+        elif thread.ident is None:  # not started
+            run = thread.run
+
+            def watched_run() -> None:
+                self._watch_current()
+                run()
+
+            thread.run = watched_run  # type: ignore
+        else:
+            ExcThread(target=self._join, args=(thread,), daemon=True).start()
         return thread
 
     def close(self) -> None:
@@ -60,25 +98,42 @@ class ThreadDoneCallback:
         """
         if current_thread() in self._active:
             raise RuntimeError("The close() cannot be called from a registered thread")
-        self._closed = True
+        with self._lock:
+            self._closed = True
+            if not self._active:
+                self._queue.put(None)
         self._t.join()
 
+    def _watch_current(self) -> None:
+        thread = current_thread()
+        sentinel = _Sentinel()
+        self._local.sentinel = sentinel
+        # NOTE: The callback is called in the ending thread, possibly with a
+        # trace function. It is composed of C functions so that no Python
+        # code is executed, i.e., traced, there. The weak reference is given
+        # to `put()` as the arg `block`.
+        self._refs[thread] = weakref.ref(sentinel, partial(self._queue.put, thread))
+
+    def _join(self, thread: Thread) -> None:
+        thread.join()
+        self._queue.put(thread)
+
     def _monitor(self) -> None:
         exc = []
-        while True:
-            if done := {t for t in self._active if not t.is_alive()}:
-                if self._done:
-                    for d in done:
-                        try:
-                            self._done(d)
-                        except BaseException as e:
-                            exc.append(e)
-                self._active = self._active - done
-            time.sleep(self._interval)
-            if self._active:
-                continue
-            if self._closed:
-                break
+        while (thread := self._queue.get()) is not None:
+            # The thread-local storage is cleared shortly before the thread
+            # becomes not alive.
+            thread.join()
+            self._refs.pop(thread, None)
+            if self._done:
+                try:
+                    self._done(thread)
+                except BaseException as e:
+                    exc.append(e)
+            with self._lock:
+                self._active.discard(thread)
+                if self._closed and not self._active:
+                    break
         if exc:
             raise exc[0]
 
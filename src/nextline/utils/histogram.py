@@ -0,0 +1,87 @@
+import bisect
+import math
+from collections.abc import Sequence
+
+# The upper bounds in seconds in the 1-2-5 series from 10 microseconds to 10 seconds
+LATENCY_BOUNDS = tuple(m * 10.0**e for e in range(-5, 1) for m in (1, 2, 5)) + (10.0,)
+
+
+class Histogram:
+    '''Count values in buckets.
+
+    The bucket `i` counts the values greater than `bounds[i - 1]` and up to
+    `bounds[i]`. The last bucket counts the values greater than the last
+    bound. The count, sum, minimum, and maximum are kept exactly.
+
+    Parameters
+    ----------
+    bounds
+        The upper bounds of the buckets in ascending order. The default is
+        `LATENCY_BOUNDS`, for latencies in seconds.
+
+    Examples
+    --------
+    >>> histogram = Histogram(bounds=(0.001, 0.01, 0.1))
+    >>> for value in (0.0005, 0.002, 0.003, 0.05, 1.0):
+    ...     histogram.add(value)
+
+    >>> histogram.count
+    5
+
+    >>> histogram.buckets
+    (1, 2, 1, 1)
+
+    The quantiles are interpolated in the buckets:
+
+    >>> round(histogram.quantile(0.4), 6)
+    0.0055
+
+    >>> histogram.quantile(1)
+    1.0
+
+    '''
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BOUNDS) -> None:
+        self.bounds = tuple(bounds)
+        self.clear()
+
+    def clear(self) -> None:
+        self._buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self._buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def buckets(self) -> tuple[int, ...]:
+        return tuple(self._buckets)
+
+    def mean(self) -> float:
+        '''The mean, or NaN if empty.'''
+        return self.sum / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        '''An estimate of the quantile `q` between 0 and 1, or NaN if empty.
+
+        Interpolated linearly in the bucket of the quantile, whose range is
+        narrowed to the minimum and maximum.
+        '''
+        if not self.count:
+            return math.nan
+        rank = max(1, math.ceil(q * self.count))
+        cumulative = 0
+        lower = self.min
+        for bound, n in zip((*self.bounds, math.inf), self._buckets):
+            if cumulative + n >= rank:
+                upper = min(bound, self.max)
+                return upper - (upper - lower) * (cumulative + n - rank) / n
+            cumulative += n
+            lower = max(bound, self.min)
+        return self.max  # pragma: no cover
@@ -0,0 +1,202 @@
+import inspect
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable, Generator, Mapping, Sequence
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Optional
+
+from pluggy import HookImpl, PluginManager
+
+
+class HookTimer:
+    '''Count the calls to the hook implementations and measure their time.
+
+    The stats are kept by the hook name and the plugin, which is the class
+    name of the plugin or the module name.
+
+    The time of a call includes the time in the hooks called from it. For a
+    coroutine, the time from the call until it returns is measured, which
+    includes the time in which it is suspended. For a context manager, the
+    time of the call and the time in the generator until each `yield` are
+    measured, i.e., the time in the `with` block is excluded. The returned
+    context manager is replaced with one that delegates to its generator.
+
+    The hook implementations are wrapped when they are called for the first
+    time after `start()`, including those of the plugins registered later.
+    They are restored at `stop()`.
+
+    Example:
+
+    >>> import apluggy
+    >>> hookspec = apluggy.HookspecMarker('example')
+    >>> hookimpl = apluggy.HookimplMarker('example')
+
+    >>> class Spec:
+    ...     @hookspec
+    ...     def func(self, arg: int) -> int:
+    ...         pass
+
+    >>> class Plugin:
+    ...     @hookimpl
+    ...     def func(self, arg: int) -> int:
+    ...         return arg + 1
+
+    >>> pm = apluggy.PluginManager('example')
+    >>> pm.add_hookspecs(Spec)
+    >>> _ = pm.register(Plugin)
+
+    >>> timer = HookTimer(pm)
+    >>> timer.start()
+    >>> pm.hook.func(arg=1)
+    [2]
+    >>> pm.hook.func(arg=2)
+    [3]
+    >>> timer.stop()
+
+    >>> [(k, calls) for k, (calls, _) in timer.stats().items()]
+    [(('func', 'Plugin'), 2)]
+
+    '''
+
+    def __init__(self, pm: PluginManager) -> None:
+        self._pm = pm
+        self._stats = dict[tuple[str, str], list]()
+        self._lock = threading.Lock()
+        self._wrapped = set[Callable]()
+        self._originals = list[tuple[HookImpl, Callable]]()
+        self._undo: Optional[Callable[[], None]] = None
+
+    def start(self) -> None:
+        if self._undo is None:
+            self._undo = self._pm.add_hookcall_monitoring(self._before, _after)
+
+    def stop(self) -> None:
+        '''Stop wrapping and restore the original hook implementations.
+
+        The calls in progress, e.g., of context managers, are still measured.
+        '''
+        if self._undo is not None:
+            self._undo()
+            self._undo = None
+        for impl, function in self._originals:
+            impl.function = function  # type: ignore[misc]
+        self._originals.clear()
+        self._wrapped.clear()
+
+    def stats(self) -> dict[tuple[str, str], tuple[int, float]]:
+        '''The number of calls and the time in seconds by hook name and plugin.'''
+        with self._lock:
+            return {k: (calls, t) for k, (calls, t) in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _before(
+        self, hook_name: str, hook_impls: Sequence[HookImpl], kwargs: Mapping
+    ) -> None:
+        del kwargs
+        for impl in hook_impls:
+            if impl.function in self._wrapped or impl.wrapper or impl.hookwrapper:
+                continue
+            function = self._wrap(impl.function, (hook_name, _plugin_name(impl)))
+            self._wrapped.add(function)
+            self._originals.append((impl, impl.function))
+            impl.function = function  # type: ignore[misc]
+
+    def _wrap(self, func: Callable, key: tuple[str, str]) -> Callable:
+        def add(calls: int, t: float) -> None:
+            with self._lock:
+                if (entry := self._stats.get(key)) is None:
+                    entry = self._stats[key] = [0, 0.0]
+                entry[0] += calls
+                entry[1] += t
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                ret = func(*args, **kwargs)
+            finally:
+                add(1, time.perf_counter() - start)
+            # A new context manager with the `gen` attribute, which apluggy
+            # uses, delegates to the generator of the returned one.
+            gen = getattr(ret, 'gen', None)
+            if inspect.isgenerator(gen):
+                timed_gen = _timed_gen(gen, add)
+                ret = contextmanager(lambda: timed_gen)()
+            elif inspect.isasyncgen(gen):
+                timed_agen = _timed_agen(gen, add)
+                ret = asynccontextmanager(lambda: timed_agen)()
+            elif inspect.iscoroutine(ret):
+                ret = _timed_coro(ret, add)
+            return ret
+
+        return timed
+
+
+def _after(*_: Any) -> None:
+    pass
+
+
+def _plugin_name(impl: HookImpl) -> str:
+    if inspect.ismodule(impl.plugin):
+        return impl.plugin.__name__
+    return type(impl.plugin).__name__
+
+
+async def _timed_coro(coro: Any, add: Callable[[int, float], None]) -> Any:
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        add(0, time.perf_counter() - start)
+
+
+def _timed_gen(
+    gen: Generator[Any, Any, Any], add: Callable[[int, float], None]
+) -> Generator:
+    '''Delegate to the generator of a context manager and measure the time in it.'''
+    step: Callable[..., Any] = gen.send
+    arg: Any = None
+    while True:
+        start = time.perf_counter()
+        try:
+            y = step(arg)
+        except StopIteration as e:
+            return e.value
+        finally:
+            add(0, time.perf_counter() - start)
+        try:
+            sent = yield y
+        except GeneratorExit:
+            gen.close()
+            raise
+        except BaseException as e:
+            step, arg = gen.throw, e
+        else:
+            step, arg = gen.send, sent
+
+
+async def _timed_agen(
+    agen: AsyncGenerator[Any, Any], add: Callable[[int, float], None]
+) -> AsyncGenerator:
+    '''The async version of `_timed_gen()`.'''
+    step: Callable[..., Any] = agen.asend
+    arg: Any = None
+    while True:
+        start = time.perf_counter()
+        try:
+            y = await step(arg)
+        except StopAsyncIteration:
+            return
+        finally:
+            add(0, time.perf_counter() - start)
+        try:
+            sent = yield y
+        except GeneratorExit:
+            await agen.aclose()
+            raise
+        except BaseException as e:
+            step, arg = agen.athrow, e
+        else:
+            step, arg = agen.asend, sent
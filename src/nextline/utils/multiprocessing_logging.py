@@ -2,14 +2,18 @@ import asyncio
 import contextlib
 import logging
 import multiprocessing as mp
+import multiprocessing.util
+import threading
 from collections.abc import AsyncIterator, Callable
 from functools import partial
-from logging import DEBUG, LogRecord, getLogger
+from logging import NOTSET, LogRecord, getLogger
 from logging.handlers import QueueHandler
 from multiprocessing.context import BaseContext
 from queue import Queue
 from typing import Optional, cast
 
+from .periodic import CoalescingFlusher
+
 __all__ = ['MultiprocessingLogging']
 
 
@@ -22,9 +26,15 @@ def example_func() -> None:
 @contextlib.asynccontextmanager
 async def MultiprocessingLogging(
     mp_context: Optional[BaseContext] = None,
+    interval: float = 0.05,
 ) -> AsyncIterator[Callable[[], None]]:
     '''Collect logging from other processes in the main process.
 
+    The levels of the loggers in the current process at the entry are set in
+    the other processes so that records to be discarded are not created.
+    The records are sent in batches at most every `interval` seconds and at
+    the exit of the other processes.
+
     Example:
 
     A function to be executed in another process is example_func(), which is defined
@@ -79,15 +89,22 @@ async def MultiprocessingLogging(
     '''
 
     mp_context = mp_context or mp.get_context()
-    queue = cast(Queue[LogRecord | None], mp_context.Queue())
-    initializer = partial(_initializer, queue)
+    queue = cast(Queue[list[LogRecord] | None], mp_context.Queue())
+    initializer = partial(
+        _initializer,
+        queue,
+        levels=_levels(),
+        disable=logging.root.manager.disable,
+        interval=interval,
+    )
 
     async def _listen() -> None:
         '''Receive loggings from other processes and handle them in the current process.'''
-        while (record := await asyncio.to_thread(queue.get)) is not None:
-            logger = getLogger(record.name)
-            if logger.getEffectiveLevel() <= record.levelno:
-                logger.handle(record)
+        while (records := await asyncio.to_thread(queue.get)) is not None:
+            for record in records:
+                logger = getLogger(record.name)
+                if logger.getEffectiveLevel() <= record.levelno:
+                    logger.handle(record)
 
     task = asyncio.create_task(_listen())
 
@@ -98,9 +115,58 @@ async def MultiprocessingLogging(
         await task
 
 
-def _initializer(queue: Queue[LogRecord | None]) -> None:
+def _levels() -> dict[str, int]:
+    '''The levels of the loggers that are set. The key of the root logger is "".'''
+    ret = {'': logging.root.level}
+    for name, logger in logging.root.manager.loggerDict.items():
+        if isinstance(logger, logging.Logger) and logger.level != NOTSET:
+            ret[name] = logger.level
+    return ret
+
+
+def _initializer(
+    queue: Queue[list[LogRecord] | None],
+    levels: dict[str, int],
+    disable: int,
+    interval: float,
+) -> None:
     '''An initializer of ProcessPoolExecutor.'''
-    handler = QueueHandler(queue)
-    logger = getLogger()
-    logger.setLevel(DEBUG)
-    logger.addHandler(handler)
+    handler = _BatchQueueHandler(queue, interval=interval)
+    for name, level in levels.items():
+        getLogger(name).setLevel(level)
+    logging.disable(disable)
+    getLogger().addHandler(handler)
+
+    # Send the rest at the exit. The exit priority is higher than those of the
+    # finalizers of the queue, which close it.
+    multiprocessing.util.Finalize(None, handler.close, exitpriority=100)
+
+
+class _BatchQueueHandler(QueueHandler):
+    '''Put lists of the records in the queue from a thread.
+
+    The thread sleeps while nothing is logged.
+    '''
+
+    def __init__(self, queue: Queue[list[LogRecord] | None], interval: float):
+        super().__init__(queue)  # type: ignore
+        self._records = list[LogRecord]()
+        self._records_lock = threading.Lock()
+        self._flusher = CoalescingFlusher(self.flush, interval=interval)
+        self._flusher.start()
+
+    def enqueue(self, record: LogRecord) -> None:
+        with self._records_lock:
+            self._records.append(record)
+        self._flusher.notify()
+
+    def flush(self) -> None:
+        with self._records_lock:
+            records, self._records = self._records, []
+        if records:
+            self.queue.put_nowait(records)  # type: ignore
+
+    def close(self) -> None:
+        self._flusher.close()
+        self.flush()
+        super().close()
@@ -1,8 +1,14 @@
+import codecs
+import ctypes
+import os
+import selectors
 import sys
 from collections.abc import Iterator
 from contextlib import contextmanager
 from typing import Any, Callable, ContextManager, TextIO
 
+from .thread_exception import ExcThread
+
 
 def peek_stdout(callback: Callable[[str], Any]) -> ContextManager[Callable[[str], int]]:
     '''A context manager that executes the callback with text written to stdout.
@@ -58,3 +64,104 @@ def peek_textio(
         yield write
     finally:
         textio.write = org_write  # type: ignore
+
+
+@contextmanager
+def peek_fd(
+    fd: int,
+    callback: Callable[[str], Any],
+    chunk_size: int = 65536,
+    timeout: float | None = 1,
+) -> Iterator[int]:
+    '''A context manager that executes the callback with text written to the fd.
+
+    The file descriptor is redirected to a pipe with `os.dup2()`. A thread reads
+    the pipe in chunks of up to `chunk_size` bytes, writes them to the original
+    destination, and calls the callback with the decoded text. Unlike
+    `peek_textio()`, it receives text written by C extensions, `os.write()`,
+    and child processes.
+
+    Yields a duplicate of the original file descriptor, which can be used to
+    write without being peeked.
+
+    At the exit, waits up to `timeout` seconds for the thread to read the rest,
+    which can take long if child processes still hold the pipe. After the
+    timeout, the thread is stopped, the pipe is closed, and the callback is no
+    longer called. The child processes then fail to write to the pipe.
+
+    Example:
+
+    Collect arguments to the callback in this list:
+    >>> written = []
+
+    Peek at a pipe in this example:
+    >>> read_fd, write_fd = os.pipe()
+
+    >>> with peek_fd(write_fd, written.append):
+    ...     _ = os.write(write_fd, b'hello\\n')
+
+    The callback was called with the text:
+    >>> ''.join(written)
+    'hello\\n'
+
+    The text was also written to the original destination:
+    >>> os.read(read_fd, 100)
+    b'hello\\n'
+
+    >>> os.close(read_fd)
+    >>> os.close(write_fd)
+
+    '''
+    org_fd = os.dup(fd)
+    read_fd, write_fd = os.pipe()
+    os.dup2(write_fd, fd)
+    os.close(write_fd)
+    stop_read_fd, stop_write_fd = os.pipe()
+
+    def _read() -> None:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        with selectors.DefaultSelector() as selector:
+            selector.register(read_fd, selectors.EVENT_READ)
+            selector.register(stop_read_fd, selectors.EVENT_READ)
+            while True:
+                ready = {key.fd for key, _ in selector.select()}
+                if stop_read_fd in ready:
+                    return
+                if not (data := os.read(read_fd, chunk_size)):
+                    break
+                _write_all(org_fd, data)
+                if text := decoder.decode(data):
+                    callback(text)
+        if text := decoder.decode(b'', final=True):
+            callback(text)
+
+    thread = ExcThread(target=_read, daemon=True)
+    thread.start()
+
+    try:
+        yield org_fd
+    finally:
+        _flush_c_stdio()
+        os.dup2(org_fd, fd)  # The pipe will be closed unless child processes hold it.
+        try:
+            thread.join(timeout)
+        finally:
+            if thread.is_alive():
+                os.write(stop_write_fd, b'\0')
+                thread.join()
+            for fd_ in (read_fd, org_fd, stop_read_fd, stop_write_fd):
+                os.close(fd_)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _flush_c_stdio() -> None:
+    '''Flush the buffers of the C standard I/O, e.g., of `printf()`.'''
+    try:
+        ctypes.CDLL(None).fflush(None)
+    except (OSError, AttributeError, TypeError):  # pragma: no cover
+        pass
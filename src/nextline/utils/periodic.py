@@ -0,0 +1,97 @@
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from .thread_exception import ExcThread
+
+
+@contextmanager
+def run_periodically(func: Callable[[], Any], interval: float) -> Iterator[None]:
+    '''Call the function every `interval` seconds in a thread while in the context.
+
+    The thread is stopped and joined at the exit. The function is not called
+    at the exit; call it after the context for a final call.
+
+    Example:
+
+    >>> calls = []
+    >>> with run_periodically(lambda: calls.append(None), interval=0.001):
+    ...     time.sleep(0.05)
+    >>> len(calls) > 0
+    True
+
+    '''
+    stop = threading.Event()
+
+    def _run() -> None:
+        while not stop.wait(interval):
+            func()
+
+    thread = ExcThread(target=_run, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+class CoalescingFlusher:
+    '''Call the function in a thread `interval` seconds after `notify()`.
+
+    The notifications within the interval are coalesced into one call. The
+    thread sleeps while it is not notified. The function is not called at
+    `close()`; call it after `close()` for a final call.
+
+    Example:
+
+    >>> calls = []
+    >>> with CoalescingFlusher(lambda: calls.append(None), interval=0.01) as flusher:
+    ...     for _ in range(10):
+    ...         flusher.notify()
+    ...     time.sleep(0.05)
+    >>> len(calls)
+    1
+
+    '''
+
+    def __init__(self, func: Callable[[], Any], interval: float) -> None:
+        self._func = func
+        self._interval = interval
+        self._notified = threading.Event()
+        self._closed = False
+        self._thread: Optional[ExcThread] = None
+
+    def notify(self) -> None:
+        if not self._notified.is_set():
+            self._notified.set()
+
+    def start(self) -> None:
+        self._thread = ExcThread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._notified.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._notified.wait()
+            if self._closed:
+                break
+            time.sleep(self._interval)  # to coalesce the notifications
+            self._notified.clear()
+            self._func()
+
+    def __enter__(self) -> 'CoalescingFlusher':
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any, **__: Any) -> None:
+        self.close()
@@ -1,7 +1,10 @@
 __all__ = [
+    "Codec",
     "PubSubItem",
     "PubSub",
+    "json_codec",
 ]
 
 from .broker import PubSub
-from .item import PubSubItem
+from .codec import json_codec
+from .item import Codec, PubSubItem
@@ -1,20 +1,78 @@
+import asyncio
+import enum
+import itertools
 from collections import defaultdict
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Hashable, Iterable
 from typing import Generic, TypeVar
 
-from .item import PubSubItem
+from .item import Codec, PubSubItem
 
 _KT = TypeVar("_KT")
 _VT = TypeVar("_VT")
 
+Prefix = tuple[Hashable, ...]
+
+
+class _End(enum.Enum):
+    '''Sentinel to indicate no more value will be published for a key.'''
+
+    END = object()
+
+
+_END = _End.END
+
 
 class PubSub(Generic[_KT, _VT]):
-    """Asynchronous message broker of the publish-subscribe pattern"""
+    """Asynchronous message broker of the publish-subscribe pattern
+
+    Keys can be any hashable objects. If a key is a tuple, e.g.,
+    `('prompt_info', 1)`, it is also matched by prefix subscriptions, e.g.,
+    `subscribe_prefix(('prompt_info',))`, which receive values for all keys
+    that start with the prefix.
+
+    Every published value is given a sequence number, which increases across
+    all keys. The method `snapshot()` returns the latest values with their
+    sequence numbers, which can be given to `subscribe()` as `after` to
+    continue from the snapshot without duplicates.
+
+    Codecs can be registered for keys with `register_codec()` and for prefixes
+    with `register_prefix_codec()`. Subscribers can then receive the encoded
+    values with `subscribe_encoded()`. Each value is encoded at most once
+    regardless of the number of the subscribers.
+
+    Parameters
+    ----------
+    codec
+        The codec for the keys for which no codec is registered.
+
+    """
+
+    def __init__(self, codec: Codec | None = None) -> None:
+        self._queue = dict[_KT, PubSubItem[_VT]]()
+        self._counter = itertools.count()
+
+        # Tuple keys indexed by all their prefixes, e.g., the key `('a', 1)` is
+        # indexed by `()`, `('a',)`, and `('a', 1)`. Dicts are used as ordered
+        # sets so that the latest values are yielded in the order of the keys.
+        self._index = defaultdict[Prefix, dict[_KT, None]](dict)
 
-    def __init__(self) -> None:
-        self._queue = defaultdict[_KT, PubSubItem[_VT]](PubSubItem)
+        self._codecs = dict[_KT, Codec]()
+        self._prefix_codecs = dict[Prefix, Codec]()
+        self._default_codec = codec
 
-    def subscribe(self, key: _KT, last: bool = True) -> AsyncIterator[_VT]:
+        # Queues of the multi-key subscriptions by the keys
+        self._key_queues = defaultdict[
+            _KT, set[asyncio.Queue[tuple[_KT, _VT | _End] | None]]
+        ](set)
+
+        # Queues of the prefix subscriptions by the prefixes
+        self._prefix_queues = defaultdict[
+            Prefix, set[asyncio.Queue[tuple[_KT, _VT] | None]]
+        ](set)
+
+    def subscribe(
+        self, key: _KT, last: bool = True, after: int | None = None
+    ) -> AsyncIterator[_VT]:
         """Async iterator that yields values for the key as they are published
 
         Waits for new values and yields them as they are set. If `last` is
@@ -22,16 +80,174 @@ class PubSub(Generic[_KT, _VT]):
         to wait. If the key doesn't exist, waits for the first value for the
         key; KeyError won't be raised.
 
+        If `after` is given, a sequence number, e.g., from `snapshot()`, the
+        latest value is yielded only if it was published after it.
+
+        """
+        return self._item(key).subscribe(last=last, after=after)
+
+    def subscribe_encoded(
+        self, key: _KT, last: bool = True, after: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """Same as `subscribe()` except that the values are encoded with the codec
+
+        `LookupError` is raised if no codec is registered for the key.
+
+        """
+        return self._item(key).subscribe_encoded(last=last, after=after)
+
+    def register_codec(self, key: _KT, codec: Codec) -> None:
+        """Register the codec for the key, used by `subscribe_encoded()`"""
+        self._codecs[key] = codec
+        if (item := self._queue.get(key)) is not None:
+            item.codec = codec
+
+    def register_prefix_codec(self, prefix: Prefix, codec: Codec) -> None:
+        """Register the codec for all tuple keys that start with the prefix
+
+        The codec registered with `register_codec()` for the key has priority.
+        Otherwise, the codec for the longest matching prefix is used.
+
         """
-        return self._queue[key].subscribe(last=last)
+        self._prefix_codecs[prefix] = codec
+        for key in self._index.get(prefix, ()):
+            self._queue[key].codec = self._find_codec(key)
+
+    async def subscribe_many(
+        self, keys: Iterable[_KT], last: bool = True
+    ) -> AsyncIterator[tuple[_KT, _VT]]:
+        """Async iterator that yields pairs of keys and values for all the keys
+
+        Yields `(key, value)` as the values are published for any of the keys.
+        The values are put in one queue at the publication, so the cost per
+        value doesn't depend on the number of the keys. If `last` is true,
+        yields first the latest values of the keys.
+
+        Returns when the method `end()` has been called for all the keys or
+        when the method `close()` is called.
+
+        """
+        # NOTE: No `await` until the first `yield` as in `subscribe_prefix()`.
+        keys = list(dict.fromkeys(keys))
+        q = asyncio.Queue[tuple[_KT, _VT | _End] | None]()
+        for key in keys:
+            self._item(key)
+            self._key_queues[key].add(q)
+        latest = self.snapshot(keys) if last else {}
+        remaining = len(keys)
+        try:
+            for key, (_, value) in latest.items():
+                yield key, value
+            while remaining and (item := await q.get()) is not None:
+                key, value_ = item
+                if value_ is _END:
+                    remaining -= 1
+                    continue
+                yield key, value_
+        finally:
+            for key in keys:
+                if (queues := self._key_queues.get(key)) is not None:
+                    queues.discard(q)
+                    if not queues:
+                        del self._key_queues[key]
+
+    async def subscribe_prefix(
+        self, prefix: Prefix, last: bool = True, after: int | None = None
+    ) -> AsyncIterator[tuple[_KT, _VT]]:
+        """Async iterator that yields pairs of tuple keys and values for the prefix
+
+        Yields `(key, value)` for every tuple key that starts with `prefix` as
+        the values are published. The empty tuple matches all tuple keys. If
+        `last` is true, yields first the latest values of the existing keys
+        with the prefix, only those published after `after` if it is given.
+
+        The subscription continues when the method `end()` is called for
+        matched keys. It returns when the method `close()` is called.
+
+        """
+        # NOTE: No `await` until the first `yield` so that no value is
+        # published between the registration of the queue and the collection
+        # of the latest values.
+        q = asyncio.Queue[tuple[_KT, _VT] | None]()
+        queues = self._prefix_queues[prefix]
+        queues.add(q)
+        latest = self._latest_by_prefix(prefix, after) if last else []
+        try:
+            for item in latest:
+                yield item
+            while (item_ := await q.get()) is not None:
+                yield item_
+        finally:
+            queues.discard(q)
+            if not queues:
+                self._prefix_queues.pop(prefix, None)
 
     async def publish(self, key: _KT, value: _VT) -> None:
         """Yield the value in the generators"""
-        await self._queue[key].publish(value)
+        await self._item(key).publish(value)
+        for q in self._key_queues.get(key, ()):
+            q.put_nowait((key, value))
+        if self._prefix_queues and isinstance(key, tuple):
+            for i in range(len(key) + 1):
+                for q_ in self._prefix_queues.get(key[:i], ()):
+                    q_.put_nowait((key, value))
 
     def latest(self, key: _KT) -> _VT:
         """Latest value for the key"""
-        return self._queue[key].latest()
+        return self._item(key).latest()
+
+    def latest_encoded(self, key: _KT) -> bytes:
+        """Latest value for the key encoded with the codec"""
+        item = self._item(key)
+        if item.codec is None:
+            raise LookupError(f'No codec is registered for {key!r}.')
+        return item.latest_encoded()
+
+    def backlogs(self) -> dict[Hashable, int]:
+        """The largest numbers of the values waiting for a subscriber by key
+
+        The values are never dropped; a slow subscriber has a growing backlog
+        instead. Only the keys and the prefixes of `subscribe_prefix()` with
+        waiting values are included. The subscriptions of `subscribe_many()`
+        are counted for all of their keys.
+
+        """
+        ret = dict[Hashable, int]()
+        for key, item in self._queue.items():
+            if (n := max(item.backlogs, default=0)) > 0:
+                ret[key] = n
+        for key, key_queues in self._key_queues.items():
+            if (n := max((q.qsize() for q in key_queues), default=0)) > 0:
+                ret[key] = max(n, ret.get(key, 0))
+        for prefix, prefix_queues in self._prefix_queues.items():
+            if (n := max((q.qsize() for q in prefix_queues), default=0)) > 0:
+                ret[prefix] = max(n, ret.get(prefix, 0))
+        return ret
+
+    def snapshot(
+        self, keys: Iterable[_KT] = (), prefixes: Iterable[Prefix] = ()
+    ) -> dict[_KT, tuple[int, _VT]]:
+        """Latest values with sequence numbers for the keys and the prefixes
+
+        The keys without values are omitted. The values are collected without
+        `await` and are, therefore, consistent with each other.
+
+        """
+        ret = dict[_KT, tuple[int, _VT]]()
+        for key in keys:
+            if (item := self._queue.get(key)) is None:
+                continue
+            try:
+                ret[key] = item.latest_enumerated()
+            except LookupError:
+                continue
+        for prefix in prefixes:
+            for key in self._index.get(prefix, ()):
+                try:
+                    ret[key] = self._queue[key].latest_enumerated()
+                except LookupError:
+                    continue
+        return ret
 
     async def end(self, key: _KT) -> None:
         """End all subscriptions for the key
@@ -41,18 +257,71 @@ class PubSub(Generic[_KT, _VT]):
 
         """
         if q := self._queue.pop(key, None):
+            self._unindex(key)
             await q.aclose()
+            for q_ in self._key_queues.get(key, ()):
+                q_.put_nowait((key, _END))
 
     async def close(self) -> None:
         """End all subscriptions for all keys
 
-        All async generators returned by the method `subscribe()` for any key
-        will return.
+        All async generators returned by the methods `subscribe()`,
+        `subscribe_many()`, and `subscribe_prefix()` will return.
 
         """
         while self._queue:
-            _, q = self._queue.popitem()
+            key, q = self._queue.popitem()
+            self._unindex(key)
             await q.aclose()
+        for key_queues in list(self._key_queues.values()):
+            for q_ in key_queues:
+                q_.put_nowait(None)
+        for prefix_queues in list(self._prefix_queues.values()):
+            for q__ in prefix_queues:
+                q__.put_nowait(None)
+
+    def _item(self, key: _KT) -> PubSubItem[_VT]:
+        if (item := self._queue.get(key)) is None:
+            item = self._queue[key] = PubSubItem[_VT](
+                counter=self._counter, codec=self._find_codec(key)
+            )
+            self._index_key(key)
+        return item
+
+    def _find_codec(self, key: _KT) -> Codec | None:
+        if (codec := self._codecs.get(key)) is not None:
+            return codec
+        if self._prefix_codecs and isinstance(key, tuple):
+            for i in range(len(key), -1, -1):
+                if (codec := self._prefix_codecs.get(key[:i])) is not None:
+                    return codec
+        return self._default_codec
+
+    def _index_key(self, key: _KT) -> None:
+        if not isinstance(key, tuple):
+            return
+        for i in range(len(key) + 1):
+            self._index[key[:i]][key] = None
+
+    def _unindex(self, key: _KT) -> None:
+        if not isinstance(key, tuple):
+            return
+        for i in range(len(key) + 1):
+            prefix = key[:i]
+            if keys := self._index.get(prefix):
+                keys.pop(key, None)
+                if not keys:
+                    del self._index[prefix]
+
+    def _latest_by_prefix(
+        self, prefix: Prefix, after: int | None
+    ) -> list[tuple[_KT, _VT]]:
+        snapshot = self.snapshot(prefixes=(prefix,))
+        return [
+            (key, value)
+            for key, (idx, value) in snapshot.items()
+            if after is None or after < idx
+        ]
 
     async def __aenter__(self) -> "PubSub[_KT, _VT]":
         return self
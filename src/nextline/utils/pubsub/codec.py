@@ -0,0 +1,29 @@
+import dataclasses
+import datetime
+import json
+from typing import Any
+
+
+def json_codec(value: Any) -> bytes:
+    '''Encode the value in JSON, including dataclass and datetime objects.
+
+    A codec for `PubSub` and `PubSubItem`.
+
+    >>> @dataclasses.dataclass(frozen=True)
+    ... class Info:
+    ...     no: int
+    ...     at: datetime.datetime
+
+    >>> json_codec(Info(no=1, at=datetime.datetime(2024, 1, 2, 3, 4, 5)))
+    b'{"no":1,"at":"2024-01-02T03:04:05"}'
+
+    '''
+    return json.dumps(value, default=_default, separators=(',', ':')).encode()
+
+
+def _default(o: Any) -> Any:
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if isinstance(o, (datetime.datetime, datetime.date)):
+        return o.isoformat()
+    return str(o)
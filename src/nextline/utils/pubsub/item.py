@@ -1,6 +1,7 @@
 import asyncio
 import enum
-from collections.abc import AsyncGenerator
+import itertools
+from collections.abc import AsyncGenerator, Callable, Iterator
 from typing import Any, Generic, TypeAlias, TypeVar
 
 # Use Enum with one object as sentinel as suggested in
@@ -34,6 +35,12 @@ _Item = TypeVar('_Item')
 Enumerated: TypeAlias = tuple[int, _Item | _End]
 LastEnumerated: TypeAlias = tuple[int, _Item | _End | _Start]
 
+Codec: TypeAlias = Callable[[Any], bytes]
+
+# The number of encoded items to keep. A subscriber that falls behind by more
+# than this number encodes the items again.
+ENCODED_MEMO_SIZE = 64
+
 
 class PubSubItem(Generic[_Item]):
     '''Distribute items to multiple asynchronous subscribers.
@@ -43,6 +50,15 @@ class PubSubItem(Generic[_Item]):
     cache
         If `True`, all items are cached and new subscribers receive all items
         and wait for new items. The default is `False`.
+    counter
+        An iterator of increasing integers from which the sequence numbers of
+        the items are drawn. It can be shared by multiple instances so that the
+        sequence numbers are comparable among them. By default, each instance
+        has its own counter starting from zero.
+    codec
+        A function that encodes an item into bytes. If given, the method
+        `subscribe_encoded()` yields the encoded items. Each item is encoded at
+        most once regardless of the number of the subscribers.
 
 
     Examples
@@ -205,13 +221,23 @@ class PubSubItem(Generic[_Item]):
 
     '''
 
-    def __init__(self, *, cache: bool = False) -> None:
+    def __init__(
+        self,
+        *,
+        cache: bool = False,
+        counter: Iterator[int] | None = None,
+        codec: Codec | None = None,
+    ) -> None:
+        self._counter = counter if counter is not None else itertools.count()
+        self.codec = codec
+        self._encoded = dict[int, bytes]()
         self._cache = list[Enumerated[_Item]]() if cache else None
 
         self._queues = list[asyncio.Queue[Enumerated[_Item]]]()
         self._last_enumerated: LastEnumerated[_Item] = (-1, _START)
 
         self._last_item: _Item | _Start = _START
+        self._last_item_idx = -1
         self._idx = -1
 
         self._closed: bool = False
@@ -221,6 +247,16 @@ class PubSubItem(Generic[_Item]):
         '''True if the cache is enabled, False otherwise.'''
         return self._cache is not None
 
+    @property
+    def codec(self) -> Codec | None:
+        '''The function to encode items for `subscribe_encoded()`.'''
+        return self._codec
+
+    @codec.setter
+    def codec(self, codec: Codec | None) -> None:
+        self._codec = codec
+        self._encoded = dict[int, bytes]()
+
     @property
     def closed(self) -> bool:
         '''True if the instance is closed, False otherwise.'''
@@ -231,6 +267,11 @@ class PubSubItem(Generic[_Item]):
         '''The number of the subscribers'''
         return len(self._queues)
 
+    @property
+    def backlogs(self) -> list[int]:
+        '''The numbers of the items waiting to be yielded to each subscriber'''
+        return [q.qsize() for q in self._queues]
+
     async def publish(self, item: _Item) -> None:
         '''Send data to subscribers'''
         if self._closed:
@@ -242,7 +283,7 @@ class PubSubItem(Generic[_Item]):
         '''Remove the last item and clear the cache if it is enabled'''
         if self._closed:
             raise RuntimeError(f'{self} is closed.')
-        self._idx += 1
+        self._idx = next(self._counter)
         self._last_enumerated = (self._idx, _START)
         self._last_item = _START
         if self._cache is not None:
@@ -254,8 +295,21 @@ class PubSubItem(Generic[_Item]):
             raise LookupError
         return self._last_item
 
-    async def subscribe(
-        self, last: bool = True, cache: bool = True
+    def latest_enumerated(self) -> tuple[int, _Item]:
+        '''Most recent data that have been published with the sequence number
+
+        The sequence number can be given to `subscribe()` as `after`.
+        '''
+        if self._last_item is _START:
+            raise LookupError
+        return self._last_item_idx, self._last_item
+
+    def latest_encoded(self) -> bytes:
+        '''Most recent data that have been published, encoded with the codec'''
+        return self._encode(*self.latest_enumerated())
+
+    def subscribe(
+        self, last: bool = True, cache: bool = True, after: int | None = None
     ) -> AsyncGenerator[_Item, None]:
         '''Yield data as they are put after yielding, based on the options, old data.
 
@@ -269,8 +323,27 @@ class PubSubItem(Generic[_Item]):
             `cache` option of the class is `True`. The default is `True`. If
             `True`, yield all data that have been published so far before
             waiting for new data.
+        after
+            A sequence number, e.g., from `latest_enumerated()`. If given, the
+            old data up to this sequence number are not yielded. The new data
+            are yielded regardless.
         '''
+        return self._subscribe(last=last, cache=cache, after=after, encode=False)
 
+    def subscribe_encoded(
+        self, last: bool = True, cache: bool = True, after: int | None = None
+    ) -> AsyncGenerator[bytes, None]:
+        '''Same as `subscribe()` except that the data are encoded with the codec.
+
+        The encoded data are shared among the subscribers.
+        '''
+        if self._codec is None:
+            raise LookupError(f'No codec is given to {self}.')
+        return self._subscribe(last=last, cache=cache, after=after, encode=True)
+
+    async def _subscribe(
+        self, last: bool, cache: bool, after: int | None, encode: bool
+    ) -> AsyncGenerator[Any, None]:
         # Copy these attributes as they can change after `yield` and `await`
         last_idx, last_item = self._last_enumerated
         cached = list(self._cache) if self._cache is not None else None
@@ -292,11 +365,14 @@ class PubSubItem(Generic[_Item]):
                         break
                     if item is _END:
                         return  # pragma: no cover
-                    yield item
+                    if after is not None and not after < idx:
+                        continue
+                    yield self._encode(idx, item) if encode else item
 
             # Yield the most recent data
             if last and last_item is not _START:
-                yield last_item
+                if after is None or after < last_idx:
+                    yield self._encode(last_idx, last_item) if encode else last_item
 
             # Yield new data as they arrive
             while True:
@@ -304,7 +380,7 @@ class PubSubItem(Generic[_Item]):
                 if item is _END:
                     return
                 if last_idx < idx:  # pragma: no branch
-                    yield item
+                    yield self._encode(idx, item) if encode else item
 
         finally:
             # This `finally` block might not be executed unless `aclose()` is
@@ -312,6 +388,15 @@ class PubSubItem(Generic[_Item]):
             # end, for example, by the `break` statement.
             self._queues.remove(q)
 
+    def _encode(self, idx: int, item: _Item) -> bytes:
+        if (encoded := self._encoded.get(idx)) is not None:
+            return encoded
+        assert self._codec is not None
+        encoded = self._encoded[idx] = self._codec(item)
+        if len(self._encoded) > ENCODED_MEMO_SIZE:
+            del self._encoded[min(self._encoded)]
+        return encoded
+
     async def aclose(self) -> None:
         '''Return all subscriptions and prevent new subscriptions.'''
         if self._closed:
@@ -326,8 +411,10 @@ class PubSubItem(Generic[_Item]):
         await self.aclose()
 
     async def _enumerate(self, item: _Item | _End) -> None:
-        self._idx += 1
+        self._idx = next(self._counter)
         self._last_enumerated = enumerated = (self._idx, item)
+        if item is not _END:
+            self._last_item_idx = self._idx
         if self._cache is not None:
             self._cache.append(enumerated)
         for q in list(self._queues):  # `list` as it can change during iteration
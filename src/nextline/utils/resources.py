@@ -0,0 +1,61 @@
+import os
+from collections.abc import Iterable
+from logging import getLogger
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+
+def set_resources(
+    cpu_affinity: Optional[Iterable[int]] = None,
+    nice: Optional[int] = None,
+    rlimit_as: Optional[int] = None,
+    rlimit_cpu: Optional[int] = None,
+) -> None:
+    '''Set the CPU affinity, the niceness, and resource limits of the current process.
+
+    The options that are `None` are not set. The options that are not
+    supported on the platform are ignored with a warning.
+
+    Parameters
+    ----------
+    cpu_affinity
+        The CPUs on which the process is eligible to run.
+    nice
+        The increment of the niceness.
+    rlimit_as
+        The soft limit of the virtual memory size in bytes (`RLIMIT_AS`).
+    rlimit_cpu
+        The soft limit of the CPU time in seconds (`RLIMIT_CPU`). The process
+        receives `SIGXCPU` when it is exceeded.
+
+    '''
+    logger = getLogger(__name__)
+    if cpu_affinity is not None:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, cpu_affinity)
+        else:  # pragma: no cover
+            logger.warning('CPU affinity is not supported on this platform.')
+    if nice is not None:
+        if hasattr(os, 'nice'):
+            os.nice(nice)
+        else:  # pragma: no cover
+            logger.warning('Niceness is not supported on this platform.')
+    if rlimit_as is not None:
+        _set_rlimit('RLIMIT_AS', rlimit_as)
+    if rlimit_cpu is not None:
+        _set_rlimit('RLIMIT_CPU', rlimit_cpu)
+
+
+def _set_rlimit(name: str, soft: int) -> None:
+    if resource is None or (which := getattr(resource, name, None)) is None:
+        logger = getLogger(__name__)
+        logger.warning(f'{name} is not supported on this platform.')
+        return
+    _, hard = resource.getrlimit(which)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(which, (soft, hard))
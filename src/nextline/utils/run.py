@@ -152,9 +152,10 @@ async def run_in_process(
                 )
                 initializer = partial(_call_all, logging_initializer, initializer)
 
-            with ProcessPoolExecutor(
+            executor = ProcessPoolExecutor(
                 max_workers=1, mp_context=mp_context, initializer=initializer
-            ) as executor:
+            )
+            try:
                 loop = asyncio.get_running_loop()
                 future = loop.run_in_executor(executor, func)
                 process = list(executor._processes.values())[0]
@@ -169,6 +170,11 @@ async def run_in_process(
                     pass
                 except BaseException as e:
                     exc = e
+            finally:
+                # NOTE: Shut down in a thread. The process might not exit until
+                # the data that it has put in queues are read, which might
+                # happen in the event loop.
+                await asyncio.to_thread(executor.shutdown)
         return ret, exc
 
     task = asyncio.create_task(_run())
@@ -0,0 +1,102 @@
+import mmap
+import struct
+import tempfile
+from typing import IO, Any, Optional
+
+
+class TextLog:
+    '''Append-only log of text records stored in temporary files.
+
+    The text is appended to one file and an index to another file. Each index
+    entry is a fixed-size record of the offset and the length of the text
+    followed by the fields given by `meta_format`, a format string of the
+    `struct` module without the byte order character. The files are read via
+    `mmap` so that the log does not live in the heap.
+
+    The files are deleted when the log is closed.
+
+    Example:
+
+    >>> log = TextLog(meta_format='q')
+    >>> log.append('hello\\n', 1)
+    0
+    >>> log.append('world\\n', 2)
+    1
+    >>> len(log)
+    2
+    >>> log.text(1)
+    'world\\n'
+    >>> log.meta(1)
+    (2,)
+    >>> log.close()
+
+    '''
+
+    def __init__(self, meta_format: str = '', dir: Optional[str] = None) -> None:
+        self._record = struct.Struct(f'<qq{meta_format}')
+        self._text = _MappedFile(dir=dir)
+        self._index = _MappedFile(dir=dir)
+        self._offset = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, text: str, *meta: Any) -> int:
+        '''Append the text with the metadata and return its index.'''
+        data = text.encode()
+        self._text.write(data)
+        self._index.write(self._record.pack(self._offset, len(data), *meta))
+        self._offset += len(data)
+        self._len += 1
+        return self._len - 1
+
+    def text(self, i: int) -> str:
+        offset, length = self._entry(i)[:2]
+        return self._text.read(offset, length).decode()
+
+    def meta(self, i: int) -> tuple[Any, ...]:
+        return self._entry(i)[2:]
+
+    def close(self) -> None:
+        self._text.close()
+        self._index.close()
+
+    def _entry(self, i: int) -> tuple[Any, ...]:
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        size = self._record.size
+        return self._record.unpack(self._index.read(i * size, size))
+
+
+class _MappedFile:
+    '''A temporary file to which bytes are appended and from which read via mmap.'''
+
+    def __init__(self, dir: Optional[str] = None) -> None:
+        self._file: IO[bytes] = tempfile.TemporaryFile(dir=dir)
+        self._size = 0
+        self._flushed = 0
+        self._mmap: Optional[mmap.mmap] = None
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._size += len(data)
+
+    def read(self, offset: int, length: int) -> bytes:
+        if not length:
+            return b''
+        if self._flushed < offset + length:
+            self._file.flush()
+            self._flushed = self._size
+        if self._mmap is None or len(self._mmap) < offset + length:
+            # Map the file again as it has grown.
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap[offset : offset + length]
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
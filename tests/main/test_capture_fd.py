@@ -0,0 +1,41 @@
+import asyncio
+
+from nextline import Nextline
+from nextline.types import StdoutInfo
+
+SOURCE = """
+import os
+import sys
+print('python stdout')
+print('python stderr', file=sys.stderr)
+os.write(1, b'fd stdout\\n')
+os.write(2, b'fd stderr\\n')
+""".strip()
+
+
+async def test_capture_fd() -> None:
+    async with Nextline(SOURCE, capture_fd=True) as nextline:
+
+        async def subscribe(stream: str) -> list[StdoutInfo]:
+            if stream == 'stderr':
+                return [i async for i in nextline.subscribe_stderr()]
+            return [i async for i in nextline.subscribe_stdout()]
+
+        task_out = asyncio.create_task(subscribe('stdout'))
+        task_err = asyncio.create_task(subscribe('stderr'))
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+
+    out = await task_out
+    err = await task_err
+
+    assert {(i.trace_no, i.text) for i in out} == {
+        (1, 'python stdout\n'),
+        (None, 'fd stdout\n'),
+    }
+    assert {(i.trace_no, i.text) for i in err} == {
+        (1, 'python stderr\n'),
+        (None, 'fd stderr\n'),
+    }
+    assert {i.stream for i in out} == {'stdout'}
+    assert {i.stream for i in err} == {'stderr'}
@@ -0,0 +1,79 @@
+import asyncio
+
+from nextline import Nextline
+from nextline.types import FunctionStatsTable
+
+SOURCE = """
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+def main():
+    return fib(5)
+
+
+main()
+""".strip()
+
+
+async def test_function_stats() -> None:
+    async with Nextline(SOURCE, function_stats=True) as nextline:
+        published = list[FunctionStatsTable]()
+
+        async def subscribe() -> None:
+            async for table in nextline.subscribe_function_stats():
+                published.append(table)
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+
+        stats = {s.name: s for s in nextline.get_function_stats()}
+        assert stats.keys() == {'<module>', 'main', 'fib'}
+        assert stats['fib'].calls == 15
+        assert stats['main'].calls == 1
+        assert stats['fib'].line_no == 1
+        assert stats['main'].line_no == 5
+        for s in stats.values():
+            assert 0 <= s.exclusive_time <= s.inclusive_time
+        main, fib = stats['main'], stats['fib']
+        assert main.inclusive_time >= main.exclusive_time + fib.inclusive_time * 0.99
+        assert nextline.get_function_stats(trace_no=1) == nextline.get_function_stats()
+        assert nextline.get_function_stats(trace_no=2) == []
+
+    await task
+    assert [(t.run_no, t.trace_no) for t in published] == [(1, 1)]
+
+
+async def test_disabled() -> None:
+    async with Nextline(SOURCE) as nextline:
+        await nextline.run_continue_and_wait()
+        assert nextline.get_function_stats() == []
+
+
+async def test_request() -> None:
+    async with Nextline(SOURCE, function_stats=True) as nextline:
+        published = list[FunctionStatsTable]()
+
+        async def subscribe() -> None:
+            async for table in nextline.subscribe_function_stats():
+                published.append(table)
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        async with nextline.run_session():
+            async for prompt in nextline.prompts():
+                if prompt.event == 'return':
+                    # At the "return" event of the module
+                    await nextline.request_function_stats()
+                    while not published:
+                        await asyncio.sleep(0.01)
+                await nextline.send_pdb_command(
+                    'next', prompt.prompt_no, prompt.trace_no
+                )
+
+    await task
+    assert len(published) == 2
+    expected = {'<module>': 1, 'main': 1, 'fib': 15}
+    for table in published:
+        assert {s.name: s.calls for s in table.stats} == expected
@@ -0,0 +1,65 @@
+import datetime
+
+from nextline import Nextline
+from nextline.plugin.plugins.registrars.stdout import StdoutLog
+from nextline.types import RunNo, StdoutInfo
+
+SOURCE = """
+import threading
+
+def f():
+    for i in range(3):
+        print(f'thread {i}')
+
+t = threading.Thread(target=f)
+t.start()
+t.join()
+for i in range(5):
+    print(f'main {i}')
+""".strip()
+
+
+async def test_get_stdout() -> None:
+    async with Nextline(SOURCE, trace_threads=True) as nextline:
+        assert nextline.get_stdout() == []
+        started_at = datetime.datetime.utcnow()
+        await nextline.run_continue_and_wait()
+
+        lines = nextline.get_stdout()
+        assert sorted(i.text or '' for i in lines) == sorted(
+            [f'thread {i}\n' for i in range(3)] + [f'main {i}\n' for i in range(5)]
+        )
+        assert {i.run_no for i in lines} == {1}
+        assert all(started_at <= i.written_at for i in lines)  # type: ignore
+
+        main = nextline.get_stdout(run_no=1, trace_no=1)
+        assert [i.text for i in main] == [f'main {i}\n' for i in range(5)]
+
+        page = nextline.get_stdout(trace_no=1, start=1, limit=2)
+        assert [i.text for i in page] == ['main 1\n', 'main 2\n']
+
+        thread = nextline.get_stdout(trace_no=2)
+        assert [i.text for i in thread] == [f'thread {i}\n' for i in range(3)]
+
+        later = nextline.get_stdout(since=datetime.datetime.utcnow())
+        assert later == []
+
+        assert nextline.get_stdout(run_no=2) == []
+
+
+def test_since_out_of_order() -> None:
+    t0 = datetime.datetime(2024, 1, 1)
+    log = StdoutLog(RunNo(1))
+    seconds = [0, 3, 1, 1, 1, 2, 4]  # e.g., stdout and stderr stamped separately
+    for i, s in enumerate(seconds):
+        written_at = t0 + datetime.timedelta(seconds=s)
+        log.append(StdoutInfo(RunNo(1), None, f'{i}\n', written_at))
+
+    for since in range(6):
+        lines = log.get(since=t0 + datetime.timedelta(seconds=since))
+        texts = {i.text or '' for i in lines}
+        # No line written at or after `since` is skipped
+        assert texts >= {f'{i}\n' for i, s in enumerate(seconds) if s >= since}
+        # The lines are in the order of arrival
+        assert [i.text for i in lines] == sorted(texts)
+    log.close()
@@ -0,0 +1,59 @@
+from nextline import Nextline
+from nextline.types import HookStats
+
+SOURCE = """
+x = 0
+""".strip()
+
+
+async def test_hook_stats() -> None:
+    async with Nextline(SOURCE, hook_stats=True) as nextline:
+        await nextline.run_continue_and_wait()
+        hook_stats: HookStats = nextline.get('hook_stats')
+
+    assert hook_stats.run_no == 1
+
+    main = {(s.hook_name, s.plugin): s for s in hook_stats.main}
+    assert main[('on_start_run', 'RunInfoRegistrar')].calls == 1
+    assert main[('run', 'RunSession')].calls == 1
+    assert all(s.time >= 0 for s in hook_stats.main)
+
+    spawned = {(s.hook_name, s.plugin): s for s in hook_stats.spawned}
+    assert spawned[('on_start_trace', 'Repeater')].calls == 1
+    on_trace_call = spawned[('on_trace_call', 'Repeater')]
+    assert on_trace_call.calls >= 1
+    assert on_trace_call.time > 0
+    assert all(s.time >= 0 for s in hook_stats.spawned)
+
+
+async def test_disabled() -> None:
+    async with Nextline(SOURCE) as nextline:
+        await nextline.run_continue_and_wait()
+        assert 'hook_stats' not in nextline.snapshot(keys=('hook_stats',))
+
+
+SOURCE_THREADS = """
+import threading
+
+
+def f():
+    print('thread')
+
+
+t = threading.Thread(target=f)
+t.start()
+t.join()
+print('main')
+""".strip()
+
+
+async def test_all_calls_counted() -> None:
+    '''The calls in the contexts of the other plugins are also counted.'''
+    async with Nextline(SOURCE_THREADS, trace_threads=True, hook_stats=True) as nl:
+        await nl.run_continue_and_wait()
+        hook_stats: HookStats = nl.get('hook_stats')
+
+    spawned = {(s.hook_name, s.plugin): s.calls for s in hook_stats.spawned}
+    assert spawned[('on_start_trace', 'Repeater')] == 2
+    assert spawned[('on_end_trace', 'Repeater')] == 2
+    assert spawned[('on_write_stdout', 'Repeater')] == 2
@@ -0,0 +1,37 @@
+import asyncio
+
+from nextline import Nextline
+from nextline.types import LineHits
+
+SOURCE = """
+for i in range(3):
+    x = i
+y = 0
+""".strip()
+
+
+async def test_line_hits() -> None:
+    async with Nextline(SOURCE, line_hits=True) as nextline:
+
+        async def subscribe() -> list[LineHits]:
+            return [i async for i in nextline.subscribe_line_hits()]
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+
+        (file_name,) = nextline.get_line_hits()
+        assert nextline.get_line_hits() == {file_name: {1: 4, 2: 3, 3: 1}}
+
+    published = await task
+    totals = dict[int, int]()
+    for line_hits in published:
+        assert line_hits.run_no == 1
+        totals.update(line_hits.hits[file_name])
+    assert totals == {1: 4, 2: 3, 3: 1}
+
+
+async def test_disabled() -> None:
+    async with Nextline(SOURCE) as nextline:
+        await nextline.run_continue_and_wait()
+        assert nextline.get_line_hits() == {}
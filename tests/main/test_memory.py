@@ -0,0 +1,54 @@
+import asyncio
+
+from nextline import Nextline
+from nextline.types import MemorySnapshot
+
+SOURCE = """
+x = [0] * 100_000
+y = 0
+""".strip()
+
+
+async def test_memory() -> None:
+    async with Nextline(SOURCE, memory=True) as nextline:
+
+        async def subscribe() -> list[MemorySnapshot]:
+            return [i async for i in nextline.subscribe_memory()]
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        prompts = []
+        async with nextline.run_session():
+            async for prompt in nextline.prompts():
+                prompts.append(prompt)
+                await nextline.send_pdb_command(
+                    'next', prompt.prompt_no, prompt.trace_no
+                )
+
+    published = await task
+    assert published[-1].final
+    by_prompt = {m.prompt_no: m for m in published if not m.final}
+    assert by_prompt.keys() == {p.prompt_no for p in prompts}
+
+    # At the prompt at the 2nd line, after the list is created
+    (prompt,) = [p for p in prompts if p.line_no == 2 and p.event == 'line']
+    memory = by_prompt[prompt.prompt_no]
+    assert memory.run_no == 1
+    assert memory.trace_no == prompt.trace_no
+    assert memory.peak >= memory.current >= 800_000
+    top = memory.top[0]
+    assert (top.file_name, top.line_no) == (prompt.file_name, 1)
+    assert top.size_diff >= 800_000
+
+
+async def test_disabled() -> None:
+    async with Nextline(SOURCE) as nextline:
+
+        async def subscribe() -> list[MemorySnapshot]:
+            return [i async for i in nextline.subscribe_memory()]
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+
+    assert await task == []
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from nextline import Nextline
+from nextline.plugin.plugins.registrars import metrics as metrics_module
+from nextline.types import Metrics
+
+SOURCE = """
+import time
+for i in range(5):
+    print('x' * 99)
+    time.sleep(0.02)
+""".strip()
+
+
+@pytest.fixture(autouse=True)
+def interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metrics_module, 'METRICS_INTERVAL', 0.01)
+
+
+async def test_metrics() -> None:
+    async with Nextline(SOURCE) as nextline:
+        collected = list[Metrics]()
+
+        async def subscribe() -> None:
+            async for metrics in nextline.subscribe_metrics():
+                collected.append(metrics)
+
+        async with nextline.run_session():
+            task = asyncio.create_task(subscribe())
+            async for prompt in nextline.prompts():
+                await nextline.send_pdb_command(
+                    'continue', prompt.prompt_no, prompt.trace_no
+                )
+
+    await task
+    assert all(m.run_no == 1 for m in collected)
+    *periodic, final = collected
+    assert periodic
+    assert not any(m.final for m in periodic)
+    assert final.final
+    assert final.events_processed > 0
+    if final.queue_depth is not None:
+        assert final.queue_depth == 0
+        assert final.events_emitted == final.events_processed
+        assert final.oldest_event_lag == 0
+    processed = [m.events_processed for m in collected]
+    assert processed == sorted(processed)
+    assert any(m.stdout_bytes_per_sec > 0 for m in collected)
+    assert all(m.stdout_bytes_per_sec >= 0 for m in collected)
@@ -80,3 +80,25 @@ async def mock_continuous(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
     class_ = Mock(return_value=instance)
     monkeypatch.setattr(main, 'Continuous', class_)
     return instance
+
+
+async def test_snapshot() -> None:
+    async with Nextline(SOURCE) as nextline:
+        snapshot = nextline.snapshot()
+        assert snapshot['state_name'][1] == 'initialized'
+        assert snapshot['statement'][1] == SOURCE
+        async with nextline.run_session():
+            async for prompt in nextline.prompts():
+                snapshot = nextline.snapshot()
+                assert snapshot['state_name'][1] == 'running'
+                assert snapshot['trace_nos'][1] == (prompt.trace_no,)
+                key = ('prompt_info', prompt.trace_no)
+                assert snapshot[key][1].prompt_no == prompt.prompt_no
+                idx = snapshot['state_name'][0]
+                assert idx < snapshot[key][0]
+                await nextline.send_pdb_command(
+                    'continue', prompt.prompt_no, prompt.trace_no
+                )
+        assert nextline.snapshot(keys=['run_no']) == {
+            'run_no': nextline.snapshot()['run_no']
+        }
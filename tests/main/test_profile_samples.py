@@ -0,0 +1,95 @@
+import asyncio
+
+from nextline import Nextline
+from nextline.types import ProfileSamples, StdoutInfo, TraceNosDelta
+
+SOURCE = """
+import time
+
+
+def wait():
+    time.sleep(0.3)
+
+
+wait()
+""".strip()
+
+
+async def test_profile_samples() -> None:
+    async with Nextline(SOURCE, profile_interval=0.01) as nextline:
+
+        async def subscribe() -> list[ProfileSamples]:
+            return [i async for i in nextline.subscribe_profile_samples()]
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+
+        samples = nextline.get_profile_samples()
+        (stack,) = [s for s in samples if 'wait' in s]
+        file_name = stack.split('(')[1].split(':')[0]
+        assert stack == f'<module> ({file_name}:1);wait ({file_name}:4)'
+        assert 10 <= samples[stack] <= 40
+
+    published = await task
+    totals = dict[str, int]()
+    for profile_samples in published:
+        assert profile_samples.run_no == 1
+        for s, n in profile_samples.samples.items():
+            totals[s] = totals.get(s, 0) + n
+    assert totals == samples
+
+
+async def test_disabled() -> None:
+    async with Nextline(SOURCE) as nextline:
+        await nextline.run_continue_and_wait()
+        assert nextline.get_profile_samples() == {}
+
+
+SOURCE_THREADS = """
+import threading
+import time
+
+
+def spin():
+    end = time.perf_counter() + 0.3
+    while time.perf_counter() < end:
+        pass
+
+
+t = threading.Thread(target=spin)
+t.start()
+t.join()
+print('done')
+""".strip()
+
+
+async def test_profile_only() -> None:
+    async with Nextline(
+        SOURCE_THREADS, trace_threads=True, profile_only=True
+    ) as nextline:
+
+        async def subscribe_stdout() -> list[StdoutInfo]:
+            return [i async for i in nextline.subscribe_stdout()]
+
+        async def subscribe_trace_ids() -> list[TraceNosDelta]:
+            return [i async for i in nextline.subscribe_trace_ids_delta()]
+
+        task_stdout = asyncio.create_task(subscribe_stdout())
+        task_trace_ids = asyncio.create_task(subscribe_trace_ids())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+
+        samples = nextline.get_profile_samples()
+
+    # Nothing is traced.
+    assert await task_trace_ids == []
+
+    # Both the main thread and the thread that it starts are sampled.
+    (stack,) = [s for s in samples if 'spin' in s]
+    assert stack.startswith('spin (')
+    assert samples[stack] >= 10
+    assert any(s.startswith('<module> (') for s in samples)
+
+    # The output is not attributed to any trace.
+    assert [(i.trace_no, i.text) for i in await task_stdout] == [(None, 'done\n')]
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from nextline import Nextline
+from nextline.plugin.plugins.registrars import prompt_latency as prompt_latency_module
+from nextline.types import PromptLatency
+
+SOURCE = """
+x = 0
+for i in range(3):
+    x += i
+""".strip()
+
+
+async def test_prompt_latency() -> None:
+    async with Nextline(SOURCE) as nextline:
+        assert (initial := nextline.get_prompt_latency())
+        assert initial.prompt.count == 0
+        n_prompts = 0
+        async with nextline.run_session():
+            async for prompt in nextline.prompts():
+                n_prompts += 1
+                await nextline.send_pdb_command(
+                    'next', prompt.prompt_no, prompt.trace_no
+                )
+        prompt_latency: PromptLatency = nextline.get('prompt_latency')
+        assert nextline.get_prompt_latency() == prompt_latency
+
+    assert prompt_latency.run_no == 1
+    assert prompt_latency.prompt.count == n_prompts
+    assert prompt_latency.command.count == n_prompts
+    # No next prompt after the last command
+    assert prompt_latency.round_trip.count == n_prompts - 1
+
+    for histogram in (
+        prompt_latency.prompt,
+        prompt_latency.command,
+        prompt_latency.round_trip,
+    ):
+        assert sum(histogram.buckets) == histogram.count
+        assert len(histogram.buckets) == len(histogram.bounds) + 1
+        assert 0 <= histogram.min <= histogram.p50 <= histogram.p99 <= histogram.max
+        assert histogram.min <= histogram.mean <= histogram.max
+
+
+async def test_continuous() -> None:
+    async with Nextline(SOURCE) as nextline:
+        await nextline.run_continue_and_wait()
+        prompt_latency: PromptLatency = nextline.get('prompt_latency')
+    assert prompt_latency.prompt.count == 1
+    assert prompt_latency.command.count == 1
+    assert prompt_latency.round_trip.count == 0
+
+
+SOURCE_SLEEP = """
+import time
+for i in range(3):
+    time.sleep(0.02)
+""".strip()
+
+
+async def test_periodic(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(prompt_latency_module, 'PROMPT_LATENCY_INTERVAL', 0.01)
+    async with Nextline(SOURCE_SLEEP) as nextline:
+        collected = list[PromptLatency]()
+
+        async def subscribe() -> None:
+            async for prompt_latency in nextline.subscribe_prompt_latency():
+                collected.append(prompt_latency)
+
+        async with nextline.run_session():
+            task = asyncio.create_task(subscribe())
+            async for prompt in nextline.prompts():
+                await nextline.send_pdb_command(
+                    'next', prompt.prompt_no, prompt.trace_no
+                )
+        final = nextline.get_prompt_latency()
+
+    await task
+    # Published during the run, not only at the end
+    assert len([p for p in collected if p.run_no == 1]) > 2
+    assert collected[-1] == final
+    counts = [p.prompt.count for p in collected if p.run_no == 1]
+    assert counts == sorted(counts)
@@ -0,0 +1,77 @@
+import os
+import resource
+from typing import Any
+
+import pytest
+
+from nextline import Nextline
+
+
+def get_resources() -> dict[str, Any]:
+    return {
+        'cpu_affinity': sorted(os.sched_getaffinity(0)),
+        'nice': os.nice(0),
+        'rlimit_as': resource.getrlimit(resource.RLIMIT_AS)[0],
+        'rlimit_cpu': resource.getrlimit(resource.RLIMIT_CPU)[0],
+    }
+
+
+@pytest.mark.skipif(
+    not hasattr(os, 'sched_getaffinity'), reason='CPU affinity is not supported'
+)
+async def test_resources() -> None:
+    cpu_affinity = [min(os.sched_getaffinity(0))]
+    nice = os.nice(0)
+    async with Nextline(
+        get_resources,
+        cpu_affinity=cpu_affinity,
+        nice=1,
+        rlimit_as=8 * 2**30,
+        rlimit_cpu=600,
+    ) as nextline:
+        await nextline.run_continue_and_wait()
+        assert nextline.result() == {
+            'cpu_affinity': cpu_affinity,
+            'nice': nice + 1,
+            'rlimit_as': 8 * 2**30,
+            'rlimit_cpu': 600,
+        }
+
+        await nextline.reset(rlimit_cpu=300)
+        await nextline.run_continue_and_wait()
+        assert nextline.result()['rlimit_cpu'] == 300
+        assert nextline.result()['rlimit_as'] == 8 * 2**30
+
+    # Not set in this process
+    assert os.nice(0) == nice
+
+
+@pytest.mark.skipif(
+    not hasattr(os, 'sched_getaffinity'), reason='CPU affinity is not supported'
+)
+async def test_invalid() -> None:
+    invalid = max(os.sched_getaffinity(0)) + 1000
+    async with Nextline(get_resources, cpu_affinity=[invalid]) as nextline:
+        await nextline.run_continue_and_wait()
+        assert (exception := nextline.format_exception())
+        assert 'OSError' in exception
+        assert nextline.result() is None
+
+        # Unset by reset()
+        await nextline.reset(cpu_affinity=())
+        await nextline.run_continue_and_wait()
+        assert not nextline.format_exception()
+        assert nextline.result()['cpu_affinity'] == sorted(os.sched_getaffinity(0))
+
+
+async def test_reset_unset() -> None:
+    default = get_resources()
+    async with Nextline(
+        get_resources, nice=1, rlimit_as=8 * 2**30, rlimit_cpu=600
+    ) as nl:
+        await nl.run_continue_and_wait()
+        assert nl.result()['rlimit_cpu'] == 600
+
+        await nl.reset(nice=0, rlimit_as=0, rlimit_cpu=0)
+        await nl.run_continue_and_wait()
+        assert nl.result() == default
@@ -0,0 +1,32 @@
+import asyncio
+
+from nextline import Nextline
+from nextline.types import RunResources
+
+SOURCE = """
+x = sum(range(10**7))
+""".strip()
+
+
+async def test_run_resources() -> None:
+    async with Nextline(SOURCE) as nextline:
+
+        async def subscribe() -> list[RunResources]:
+            ret = list[RunResources]()
+            async for r in nextline.subscribe_run_resources():
+                ret.append(r)
+                if r.final:
+                    break
+            return ret
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+        samples = await task
+
+        final = samples[-1]
+        assert final.run_no == 1
+        assert final.user_time > 0
+        assert final.max_rss > 0
+        assert nextline.get('run_resources') == final
+        assert 'run_resources' in nextline.snapshot()
@@ -0,0 +1,129 @@
+import json
+from pathlib import Path
+
+from nextline import Nextline
+
+SOURCE = """
+import threading
+
+
+def f():
+    x = 0
+    for i in range(3):
+        x += i
+
+
+t = threading.Thread(target=f)
+t.start()
+t.join()
+""".strip()
+
+
+def load_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+async def test_json_lines(tmp_path: Path) -> None:
+    span_file = tmp_path / 'spans-{run_no}.jsonl'
+    async with Nextline(
+        SOURCE, trace_threads=True, span_file=str(span_file)
+    ) as nextline:
+        await nextline.run_continue_and_wait()
+    spans = load_jsonl(tmp_path / 'spans-1.jsonl')
+
+    by_id = {s['span_id']: s for s in spans}
+    assert len(by_id) == len(spans)
+    (run,) = [s for s in spans if s['kind'] == 'run']
+    assert run['parent_id'] is None
+    assert run['run_no'] == 1
+    assert spans[-1] is run  # written last as it ends last
+
+    expected_parent_kind = {
+        'trace': 'run',
+        'trace_call': 'trace',
+        'cmdloop': 'trace_call',
+        'prompt': 'cmdloop',
+    }
+    for span in spans:
+        assert span['start'] <= span['end']
+        if span is run:
+            continue
+        parent = by_id[span['parent_id']]
+        assert parent['kind'] == expected_parent_kind[span['kind']]
+        assert parent['start'] <= span['start']
+        assert span['end'] <= parent['end']
+        if span['kind'] != 'trace':
+            assert span['trace_no'] == parent['trace_no']
+
+    traces = [s for s in spans if s['kind'] == 'trace']
+    assert sorted(s['trace_no'] for s in traces) == [1, 2]
+    prompts = [s for s in spans if s['kind'] == 'prompt']
+    assert prompts
+    assert all(s['attributes']['command'] == 'continue' for s in prompts)
+
+
+async def test_sample(tmp_path: Path) -> None:
+    counts = dict[int, int]()
+    for sample in (1, 3):
+        span_file = tmp_path / f'spans-{sample}.jsonl'
+        async with Nextline(
+            SOURCE, trace_threads=True, span_file=str(span_file), span_sample=sample
+        ) as nextline:
+            await nextline.run_continue_and_wait()
+        spans = load_jsonl(span_file)
+        counts[sample] = len([s for s in spans if s['kind'] == 'trace_call'])
+    assert 0 < counts[3] < counts[1]
+
+
+async def test_chrome_trace(tmp_path: Path) -> None:
+    span_file = tmp_path / 'spans.json'
+    async with Nextline(
+        SOURCE, trace_threads=True, span_file=str(span_file)
+    ) as nextline:
+        await nextline.run_continue_and_wait()
+        await nextline.reset(span_file='')
+        await nextline.run_continue_and_wait()
+    events = json.loads(span_file.read_text())  # not overwritten by the run 2
+
+    spans = [e for e in events if e['ph'] == 'X']
+    assert {e['cat'] for e in spans} == {
+        'run',
+        'trace',
+        'trace_call',
+        'cmdloop',
+        'prompt',
+    }
+    assert all(e['pid'] == 1 and e['dur'] >= 0 for e in spans)
+    names = {e['tid']: e['args']['name'] for e in events if e['name'] == 'thread_name'}
+    assert names[0] == 'run'
+    assert names[1].startswith('trace 1 (thread 1')
+    assert names[2].startswith('trace 2 (thread 2')
+
+
+SOURCE_LOOP = """
+x = 0
+for i in range(5):
+    x += i
+""".strip()
+
+
+async def test_sample_prompts(tmp_path: Path) -> None:
+    '''The trace calls with prompts are written even if not sampled.'''
+    span_file = tmp_path / 'spans.jsonl'
+    async with Nextline(SOURCE_LOOP, span_file=str(span_file), span_sample=3) as nl:
+        n_prompts = 0
+        async with nl.run_session():
+            async for prompt in nl.prompts():
+                n_prompts += 1
+                await nl.send_pdb_command('next', prompt.prompt_no, prompt.trace_no)
+    spans = load_jsonl(span_file)
+
+    by_id = {s['span_id']: s for s in spans}
+    prompts = [s for s in spans if s['kind'] == 'prompt']
+    assert len(prompts) == n_prompts > 3
+    for span in prompts:
+        cmdloop = by_id[span['parent_id']]
+        trace_call = by_id[cmdloop['parent_id']]
+        assert trace_call['kind'] == 'trace_call'
+        assert trace_call['start'] <= cmdloop['start'] <= span['start']
+        assert span['end'] <= cmdloop['end'] <= trace_call['end']
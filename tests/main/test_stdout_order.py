@@ -0,0 +1,40 @@
+from nextline import Nextline
+from nextline.events import OnEndTrace, OnStartPrompt, OnWriteStdout
+from nextline.plugin.spec import Context, hookimpl
+
+SOURCE = """
+print('a', end='')
+print('b')
+x = 1
+""".strip()
+
+
+class Plugin:
+    def __init__(self) -> None:
+        self.events = list[str]()
+
+    @hookimpl
+    async def on_write_stdout(self, event: OnWriteStdout) -> None:
+        self.events.append(event.text)
+
+    @hookimpl
+    async def on_start_prompt(self, context: Context, event: OnStartPrompt) -> None:
+        self.events.append('prompt')
+        await context.nextline.send_pdb_command('next', event.prompt_no, event.trace_no)
+
+    @hookimpl
+    async def on_end_trace(self, event: OnEndTrace) -> None:
+        self.events.append('end')
+
+
+async def test_stdout_before_prompt_and_end() -> None:
+    '''The text written in a trace is sent before the next prompt and the end.'''
+    plugin = Plugin()
+    nextline = Nextline(SOURCE)
+    assert nextline.register(plugin)
+    async with nextline:
+        async with nextline.run_session():
+            pass
+    # The last prompt is at the return from the module
+    expected = ['prompt', 'a', 'prompt', 'b\n', 'prompt', 'prompt', 'end']
+    assert plugin.events == expected
@@ -0,0 +1,70 @@
+import asyncio
+
+from nextline import Nextline
+from nextline.types import TraceInfo
+
+SOURCE = """
+import threading
+import time
+
+def busy():
+    x = sum(range(10**7))
+
+def idle():
+    time.sleep(0.3)
+
+t1 = threading.Thread(target=busy)
+t2 = threading.Thread(target=idle)
+t1.start()
+t2.start()
+t1.join()
+t2.join()
+""".strip()
+
+
+async def test_trace_cpu_time() -> None:
+    async with Nextline(SOURCE, trace_threads=True, cpu_time=True) as nextline:
+
+        async def subscribe() -> dict[int, TraceInfo]:
+            ret = dict[int, TraceInfo]()
+            async for info in nextline.subscribe_trace_info():
+                if info.state == 'finished':
+                    ret[info.trace_no] = info
+                    if info.trace_no == 1:
+                        break
+            return ret
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+        infos = await task
+
+    # The order in which the threads start to be traced is not determined.
+    idle, busy = sorted((infos[2], infos[3]), key=lambda i: i.cpu_time or 0)
+    assert busy.cpu_time is not None
+    assert idle.cpu_time is not None
+    assert busy.cpu_time > 0.05 > idle.cpu_time
+    assert busy.wall_time is not None
+    assert idle.wall_time is not None
+    assert max(busy.wall_time, idle.wall_time) >= 0.3
+
+
+async def test_off() -> None:
+    async with Nextline(SOURCE, trace_threads=True) as nextline:
+
+        async def subscribe() -> list[TraceInfo]:
+            ret = list[TraceInfo]()
+            async for info in nextline.subscribe_trace_info():
+                if info.state == 'finished':
+                    ret.append(info)
+                    if info.trace_no == 1:
+                        break
+            return ret
+
+        task = asyncio.create_task(subscribe())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+        infos = await task
+
+    assert [i.cpu_time for i in infos] == [None] * 3
+    assert all(i.wall_time is not None for i in infos)
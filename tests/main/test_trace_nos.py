@@ -0,0 +1,56 @@
+import asyncio
+
+from nextline import Nextline
+from nextline.types import TraceNosDelta
+
+SOURCE = """
+import threading
+threads = [threading.Thread(target=lambda: None) for _ in range(20)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+""".strip()
+
+
+async def test_delta() -> None:
+    async with Nextline(SOURCE, trace_threads=True) as nextline:
+
+        async def subscribe() -> list[TraceNosDelta]:
+            ret = list[TraceNosDelta]()
+            n = 0
+            async for delta in nextline.subscribe_trace_ids_delta():
+                ret.append(delta)
+                n += len(delta.added) - len(delta.removed)
+                if not n:
+                    break
+            return ret
+
+        async def subscribe_full() -> list[tuple[int, ...]]:
+            ret = list[tuple[int, ...]]()
+            async for trace_ids in nextline.subscribe_trace_ids():
+                ret.append(trace_ids)
+                if not trace_ids:
+                    break
+            return ret
+
+        task = asyncio.create_task(subscribe())
+        task_full = asyncio.create_task(subscribe_full())
+        await asyncio.sleep(0)
+        await nextline.run_continue_and_wait()
+        deltas = await task
+        full = await task_full
+
+    trace_nos = dict[int, None]()
+    expected = list[tuple[int, ...]]()
+    for delta in deltas:
+        for trace_no in delta.added:
+            trace_nos[trace_no] = None
+        for trace_no in delta.removed:
+            del trace_nos[trace_no]
+        expected.append(tuple(trace_nos))
+    assert not trace_nos
+    assert deltas[0].added == (1,)
+
+    # The full tuple is published at each change
+    assert full == expected
@@ -8,7 +8,7 @@ import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
 
-from nextline.spawned.plugin.plugins.peek import peek_stdout_by_key
+from nextline.spawned.plugin.plugins.peek import ReadLinesByKey, peek_stdout_by_key
 from nextline.utils import current_task_or_thread
 
 
@@ -43,18 +43,72 @@ def test_one(capsys: pytest.CaptureFixture, data: st.DataObject) -> None:
         for thread in threads:
             thread.join()
 
-    expected = sorted(
-        (
-            (thread, f'{line}\n')
-            for thread, lines in zip(threads, lines_list)
-            for line in lines
-            if lines
-        ),
-        key=lambda x: x[0].name,
-    )
+    # The lines are passed to the callback one by one in order by thread
+    expected = {
+        thread: [f'{line}\n' for line in lines]
+        for thread, lines in zip(threads, lines_list)
+        if lines
+    }
 
-    actual = sorted((c.args for c in callback.call_args_list), key=lambda x: x[0].name)
+    actual = dict[Thread, list[str]]()
+    for c in callback.call_args_list:
+        thread, line = c.args
+        actual.setdefault(thread, []).append(line)
 
     assert expected == actual
 
     capsys.readouterr()
+
+
+def test_read_lines_by_key() -> None:
+    callback = Mock()
+    interval = 0.01
+    with ReadLinesByKey(callback, interval=interval) as read_lines_by_key:
+        read_lines_by_key('a', 'x\ny\nz')
+        read_lines_by_key('b', 'progress')
+        read_lines_by_key('a', 'z\n')
+        time.sleep(interval * 5)
+
+        # The complete lines are passed one by one. The incomplete line is
+        # passed when it is idle.
+        assert [c.args for c in callback.call_args_list] == [
+            ('a', 'x\n'),
+            ('a', 'y\n'),
+            ('a', 'zz\n'),
+            ('b', 'progress'),
+        ]
+        callback.reset_mock()
+
+        read_lines_by_key('b', '...')
+
+        # The lines of the key, including the incomplete line, can be flushed
+        read_lines_by_key.flush(key='b', partial=True)
+        assert [c.args for c in callback.call_args_list] == [('b', '...')]
+        callback.reset_mock()
+
+        read_lines_by_key('a', 'w\n')
+        read_lines_by_key('b', 'done')
+
+    # The rest is flushed at the exit
+    assert sorted(c.args for c in callback.call_args_list) == [
+        ('a', 'w\n'),
+        ('b', 'done'),
+    ]
+
+
+def test_idle_partial_line() -> None:
+    '''An incomplete line is passed once no text is written for the interval.'''
+    callback = Mock()
+    interval = 0.05
+    with ReadLinesByKey(callback, interval=interval) as read_lines_by_key:
+        read_lines_by_key('a', 'progress')
+        time.sleep(interval / 5)
+        read_lines_by_key('a', '.')
+        assert not callback.called
+        time.sleep(interval * 5)
+        assert [c.args for c in callback.call_args_list] == [('a', 'progress.')]
+        read_lines_by_key('a', ' done\n')
+    assert [c.args for c in callback.call_args_list] == [
+        ('a', 'progress.'),
+        ('a', ' done\n'),
+    ]
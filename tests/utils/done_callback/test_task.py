@@ -145,3 +145,32 @@ async def test_done_none() -> None:
         await asyncio.sleep(0)  # let the task be registered
     assert t.done()  # finished after exited
     await t
+
+
+async def test_aclose_pending(done: Done) -> None:
+    '''aclose() waits for the tasks in the same event loop.'''
+    obj = TaskDoneCallback(done=done)
+    tasks = {asyncio.create_task(target(obj)) for _ in range(10)}
+    await asyncio.sleep(0)  # let the tasks register
+    await obj.aclose()
+    assert tasks == done.args
+    assert all(t.done() for t in tasks)
+
+
+def test_close_from_another_thread(done: Done) -> None:
+    '''close() waits for the tasks in an event loop in another thread.'''
+    registered = threading.Event()
+
+    async def main(obj: TaskDoneCallback) -> None:
+        tasks = [asyncio.create_task(target(obj)) for _ in range(10)]
+        await asyncio.sleep(0)
+        registered.set()
+        await asyncio.gather(*tasks)
+
+    obj = TaskDoneCallback(done=done)
+    t = threading.Thread(target=asyncio.run, args=(main(obj),))
+    t.start()
+    registered.wait()
+    obj.close()
+    assert 10 == len(done.args)
+    t.join()
@@ -1,6 +1,6 @@
 import random
 import time
-from threading import Thread, current_thread
+from threading import Event, Thread, current_thread
 from unittest.mock import Mock
 
 import pytest
@@ -138,3 +138,31 @@ def test_done_none() -> None:
         time.sleep(0.005)
     assert not t.is_alive()
     t.join()
+
+
+def test_register_running(done: Done) -> None:
+    event = Event()
+
+    with ThreadDoneCallback(done=done) as obj:
+        t = ExcThread(target=event.wait)
+        t.start()
+
+        # register a running thread from another thread
+        assert t == obj.register(t)
+
+        event.set()
+
+    assert {t} == done.args
+    t.join()
+
+
+def test_many(done: Done) -> None:
+    with ThreadDoneCallback(done=done) as obj:
+        threads = {ExcThread(target=target, args=(obj,)) for _ in range(300)}
+        for t in threads:
+            t.start()
+
+    assert threads == done.args
+
+    for t in threads:
+        t.join()
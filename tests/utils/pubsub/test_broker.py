@@ -1,12 +1,14 @@
 import asyncio
 import time
 from collections.abc import Sequence
+from unittest.mock import Mock
 
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
 from nextline.utils import PubSub
+from nextline.utils.pubsub import json_codec
 
 
 async def test_end() -> None:
@@ -120,3 +122,201 @@ async def test_matrix(
         actual = results[: n_subscribers * n_keys]
         expected = [items[k] for k in keys for _ in range(n_subscribers)]
     assert actual == expected
+
+
+async def test_subscribe_prefix() -> None:
+    async with PubSub[tuple[str, int], str]() as obj:
+        await obj.publish(('foo', 1), 'a')
+        await obj.publish(('bar', 1), 'b')
+
+        async def subscribe() -> tuple[tuple[tuple[str, int], str], ...]:
+            return tuple([y async for y in obj.subscribe_prefix(('foo',))])
+
+        async def put() -> None:
+            await asyncio.sleep(0.001)
+            await obj.publish(('foo', 2), 'c')
+            await obj.publish(('bar', 2), 'd')
+            await obj.end(('foo', 1))  # doesn't end the prefix subscription
+            await obj.publish(('foo', 1), 'e')
+            await obj.close()
+
+        result, _ = await asyncio.gather(subscribe(), put())
+    assert result == ((('foo', 1), 'a'), (('foo', 2), 'c'), (('foo', 1), 'e'))
+
+
+@given(
+    keys=st.lists(
+        st.tuples(st.sampled_from('abc'), st.integers(0, 3)), max_size=10, unique=True
+    ),
+    prefix=st.sampled_from([(), ('a',), ('b',), ('a', 1), ('c', 2)]),
+    last=st.booleans(),
+)
+async def test_subscribe_prefix_matrix(
+    keys: Sequence[tuple[str, int]], prefix: tuple, last: bool
+) -> None:
+    pre_keys, post_keys = keys[: len(keys) // 2], keys[len(keys) // 2 :]
+    async with PubSub[tuple[str, int], str]() as obj:
+        for key in pre_keys:
+            await obj.publish(key, f'pre-{key}')
+
+        async def subscribe() -> list[tuple[tuple[str, int], str]]:
+            return [y async for y in obj.subscribe_prefix(prefix, last=last)]
+
+        async def put() -> None:
+            await asyncio.sleep(0.001)
+            for key in post_keys:
+                await obj.publish(key, f'post-{key}')
+            await obj.close()
+
+        result, _ = await asyncio.gather(subscribe(), put())
+
+    def match(key: tuple[str, int]) -> bool:
+        return key[: len(prefix)] == prefix
+
+    expected = [(k, f'post-{k}') for k in post_keys if match(k)]
+    if last:
+        expected = [(k, f'pre-{k}') for k in pre_keys if match(k)] + expected
+    assert result == expected
+
+
+async def test_snapshot() -> None:
+    async with PubSub[str | tuple[str, int], str]() as obj:
+        await obj.publish('foo', 'a')
+        await obj.publish(('bar', 1), 'b')
+        await obj.publish('foo', 'c')
+        await obj.publish(('bar', 2), 'd')
+
+        snapshot = obj.snapshot(keys=['foo', 'baz'], prefixes=[('bar',)])
+        assert snapshot == {'foo': (2, 'c'), ('bar', 1): (1, 'b'), ('bar', 2): (3, 'd')}
+
+        async def subscribe(key: str | tuple[str, int]) -> tuple[str, ...]:
+            after = snapshot[key][0]
+            return tuple([y async for y in obj.subscribe(key, after=after)])
+
+        async def put() -> None:
+            await asyncio.sleep(0.001)
+            await obj.publish(('bar', 1), 'e')
+            await obj.close()
+
+        # The value published before the subscription but after the snapshot
+        await obj.publish('foo', 'f')
+
+        results = await asyncio.gather(
+            subscribe('foo'), subscribe(('bar', 1)), subscribe(('bar', 2)), put()
+        )
+    assert results[:3] == [('f',), ('e',), ()]
+
+
+async def test_subscribe_encoded() -> None:
+    codec = Mock(side_effect=lambda v: v.encode())
+    async with PubSub[str | tuple[str, int], str]() as obj:
+        obj.register_codec('foo', codec)
+        obj.register_prefix_codec(('bar',), codec)
+
+        with pytest.raises(LookupError):
+            obj.subscribe_encoded('baz')
+
+        await obj.publish('foo', 'a')
+
+        async def subscribe(key: str | tuple[str, int]) -> tuple[bytes, ...]:
+            return tuple([y async for y in obj.subscribe_encoded(key)])
+
+        async def put() -> None:
+            await asyncio.sleep(0.001)
+            await obj.publish('foo', 'b')
+            await obj.publish(('bar', 1), 'c')
+            await obj.close()
+
+        results = await asyncio.gather(
+            *(subscribe('foo') for _ in range(5)),
+            *(subscribe(('bar', 1)) for _ in range(5)),
+            put(),
+        )
+    assert results[:5] == [(b'a', b'b')] * 5
+    assert results[5:10] == [(b'c',)] * 5
+    assert codec.call_count == 3  # encoded once for all subscribers
+
+
+async def test_default_codec() -> None:
+    async with PubSub[str, str](codec=json_codec) as obj:
+        await obj.publish('foo', 'a')
+        assert obj.latest_encoded('foo') == b'"a"'
+
+
+@given(
+    keys=st.lists(st.text(max_size=3), max_size=5, unique=True),
+    n_items=st.integers(0, 10),
+    last=st.booleans(),
+)
+async def test_subscribe_many(keys: Sequence[str], n_items: int, last: bool) -> None:
+    async with PubSub[str, str]() as obj:
+        for key in keys:
+            await obj.publish(key, f'{key}-pre')
+
+        async def subscribe() -> list[tuple[str, str]]:
+            return [y async for y in obj.subscribe_many(keys, last=last)]
+
+        async def put() -> None:
+            await asyncio.sleep(0.001)
+            for i in range(n_items):
+                for key in keys:
+                    await obj.publish(key, f'{key}-{i}')
+            for key in keys:
+                await obj.end(key)
+
+        result, _ = await asyncio.gather(subscribe(), put())
+
+    expected = [(k, f'{k}-{i}') for i in range(n_items) for k in keys]
+    if last:
+        expected = [(k, f'{k}-pre') for k in keys] + expected
+    assert result == expected
+
+
+async def test_subscribe_many_close() -> None:
+    async with PubSub[str, str]() as obj:
+
+        async def subscribe() -> list[tuple[str, str]]:
+            return [y async for y in obj.subscribe_many(['foo', 'bar'])]
+
+        async def put() -> None:
+            await asyncio.sleep(0.001)
+            await obj.publish('foo', 'a')
+            await obj.end('foo')
+            await obj.publish('bar', 'b')
+            await obj.close()
+
+        result, _ = await asyncio.gather(subscribe(), put())
+    assert result == [('foo', 'a'), ('bar', 'b')]
+
+
+async def test_backlogs() -> None:
+    async with PubSub[str | tuple[str, int], str]() as obj:
+        subscriptions = [
+            obj.subscribe('foo', last=False),
+            obj.subscribe('foo', last=False),
+            obj.subscribe_prefix(('bar',), last=False),
+            obj.subscribe_many(['baz'], last=False),
+        ]
+        # Start the subscriptions
+        nexts = [asyncio.ensure_future(anext(s)) for s in subscriptions]
+        await asyncio.sleep(0)
+        assert obj.backlogs() == {}
+
+        await obj.publish('foo', 'a')
+        await obj.publish(('bar', 1), 'b')
+        await obj.publish('baz', 'c')
+        await asyncio.gather(*nexts)
+        assert obj.backlogs() == {}
+
+        await obj.publish('foo', 'd')
+        await obj.publish('foo', 'e')
+        await obj.publish(('bar', 1), 'f')
+        await obj.publish('baz', 'g')
+        assert obj.backlogs() == {'foo': 2, ('bar',): 1, 'baz': 1}
+
+        assert await anext(subscriptions[0]) == 'd'
+        assert obj.backlogs() == {'foo': 2, ('bar',): 1, 'baz': 1}
+        assert await anext(subscriptions[1]) == 'd'
+        assert obj.backlogs() == {'foo': 1, ('bar',): 1, 'baz': 1}
+        for s in subscriptions:
+            await s.aclose()  # type: ignore[attr-defined]
@@ -158,3 +158,27 @@ async def test_property(data: st.DataObject) -> None:
         for method in methods:
             await method()
             test.assert_invariants()
+
+
+async def test_after() -> None:
+    async with PubSubItem[str](cache=True) as obj:
+        with pytest.raises(LookupError):
+            obj.latest_enumerated()
+        await obj.publish('a')
+        await obj.publish('b')
+        idx, item = obj.latest_enumerated()
+        assert item == 'b'
+        await obj.publish('c')
+
+        async def receive(after: int) -> list[str]:
+            return [i async for i in obj.subscribe(after=after)]
+
+        async def send() -> None:
+            await obj.publish('d')
+            await obj.aclose()
+
+        r1, r2, r3, _ = await gather(receive(idx), receive(-1), receive(idx + 1), send())
+    assert r1 == ['c', 'd']
+    assert r2 == ['a', 'b', 'c', 'd']
+    assert r3 == ['d']
+    assert obj.latest_enumerated() == (idx + 2, 'd')
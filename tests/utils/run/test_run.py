@@ -1,4 +1,8 @@
-from typing import NoReturn
+import asyncio
+import multiprocessing as mp
+from functools import partial
+from multiprocessing.queues import Queue
+from typing import NoReturn, Optional, cast
 
 from nextline.utils import run_in_process
 
@@ -45,3 +49,35 @@ async def test_error() -> None:
     assert running.process
     assert running.process.exitcode == 0
     assert isinstance(result.raised, MockError)
+
+
+#
+_queue: Optional['Queue[str]'] = None
+
+
+def set_queue(queue: 'Queue[str]') -> None:
+    global _queue
+    _queue = queue
+
+
+def func_put() -> None:
+    assert _queue
+    for _ in range(100):
+        _queue.put('x' * 10_000)
+
+
+async def test_queue_read_in_event_loop() -> None:
+    '''The process exits after the data in the queue are read in the event loop.'''
+    mp_context = mp.get_context('spawn')
+    queue = cast('Queue[str]', mp_context.Queue())
+    running = await run_in_process(
+        func_put, mp_context=mp_context, initializer=partial(set_queue, queue)
+    )
+
+    async def read() -> list[str]:
+        return [await asyncio.to_thread(queue.get) for _ in range(100)]
+
+    task = asyncio.create_task(read())
+    result = await running
+    assert result.raised is None
+    assert len(await task) == 100
@@ -0,0 +1,34 @@
+import math
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from nextline.utils import Histogram
+from nextline.utils.histogram import LATENCY_BOUNDS
+
+
+def test_empty() -> None:
+    histogram = Histogram()
+    assert histogram.count == 0
+    assert histogram.buckets == (0,) * (len(LATENCY_BOUNDS) + 1)
+    assert math.isnan(histogram.mean())
+    assert math.isnan(histogram.quantile(0.5))
+
+
+@given(values=st.lists(st.floats(min_value=0, max_value=100), min_size=1))
+def test_property(values: list[float]) -> None:
+    histogram = Histogram()
+    for value in values:
+        histogram.add(value)
+    assert histogram.count == len(values)
+    assert sum(histogram.buckets) == len(values)
+    assert histogram.min == min(values)
+    assert histogram.max == max(values)
+    assert math.isclose(histogram.sum, sum(values))
+    estimates = [histogram.quantile(q) for q in (0, 0.5, 0.9, 0.99, 1)]
+    assert estimates == sorted(estimates)
+    assert histogram.min <= estimates[0]
+    assert histogram.quantile(1) == max(values)
+
+    histogram.clear()
+    assert histogram.count == 0
@@ -0,0 +1,168 @@
+from collections.abc import AsyncIterator, Generator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+import apluggy
+import pytest
+from pluggy import HookImpl
+
+from nextline.utils import HookTimer
+
+hookspec = apluggy.HookspecMarker('test')
+hookimpl = apluggy.HookimplMarker('test')
+
+
+class Spec:
+    @hookspec
+    def func(self) -> None:
+        pass
+
+    @hookspec
+    async def afunc(self) -> None:
+        pass
+
+    @hookspec
+    @contextmanager
+    def context(self) -> Iterator[None]:  # type: ignore
+        pass
+
+    @hookspec
+    @asynccontextmanager
+    async def acontext(self) -> AsyncIterator[None]:
+        yield
+
+
+class Plugin:
+    @hookimpl
+    def func(self) -> None:
+        pass
+
+    @hookimpl
+    async def afunc(self) -> None:
+        pass
+
+    @hookimpl
+    @contextmanager
+    def context(self) -> Iterator[str]:
+        yield 'a'
+
+    @hookimpl
+    @asynccontextmanager
+    async def acontext(self) -> AsyncIterator[int]:
+        yield 1
+
+
+async def test_hook_timer() -> None:
+    pm = apluggy.PluginManager('test')
+    pm.add_hookspecs(Spec)
+    pm.register(Plugin)
+    timer = HookTimer(pm)
+    timer.start()
+
+    pm.hook.func()
+    assert await pm.ahook.afunc() == [None]
+    with pm.with_.context() as y:
+        assert y == ['a']
+    with pm.with_.context() as y:
+        assert y == ['a']
+    async with pm.awith.acontext() as y:
+        assert y == [1]
+
+    # Registered after start()
+    class Late:
+        @hookimpl
+        def func(self) -> None:
+            pass
+
+    pm.register(Late)
+    pm.hook.func()
+
+    # Not measured after stop()
+    timer.stop()
+    pm.hook.func()
+    assert {impl.function.__qualname__ for impl in _impls(pm)} == {
+        'Plugin.func',
+        'Plugin.afunc',
+        'Plugin.context',
+        'Plugin.acontext',
+        'test_hook_timer.<locals>.Late.func',
+    }
+
+    stats = timer.stats()
+    assert {k: calls for k, (calls, _) in stats.items()} == {
+        ('func', 'Plugin'): 2,
+        ('func', 'Late'): 1,
+        ('afunc', 'Plugin'): 1,
+        ('context', 'Plugin'): 2,
+        ('acontext', 'Plugin'): 1,
+    }
+    assert all(t >= 0 for _, t in stats.values())
+
+    timer.clear()
+    assert timer.stats() == {}
+
+
+def _impls(pm: apluggy.PluginManager) -> list[HookImpl]:
+    return [
+        impl
+        for name in ('func', 'afunc', 'context', 'acontext')
+        for impl in getattr(pm.hook, name).get_hookimpls()
+    ]
+
+
+class Echo:
+    @hookimpl
+    @contextmanager
+    def context(self) -> Generator[str, str, None]:
+        sent = yield 'a'
+        yield sent
+
+
+def test_send() -> None:
+    pm = apluggy.PluginManager('test')
+    pm.add_hookspecs(Spec)
+    pm.register(Echo)
+    timer = HookTimer(pm)
+    timer.start()
+    with (ctx := pm.with_.context()) as y:
+        assert y == ['a']
+        assert ctx.gen.send('b') == ['b']
+    assert timer.stats()[('context', 'Echo')][0] == 1
+
+
+class Suppress:
+    @hookimpl
+    @contextmanager
+    def context(self) -> Iterator[None]:
+        try:
+            yield
+        except ValueError:
+            pass
+
+    @hookimpl
+    @asynccontextmanager
+    async def acontext(self) -> AsyncIterator[None]:
+        try:
+            yield
+        except ValueError:
+            pass
+
+
+async def test_exception() -> None:
+    pm = apluggy.PluginManager('test')
+    pm.add_hookspecs(Spec)
+    pm.register(Suppress)
+    timer = HookTimer(pm)
+    timer.start()
+    with pm.with_.context():
+        raise ValueError
+    async with pm.awith.acontext():
+        raise ValueError
+    with pytest.raises(KeyError):
+        with pm.with_.context():
+            raise KeyError
+    with pytest.raises(KeyError):
+        async with pm.awith.acontext():
+            raise KeyError
+    stats = timer.stats()
+    assert stats[('context', 'Suppress')][0] == 2
+    assert stats[('acontext', 'Suppress')][0] == 2
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import multiprocessing as mp
 from concurrent.futures import ProcessPoolExecutor
@@ -32,3 +33,56 @@ def fn() -> str:
     logger = logging.getLogger(__name__)
     logger.debug('bar')
     return 'foo'
+
+
+@pytest.mark.parametrize('level', [logging.DEBUG, logging.INFO, logging.WARNING])
+async def test_levels(level: int, caplog: LogCaptureFixture) -> None:
+    mp_context = mp.get_context('spawn')
+
+    with caplog.at_level(level):
+        async with MultiprocessingLogging(mp_context=mp_context) as initializer:
+            with ProcessPoolExecutor(
+                mp_context=mp_context, initializer=initializer
+            ) as executor:
+                fut = executor.submit(fn_enabled_levels)
+                enabled = fut.result()
+
+    # The levels in this process are set in the other process
+    expected = [lv for lv in LEVELS if lv >= level]
+    assert enabled == expected
+    assert [r.levelno for r in caplog.records] == expected
+
+
+async def test_many(caplog: LogCaptureFixture) -> None:
+    mp_context = mp.get_context('spawn')
+    n = 1000
+
+    with caplog.at_level(logging.DEBUG):
+        async with MultiprocessingLogging(mp_context=mp_context) as initializer:
+            with ProcessPoolExecutor(
+                mp_context=mp_context, initializer=initializer
+            ) as executor:
+                # Not to block the event loop, which receives the records
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(executor, fn_many, n)
+
+    assert [r.message for r in caplog.records] == [str(i) for i in range(n)]
+
+
+LEVELS = [logging.DEBUG, logging.INFO, logging.WARNING]
+
+
+def fn_enabled_levels() -> list[int]:
+    logger = logging.getLogger(__name__)
+    ret = []
+    for level in LEVELS:
+        if logger.isEnabledFor(level):
+            ret.append(level)
+        logger.log(level, 'message')
+    return ret
+
+
+def fn_many(n: int) -> None:
+    logger = logging.getLogger(__name__)
+    for i in range(n):
+        logger.debug(str(i))
@@ -1,11 +1,13 @@
+import os
 import sys
+import time
 from unittest.mock import Mock, call
 
 import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
 
-from nextline.utils import peek_stderr, peek_stdout
+from nextline.utils import peek_fd, peek_stderr, peek_stdout
 
 
 @given(
@@ -101,3 +103,47 @@ def test_raise(capsys: pytest.CaptureFixture) -> None:
 
 class MockError(BaseException):
     pass
+
+
+@given(chunks=st.lists(st.text(), max_size=10))
+def test_peek_fd(chunks: list[str]) -> None:
+    read_fd, write_fd = os.pipe()
+    written = list[str]()
+    try:
+        with peek_fd(write_fd, written.append):
+            for chunk in chunks:
+                os.write(write_fd, chunk.encode())
+        text = ''.join(chunks)
+        assert ''.join(written) == text
+        data = text.encode()
+        received = b''
+        while len(received) < len(data):
+            received += os.read(read_fd, len(data))
+        assert received == data
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_peek_fd_held() -> None:
+    '''The fds are closed and the callback is no longer called after the timeout.'''
+    read_fd, write_fd = os.pipe()
+    n_fds = len(os.listdir('/proc/self/fd'))
+    written = list[str]()
+    try:
+        with peek_fd(write_fd, written.append, timeout=0.01):
+            # Hold the pipe as a child process would
+            held = os.dup(write_fd)
+            os.write(held, b'foo')
+            while not written:
+                time.sleep(0.001)
+        try:
+            assert len(os.listdir('/proc/self/fd')) == n_fds + 1
+            with pytest.raises(BrokenPipeError):
+                os.write(held, b'bar')
+        finally:
+            os.close(held)
+        assert ''.join(written) == 'foo'
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
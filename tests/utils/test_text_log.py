@@ -0,0 +1,25 @@
+from hypothesis import given
+from hypothesis import strategies as st
+
+from nextline.utils import TextLog
+
+
+@given(
+    items=st.lists(st.tuples(st.text(), st.integers(-(2**63), 2**63 - 1))),
+    reads=st.lists(st.integers(min_value=0), max_size=10),
+)
+def test_text_log(items: list[tuple[str, int]], reads: list[int]) -> None:
+    log = TextLog(meta_format='q')
+    try:
+        for i, (text, meta) in enumerate(items):
+            assert log.append(text, meta) == i
+            # Read while appending
+            for j in reads:
+                if j <= i:
+                    assert log.text(j) == items[j][0]
+        assert len(log) == len(items)
+        for i, (text, meta) in enumerate(items):
+            assert log.text(i) == text
+            assert log.meta(i) == (meta,)
+    finally:
+        log.close()